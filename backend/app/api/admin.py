@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Body, status 
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, status 
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
 from app.core.dependencies import get_current_admin
+from app.core.fast_json import FastJSONResponse
+from app.core.principal_cache import principal_cache
+from app.core.security import hash_pool_stats
+from app.db.pool_stats import async_pool_metrics, sync_pool_metrics
 from app.db.session import get_db
-from app.services import wallet_service, admin_service
+from app.services import wallet_service, admin_service, investment_service, export_service, user_service, summary_service, forecast_service
 from pydantic import BaseModel
 from typing import List, Optional
 from decimal import Decimal
 from datetime import datetime
-from app.schemas.user import UserOut
+from app.schemas.admin import AdminControlsOut, AdminControlsUpdate, AdminSummary, PayoutForecast
+from app.schemas.user import UserPage
 from app.schemas.wallet import WalletOut
 from app import models
-from app.schemas.transaction import Transaction
+from app.schemas.transaction import Transaction, TransactionPage, BulkTransactionAction, BulkTransactionResponse
 from app.schemas.investment import InvestmentPackageCreate, InvestmentPackageOut, UserInvestmentOut, UserInvestmentUpdate
 from app.models import investment as investment_models
 
@@ -21,45 +28,53 @@ TransactionOut = Transaction
 class WalletStatusUpdate(BaseModel):
     status: str
 
-# ---------------- Admin Users (Modified to include wallet data) ----------------
-@router.get("/users", response_model=List[UserOut])
-def list_users(db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
-    # Load users, and join the profile AND wallet data
-    users = db.query(models.user.User).options(
-        joinedload(models.user.User.profile),
-        joinedload(models.user.User.wallet) 
-    ).all()
-    
-    user_list = []
-    for user in users:
-        # Convert to a dict/Pydantic object first
-        user_data = UserOut.from_orm(user).dict()
-        
-        # Manually extract profile info (from existing list_users logic)
-        profile = user.profile
-        user_data.update({
-            'full_name': profile.full_name if profile else None,
-            'phone_number': profile.phone_number if profile else None,
-            # ... include other profile fields if needed in UserOut ...
-        })
-        
-        # Add wallet details (NEW)
-        if user.wallet:
-            user_data['wallet_status'] = user.wallet.status
-            user_data['allow_deposits'] = user.wallet.allow_deposits
-            user_data['allow_withdrawals'] = user.wallet.allow_withdrawals
-            # ✅ FIX: Ensure allow_purchases is included when wallet exists
-            user_data['allow_purchases'] = user.wallet.allow_purchases 
-        else:
-            user_data['wallet_status'] = 'wallet_missing'
-            user_data['allow_deposits'] = False
-            user_data['allow_withdrawals'] = False
-            # ✅ FIX: Ensure allow_purchases is defined even if wallet is missing
-            user_data['allow_purchases'] = False 
-
-        user_list.append(user_data)
-        
-    return user_list
+# ---------------- Dashboard summary ----------------
+@router.get("/summary", response_model=AdminSummary)
+def admin_summary(db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
+    # reads a fixed set of counter rows; see summary_service
+    return summary_service.get_summary(db)
+
+# ---------------- Global controls ----------------
+@router.get("/controls", response_model=AdminControlsOut)
+def get_admin_controls(db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
+    return admin_service.get_admin_controls(db)
+
+@router.put("/controls", response_model=AdminControlsOut)
+def update_admin_controls(
+    payload: AdminControlsUpdate,
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    return admin_service.update_admin_controls(db, **payload.dict(exclude_unset=True))
+
+# ---------------- Admin Users (with wallet status and permissions) ----------------
+@router.get("/users", response_model=UserPage)
+def list_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = Query("created_at", regex="^(created_at|email|id)$"),
+    order: str = Query("desc", regex="^(asc|desc)$"),
+    role: Optional[str] = None,
+    wallet_status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    try:
+        users, next_cursor = user_service.list_users_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            order=order,
+            role=role,
+            wallet_status=wallet_status,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if settings.FAST_LIST_RESPONSES:
+        # rows are already plain dicts; skip the second pass through UserPage
+        return FastJSONResponse({"items": users, "next_cursor": next_cursor})
+    return {"items": users, "next_cursor": next_cursor}
 
 # -------------------- NEW: ADMIN WALLET STATUS --------------------
 
@@ -110,6 +125,8 @@ class WalletAdminOut(WalletOut):
 
 @router.get("/wallets", response_model=List[WalletAdminOut])
 def list_wallets(db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse(admin_service.list_wallet_rows(db))
     wallets = (
         db.query(models.wallet.Wallet)
         .options(joinedload(models.wallet.Wallet.user).joinedload(models.user.User.profile))
@@ -173,11 +190,68 @@ class TransactionAdminCreate(BaseModel):
     reference: Optional[str] = None
     note: Optional[str] = None
 
-@router.get("/transactions", response_model=List[TransactionOut])
-def list_all_transactions(db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
-    transactions = db.query(models.wallet.Transaction)\
-        .order_by(models.wallet.Transaction.created_at.desc()).all()
-    return transactions
+@router.get("/transactions", response_model=TransactionPage)
+def list_all_transactions(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    wallet_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    try:
+        transactions, next_cursor = wallet_service.list_transactions_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            type=type,
+            wallet_id=wallet_id,
+            user_id=user_id,
+            created_from=created_from,
+            created_to=created_to,
+            as_rows=settings.FAST_LIST_RESPONSES,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse({"items": transactions, "next_cursor": next_cursor})
+    return {"items": transactions, "next_cursor": next_cursor}
+
+def _export_response(rows, name: str, format: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        rows,
+        media_type=export_service.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# ------------------ Admin: Stream every matching transaction as CSV / NDJSON ------------------
+@router.get("/transactions/export")
+def export_transactions(
+    format: str = Query("csv", regex="^(csv|ndjson)$"),
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    wallet_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    admin_user=Depends(get_current_admin)
+):
+    rows = export_service.stream_transactions(
+        format,
+        status=status,
+        type=type,
+        wallet_id=wallet_id,
+        user_id=user_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return _export_response(rows, "transactions", format)
 
 @router.post("/transactions", response_model=TransactionOut)
 def create_admin_transaction(
@@ -212,11 +286,39 @@ def create_admin_transaction(
 
 
 
+# ------------------ Admin: Approve / reject many transactions at once ------------------
+@router.post("/transactions/bulk", response_model=BulkTransactionResponse)
+def bulk_update_transactions(
+    payload: BulkTransactionAction,
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    if not payload.ids:
+        raise HTTPException(status_code=400, detail="No transaction ids given")
+    if len(payload.ids) > settings.BULK_TRANSACTION_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BULK_TRANSACTION_MAX_IDS} transactions per request",
+        )
+    try:
+        results, wallets_updated = wallet_service.bulk_update_transactions(db, payload.ids, payload.action)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    done = "approved" if payload.action == "approve" else "rejected"
+    return {
+        "action": payload.action,
+        "applied": sum(1 for r in results if r["result"] == done),
+        "wallets_updated": wallets_updated,
+        "results": results,
+    }
+
 # ✅ Approve a transaction
 @router.post("/transactions/{txn_id}/approve", response_model=TransactionOut)
 def approve_transaction(txn_id: int, db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
     try:
         txn = wallet_service.approve_transaction(db, txn_id)
+    except wallet_service.InvalidTransition as e:
+        raise HTTPException(409, str(e))
     except ValueError as e:
         raise HTTPException(404, str(e))
     return txn
@@ -226,6 +328,8 @@ def approve_transaction(txn_id: int, db: Session = Depends(get_db), admin_user=D
 def reject_transaction(txn_id: int, db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
     try:
         txn = wallet_service.reject_transaction(db, txn_id)
+    except wallet_service.InvalidTransition as e:
+        raise HTTPException(409, str(e))
     except ValueError as e:
         raise HTTPException(404, str(e))
     return txn
@@ -233,21 +337,64 @@ def reject_transaction(txn_id: int, db: Session = Depends(get_db), admin_user=De
 # ✅ Pend a transaction
 @router.post("/transactions/{txn_id}/pend", response_model=TransactionOut)
 def pend_transaction(txn_id: int, db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
-    txn = db.query(wallet_service.models.wallet.Transaction).filter(
-        wallet_service.models.wallet.Transaction.id == txn_id
-    ).first()
-    if not txn:
-        raise HTTPException(404, "Transaction not found")
-    txn.status = "pending"
-    db.commit()
-    db.refresh(txn)
+    try:
+        txn = wallet_service.pend_transaction(db, txn_id)
+    except wallet_service.InvalidTransition as e:
+        raise HTTPException(409, str(e))
+    except ValueError as e:
+        raise HTTPException(404, str(e))
     return txn
 
 
 @router.get("/investments", response_model=List[UserInvestmentOut])
-def list_all_user_investments(db: Session = Depends(get_db), admin_user=Depends(get_current_admin)):
-    investments = db.query(models.investment.UserInvestment).all()
-    return investments
+def list_all_user_investments(
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    package_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    filters = dict(status=status, user_id=user_id, package_id=package_id)
+    if settings.FAST_LIST_RESPONSES:
+        conditions = investment_service.investment_filters(**filters)
+        return FastJSONResponse(investment_service.list_investment_rows(db, *conditions))
+    return investment_service.list_investments(db, **filters)
+
+# ------------------ Admin: Stream every matching investment as CSV / NDJSON ------------------
+@router.get("/investments/export")
+def export_investments(
+    format: str = Query("csv", regex="^(csv|ndjson)$"),
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    package_id: Optional[int] = None,
+    admin_user=Depends(get_current_admin)
+):
+    rows = export_service.stream_investments(format, status=status, user_id=user_id, package_id=package_id)
+    return _export_response(rows, "investments", format)
+
+
+# ------------------ Admin: Earnings and principal owed per day ------------------
+@router.get("/investments/forecast", response_model=PayoutForecast)
+def investment_payout_forecast(
+    days: int = Query(90, ge=1, le=1830),
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    # the active book is cached per worker until an investment or package changes
+    return forecast_service.payout_forecast(db, days)
+
+
+# ------------------ Admin: Mature every investment past its end_date ------------------
+@router.post("/investments/mature")
+def sweep_matured_investments(
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    admin_user=Depends(get_current_admin)
+):
+    try:
+        return investment_service.sweep_matured_investments(db, batch_size=batch_size)
+    except investment_service.MaturityConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 # ------------------ Admin: List all investment packages ------------------
@@ -267,19 +414,7 @@ def create_investment_package(
     db: Session = Depends(get_db),
     admin_user=Depends(get_current_admin)
 ):
-    package = investment_models.InvestmentPackage(
-        name=payload.name,
-        description=payload.description,
-        min_amount=payload.min_amount,
-        max_amount=payload.max_amount,
-        daily_return=payload.daily_return,
-        duration_days=payload.duration_days,
-        is_active=payload.is_active
-    )
-    db.add(package)
-    db.commit()
-    db.refresh(package)
-    return package
+    return investment_service.create_package(db, **payload.dict())
 
 @router.put("/investments/{investment_id}", response_model=UserInvestmentOut)
 def update_user_investment(
@@ -288,18 +423,9 @@ def update_user_investment(
     db: Session = Depends(get_db),
     admin_user=Depends(get_current_admin)
 ):
-    investment = db.query(investment_models.UserInvestment).filter(
-        investment_models.UserInvestment.id == investment_id
-    ).first()
-
+    investment = investment_service.update_user_investment(db, investment_id, **payload.dict(exclude_unset=True))
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
-
-    for field, value in payload.dict(exclude_unset=True).items():
-        setattr(investment, field, value)
-
-    db.commit()
-    db.refresh(investment)
     return investment
 
 
@@ -319,16 +445,34 @@ def update_investment_package(
     db: Session = Depends(get_db),
     admin_user=Depends(get_current_admin)
 ):
-    package = db.query(investment_models.InvestmentPackage).filter(
-        investment_models.InvestmentPackage.id == package_id
-    ).first()
-
+    package = investment_service.update_package(db, package_id, **payload.dict(exclude_unset=True))
     if not package:
         raise HTTPException(404, detail="Investment package not found")
+    return package
 
-    for field, value in payload.dict(exclude_unset=True).items():
-        setattr(package, field, value)
 
-    db.commit()
-    db.refresh(package)
-    return package
+# ------------------ Admin: internal diagnostics ------------------
+@router.get("/internal/principal-cache")
+def principal_cache_stats(admin_user=Depends(get_current_admin)):
+    # per-worker numbers; each Uvicorn/Gunicorn worker keeps its own cache
+    return principal_cache.stats()
+
+@router.get("/internal/package-catalog")
+def package_catalog_stats(admin_user=Depends(get_current_admin)):
+    return investment_service.package_catalog.stats()
+
+@router.get("/internal/investment-book")
+def investment_book_stats(admin_user=Depends(get_current_admin)):
+    return forecast_service.investment_book.stats()
+
+@router.get("/internal/hash-pool")
+def password_hash_pool_stats(admin_user=Depends(get_current_admin)):
+    return hash_pool_stats()
+
+@router.get("/internal/db-pool")
+def db_pool_stats(admin_user=Depends(get_current_admin)):
+    # per-worker numbers; use them with DB_POOL_SIZE / DB_MAX_OVERFLOW to size the pool
+    pools = [sync_pool_metrics.snapshot()]
+    if async_pool_metrics.pool is not None:
+        pools.append(async_pool_metrics.snapshot())
+    return {"pools": pools}
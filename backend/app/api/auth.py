@@ -1,42 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 
 from app.core.dependencies import get_db
 from app.services import user_service, wallet_service
 from app.schemas.user import UserCreate, Token # UserCreate now includes 'profile'
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, ensure_hashing_capacity, hash_password_async, verify_password_async, PasswordHashingBusy
 from app.core.config import settings
+from app.core import rate_limit
+from app.core.rate_limit import Limit, RateLimited
 
 router = APIRouter(tags=["auth"]) # Added tags for better OpenAPI documentation
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+def _rate_limited(e: RateLimited) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, please retry later",
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
+
+
+async def _admit(*buckets) -> None:
+    # first thing each auth endpoint does: refused callers cost neither bcrypt nor a users lookup
+    try:
+        await rate_limit.check(*buckets)
+    except RateLimited as e:
+        raise _rate_limited(e)
+
+
+# The endpoints below are async so bcrypt can be awaited in the hashing pool.
+# Every DB touch goes through these sync helpers in the threadpool, which also
+# keeps lazy loads of expired attributes off the event loop.
+
+def _create_account(db: Session, payload: UserCreate, password_hash: str) -> int:
+    # ✅ FIX: Pass the optional profile data to the service layer
+    user = user_service.create_user(
+        db,
+        payload.email,
+        None,
+        profile_data=payload.profile, # Pass the profile object
+        password_hash=password_hash,
+    )
+    # Create empty wallet (profile is now created in user_service.create_user)
+    wallet_service.create_wallet_for_user(db, user.id)
+    return user.id
+
+def _load_credentials(db: Session, email: str):
+    user = user_service.get_user_by_email(db, email)
+    if not user:
+        return None
+    return user.id, user.password_hash, user.role
+
+
 @router.post("/register", response_model=dict)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
+async def register(payload: UserCreate, request: Request, db: Session = Depends(get_db)):
     """
     Register a new user with email, password, and profile data.
     Creates both the User and the associated UserProfile records.
     """
+    await _admit(
+        (f"register:ip:{rate_limit.client_ip(request)}",
+         Limit(settings.REGISTER_RATE_LIMIT_IP_BURST, settings.REGISTER_RATE_LIMIT_IP_PER_MINUTE)),
+    )
+    try:
+        ensure_hashing_capacity()
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    # cheap duplicate check first so taken emails don't cost a bcrypt round
+    if await run_in_threadpool(user_service.get_user_by_email, db, payload.email):
+        raise HTTPException(status_code=400, detail="User with that email already exists")
     try:
-        # ✅ FIX: Pass the optional profile data to the service layer
-        user = user_service.create_user(
-            db, 
-            payload.email, 
-            payload.password, 
-            profile_data=payload.profile # Pass the profile object
-        )
+        password_hash = await hash_password_async(payload.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+
+    try:
+        user_id = await run_in_threadpool(_create_account, db, payload, password_hash)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
-    # Create empty wallet (profile is now created in user_service.create_user)
-    wallet_service.create_wallet_for_user(db, user.id)
-    
-    return {"msg": "user_created", "user_id": user.id}
+
+    return {"msg": "user_created", "user_id": user_id}
 
 
 @router.post("/token", response_model=Token)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -46,16 +106,27 @@ def login(
     Returns access_token including user role.
     """
     # OAuth2PasswordRequestForm uses `username` for email
-    user = user_service.get_user_by_email(db, form_data.username)
-    
-    if not user or not verify_password(form_data.password, user.password_hash):
+    await _admit(
+        (f"login:ip:{rate_limit.client_ip(request)}",
+         Limit(settings.LOGIN_RATE_LIMIT_IP_BURST, settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE)),
+        (f"login:account:{rate_limit.account_key(form_data.username)}",
+         Limit(settings.LOGIN_RATE_LIMIT_ACCOUNT_BURST, settings.LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE)),
+    )
+    try:
+        ensure_hashing_capacity()
+        credentials = await run_in_threadpool(_load_credentials, db, form_data.username)
+        valid = bool(credentials) and await verify_password_async(form_data.password, credentials[1])
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
-    
+
+    user_id, _, role = credentials
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     token = create_access_token(
-        subject=str(user.id),
+        subject=str(user_id),
         expires_delta=access_token_expires,
-        role=user.role  # include role in token
+        role=role  # include role in token
     )
-    
+
     return {"access_token": token, "token_type": "bearer"}
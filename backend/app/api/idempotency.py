@@ -0,0 +1,57 @@
+# backend/app/api/idempotency.py
+# Idempotency-Key handling shared by the money-moving POST endpoints (not a router).
+from typing import Callable, Optional
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.core.fast_json import dumps
+from app.services import idempotency_service
+
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(db: Session, user_id: int, key: Optional[str], scope: str, payload: dict, run: Callable, schema) -> Response:
+    """
+    Run `run()` at most once per (user, Idempotency-Key) and return its result serialized with
+    `schema`. A repeated key replays the stored response (marked Idempotent-Replayed: true).
+    Without a key the request simply runs. If `run` raises, the key is released. If the claim
+    was taken over while `run` was working, its writes are rolled back and the winner replayed.
+    `run` must not commit: its writes and the stored response are committed here together.
+    """
+    if key is None:
+        result = run()
+        db.commit()
+        return result
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+    for _ in range(3):
+        try:
+            stored, token = idempotency_service.acquire(db, user_id, key, scope, payload)
+        except idempotency_service.IdempotencyKeyReused as e:
+            raise HTTPException(422, str(e))
+        except idempotency_service.IdempotencyInProgress as e:
+            raise HTTPException(409, str(e))
+        if stored is not None:
+            return Response(
+                content=stored.response_body,
+                status_code=stored.response_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+        try:
+            result = run()
+            body = dumps(jsonable_encoder(schema.from_orm(result)))
+            owned = idempotency_service.complete(db, user_id, key, token, 200, body, commit=False)
+            if owned:
+                db.commit()
+                return Response(content=body, media_type="application/json")
+        except Exception:
+            # release() rolls back first, so none of run()'s writes survive
+            idempotency_service.release(db, user_id, key, token)
+            raise
+        # this request outlived IDEMPOTENCY_LOCK_SECONDS and a retry took the key over: drop
+        # these writes and replay (or wait for) the retry's response instead
+        db.rollback()
+    raise HTTPException(409, "Could not complete the request for this Idempotency-Key; retry it")
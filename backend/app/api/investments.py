@@ -1,9 +1,13 @@
 # backend/app/api/investments.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from decimal import Decimal
-from typing import List
-from app.db.session import get_db
+from typing import List, Optional
+from app.api.idempotency import idempotent
+from app.core.config import settings
+from app.core.fast_json import FastJSONResponse
+from app.db.session import get_db, get_async_db
 from app.core.dependencies import get_current_user, get_current_admin
 from app.schemas.investment import InvestmentPackageCreate, InvestmentPackageOut, UserInvestmentCreate, UserInvestmentOut
 from app.services import investment_service, wallet_service, admin_service
@@ -12,8 +16,16 @@ from app import models
 router = APIRouter()
 
 @router.get("/packages", response_model=List[InvestmentPackageOut])
-def list_packages(db: Session = Depends(get_db)):
-    return investment_service.list_active_packages(db)
+async def list_packages(request: Request, db: AsyncSession = Depends(get_async_db)):
+    # served from the per-worker catalog cache; the ETag changes whenever a package does
+    catalog = await investment_service.get_package_catalog_async(db)
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": f"public, max-age={settings.PACKAGE_CATALOG_MAX_AGE_SECONDS}",
+    }
+    if catalog.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=catalog.value, media_type="application/json", headers=headers)
 
 @router.post("/packages", response_model=InvestmentPackageOut)
 def create_package(payload: InvestmentPackageCreate, admin_user=Depends(get_current_admin), db: Session = Depends(get_db)):
@@ -21,21 +33,38 @@ def create_package(payload: InvestmentPackageCreate, admin_user=Depends(get_curr
     return pkg
 
 @router.post("/me/invest", response_model=UserInvestmentOut)
-def create_user_investment(payload: UserInvestmentCreate, current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    wallet = wallet_service.get_wallet_by_user(db, current_user.id)
-    if not wallet:
-        raise HTTPException(404, "Wallet not found")
-    # simple balance check; real app should put txn/pending approval flow
-    if wallet.balance < payload.amount_invested:
-        raise HTTPException(400, "Insufficient balance to invest")
-    inv = investment_service.create_user_investment(db, current_user.id, payload.package_id, payload.amount_invested)
-    # deduct immediately; for demo simply subtract
-    wallet.balance = wallet.balance - payload.amount_invested
-    db.add(wallet)
-    db.commit()
-    return inv
+def create_user_investment(
+    payload: UserInvestmentCreate,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    def run():
+        wallet = wallet_service.get_wallet_by_user(db, current_user.id)
+        if not wallet:
+            raise HTTPException(404, "Wallet not found")
+        if not wallet.allow_purchases:
+            raise HTTPException(403, "Purchases are disabled for your account")
+        if not admin_service.get_controls_snapshot(db).allow_purchases:
+            raise HTTPException(403, "Purchases are temporarily disabled")
+        # fast path; the service re-checks atomically while debiting
+        if wallet.balance < payload.amount_invested:
+            raise HTTPException(400, "Insufficient balance to invest")
+        try:
+            return investment_service.create_user_investment(
+                db, current_user.id, payload.package_id, payload.amount_invested, commit=False
+            )
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+    # a retried purchase with the same Idempotency-Key is not debited twice
+    return idempotent(
+        db, current_user.id, idempotency_key, "investments.invest", payload.dict(), run, UserInvestmentOut
+    )
 
 @router.get("/me/investments", response_model=List[UserInvestmentOut])
 def list_my_investments(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    investments = db.query(models.investment.UserInvestment).filter(models.investment.UserInvestment.user_id == current_user.id).all()
-    return investments
+    if settings.FAST_LIST_RESPONSES:
+        conditions = investment_service.investment_filters(user_id=current_user.id)
+        return FastJSONResponse(investment_service.list_investment_rows(db, *conditions))
+    return investment_service.list_user_investments(db, current_user.id)
@@ -0,0 +1,18 @@
+# backend/app/api/metrics.py
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from app.core import metrics
+from app.core.config import settings
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus text exposition. Sync, so reading the multiprocess files stays off the event loop."""
+    token = settings.METRICS_BEARER_TOKEN
+    if token and not secrets.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    # CONTENT_TYPE_LATEST already names the charset; media_type= would append a second one
+    return Response(metrics.render(), headers={"Content-Type": metrics.CONTENT_TYPE_LATEST})
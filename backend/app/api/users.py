@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.dependencies import get_current_user
-from app.db.session import get_db
+from app.core.dependencies import get_current_user, get_current_user_async
+from app.db.session import get_db, get_async_db
+from app.services import user_service
 # 🌟 FIX: Import the new UserProfileOut from schemas
 from app.schemas.user import UserOut, UserProfileOut 
 from app import models
@@ -25,13 +27,14 @@ class UserProfileUpdate(BaseModel):
 
 # --- Get current user ---
 @router.get("/me", response_model=UserOut)
-def read_current_user(current_user=Depends(get_current_user)):
-    # When current_user (a SQLAlchemy User model instance) is passed to UserOut,
-    # Pydantic's orm_mode automatically loads:
-    # 1. User fields (id, email, role, etc.)
-    # 2. The nested 'profile' field via the relationship, which will be formatted
-    #    by the new UserProfileOut schema.
-    return current_user
+async def read_current_user(current_user=Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    # current_user is a cached Principal snapshot without relationships, so load the
+    # User together with its profile in one query. Pydantic's orm_mode then fills
+    # the nested 'profile' field via the UserProfileOut schema.
+    user = await user_service.get_user_with_profile_async(db, current_user.id)
+    if not user:
+        raise HTTPException(404, "User not found")
+    return user
 
 # --- Get current user's profile (still useful for direct profile access) ---
 @router.get("/me/profile", response_model=UserProfileOut)
@@ -1,70 +1,115 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List
-from app.core.dependencies import get_current_user, get_current_admin
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.api.idempotency import idempotent
+from app.core.dependencies import get_current_user, get_current_user_async, get_current_admin
+from app.db.session import get_db, get_async_db
 from app.services import wallet_service, admin_service
-from app.schemas.wallet import WalletOut, TransactionCreate, TransactionOut
+from app.schemas.wallet import WalletOut, WalletEarnings, TransactionCreate, TransactionOut
+from app.schemas.transaction import TransactionPage
 from app import models
 
 router = APIRouter()
 
 # -------------------- USER WALLET --------------------
+# Read-only endpoints here are async on the async session stack, so they do not hold
+# a threadpool worker for the DB round trip. WalletOut has no relationship fields,
+# so nothing needs eager loading.
 @router.get("/me", response_model=WalletOut)
-def get_my_wallet(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    wallet = (
-        db.query(models.wallet.Wallet)
-        .options(joinedload(models.wallet.Wallet.user).joinedload(models.user.User.profile))
-        .filter(models.wallet.Wallet.user_id == current_user.id)
-        .first()
-    )
+async def get_my_wallet(current_user=Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    wallet = await wallet_service.get_wallet_by_user_async(db, current_user.id)
     if not wallet:
         raise HTTPException(404, "Wallet not found")
 
     return wallet
 
-# ✅ List user's transactions
-@router.get("/me/transactions", response_model=List[TransactionOut])
-def get_my_transactions(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    wallet = wallet_service.get_wallet_by_user(db, current_user.id)
+# ✅ List user's transactions (deprecated): only the newest `limit`, served like the first page of
+# /me/transactions/page so the archive is read only when the hot rows run out
+@router.get("/me/transactions", response_model=List[TransactionOut], deprecated=True)
+async def get_my_transactions(
+    limit: int = Query(500, ge=1, le=500),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    wallet = await wallet_service.get_wallet_by_user_async(db, current_user.id)
+    if not wallet:
+        raise HTTPException(404, "Wallet not found")
+    transactions, _ = await wallet_service.list_wallet_transactions_page_async(db, wallet.id, limit)
+    return transactions
+
+# ✅ Lifetime approved earnings, without sending the history
+@router.get("/me/earnings", response_model=WalletEarnings)
+async def get_my_earnings(current_user=Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    wallet = await wallet_service.get_wallet_by_user_async(db, current_user.id)
     if not wallet:
         raise HTTPException(404, "Wallet not found")
-    return wallet_service.list_transactions(db, wallet.id)
+    return {"total_earnings": await wallet_service.wallet_earnings_total_async(db, wallet.id)}
+
+# ✅ One page of the user's transactions; older pages via ?cursor=next_cursor
+@router.get("/me/transactions/page", response_model=TransactionPage)
+async def get_my_transactions_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    wallet = await wallet_service.get_wallet_by_user_async(db, current_user.id)
+    if not wallet:
+        raise HTTPException(404, "Wallet not found")
+    try:
+        transactions, next_cursor = await wallet_service.list_wallet_transactions_page_async(db, wallet.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return {"items": transactions, "next_cursor": next_cursor}
 
 # Create a transaction
 @router.post("/me/transactions", response_model=TransactionOut)
 def create_transaction_for_me(
     payload: TransactionCreate,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
-    wallet = wallet_service.get_wallet_by_user(db, current_user.id)
-    if not wallet:
-        raise HTTPException(404, "Wallet not found")
+    def run():
+        wallet = wallet_service.get_wallet_by_user(db, current_user.id)
+        if not wallet:
+            raise HTTPException(404, "Wallet not found")
+
+        # ✅ Check per-wallet permissions
+        if payload.type == "deposit" and not wallet.allow_deposits:
+            raise HTTPException(403, "Deposits are disabled for your account")
+        if payload.type == "withdrawal" and not wallet.allow_withdrawals:
+            raise HTTPException(403, "Withdrawals are disabled for your account")
+        if payload.type == "purchase" and not wallet.allow_purchases:
+            raise HTTPException(403, "Purchases are disabled for your account")
+
+        # Platform-wide switches (cached snapshot, no query on the hot path)
+        if not admin_service.get_controls_snapshot(db).allows(payload.type):
+            raise HTTPException(403, f"{payload.type.capitalize()}s are temporarily disabled")
 
-    # ✅ Check per-wallet permissions
-    if payload.type == "deposit" and not wallet.allow_deposits:
-        raise HTTPException(403, "Deposits are disabled for your account")
-    if payload.type == "withdrawal" and not wallet.allow_withdrawals:
-        raise HTTPException(403, "Withdrawals are disabled for your account")
-    if payload.type == "purchase" and not wallet.allow_purchases:
-        raise HTTPException(403, "Purchases are disabled for your account")
+        return wallet_service.create_transaction(
+            db,
+            wallet_id=wallet.id,
+            type=payload.type,
+            amount=payload.amount,
+            reference=payload.reference,
+            note=payload.note,
+            commit=False,
+        )
 
-    txn = wallet_service.create_transaction(
-        db,
-        wallet_id=wallet.id,
-        type=payload.type,
-        amount=payload.amount,
-        reference=payload.reference,
-        note=payload.note
+    # retries carrying the same Idempotency-Key get the first response back instead of a new transaction
+    return idempotent(
+        db, current_user.id, idempotency_key, "wallets.create_transaction", payload.dict(), run, TransactionOut
     )
-    return txn
 
 # -------------------- ADMIN TRANSACTIONS --------------------
 @router.post("/admin/transactions/{txn_id}/approve")
 def admin_approve_transaction(txn_id: int, admin_user=Depends(get_current_admin), db: Session = Depends(get_db)):
     try:
         txn = wallet_service.approve_transaction(db, txn_id)
+    except wallet_service.InvalidTransition as e:
+        raise HTTPException(409, str(e))
     except ValueError as e:
         raise HTTPException(404, str(e))
     return {"msg": "approved", "transaction_id": txn.id}
@@ -73,6 +118,8 @@ def admin_approve_transaction(txn_id: int, admin_user=Depends(get_current_admin)
 def admin_reject_transaction(txn_id: int, admin_user=Depends(get_current_admin), db: Session = Depends(get_db)):
     try:
         txn = wallet_service.reject_transaction(db, txn_id)
+    except wallet_service.InvalidTransition as e:
+        raise HTTPException(409, str(e))
     except ValueError as e:
         raise HTTPException(404, str(e))
     return {"msg": "rejected", "transaction_id": txn.id}
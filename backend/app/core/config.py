@@ -6,6 +6,22 @@ import json
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # async endpoints; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Connection pool, applied to both the sync and async engines (ignored for SQLite).
+    # Each worker process gets its own pool: size * workers must fit max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30          # seconds to wait for a connection before failing
+    DB_POOL_RECYCLE: int = 1800          # seconds; -1 disables recycling
+    DB_POOL_PRE_PING: bool = True        # test connections on checkout (pessimistic disconnect handling)
+    DB_POOL_USE_LIFO: bool = False       # LIFO lets idle connections time out server-side
+    # What each worker does about the schema when it starts:
+    #   create_all - create missing tables from the models (local runs; a round trip per table)
+    #   check      - one query comparing alembic_version with the migration head; refuses to start on mismatch
+    #   skip       - nothing; the deploy runs and verifies `alembic upgrade head`
+    DB_SCHEMA_STARTUP: str = "create_all"
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
@@ -14,6 +30,86 @@ class Settings(BaseSettings):
     # Accept raw env string first, then parse to list
     BACKEND_CORS_ORIGINS: Optional[str] = None
 
+    # Authenticated-principal cache (per worker). Any write to users made through the app's
+    # engines bumps the "principals" version; the writing worker drops its cache at commit and
+    # the others within CACHE_VERSION_CHECK_SECONDS. The TTL only bounds SQL run outside the app.
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # bcrypt process pool used by /auth/token and /auth/register (0 = run in the shared threadpool).
+    # Jobs beyond workers + max queue are rejected with 503 instead of waiting.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    # niceness added to the pool's processes so request handling wins the CPU during a storm
+    PASSWORD_HASH_NICE: int = 19
+
+    # Most transaction ids accepted by one POST /api/admin/transactions/bulk call.
+    BULK_TRANSACTION_MAX_IDS: int = 1000
+
+    # Rows each admin summary counter is spread over; more slots = less lock contention on writes.
+    ADMIN_SUMMARY_SLOTS: int = 8
+
+    # Settled transactions older than this many days are moved to transactions_archive by
+    # scripts/archive_transactions.py; history reads union the archive back in only when
+    # a request reaches past the hot rows.
+    TRANSACTION_HOT_DAYS: int = 90
+
+    # Versioned in-process caches (package catalog, principals, ...): how often a worker re-reads the
+    # version row to notice edits made by other workers. 0 = on every request.
+    CACHE_VERSION_CHECK_SECONDS: float = 2.0
+    # Browser / CDN freshness for GET /api/investments/packages; revalidated with ETag afterwards.
+    PACKAGE_CATALOG_MAX_AGE_SECONDS: int = 60
+
+    # Global deposit/withdrawal/purchase switches are cached per worker for this long;
+    # the worker that changes them applies the change immediately.
+    ADMIN_CONTROLS_TTL_SECONDS: float = 5.0
+
+    # Opt-in fast path for list endpoints: column-projected rows encoded with
+    # app.core.fast_json instead of ORM objects validated through response_model.
+    FAST_LIST_RESPONSES: bool = False
+
+    # Idempotency-Key support on money-moving POSTs. Keys are remembered for the TTL;
+    # a duplicate that arrives while the first request is still running waits up to
+    # WAIT_SECONDS for its result. An in-progress claim older than LOCK_SECONDS is
+    # treated as abandoned (worker crashed) and may be re-executed.
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+
+    # Token-bucket limits on /api/auth/token and /api/auth/register, checked before any
+    # hashing or DB work (429 + Retry-After). "memory" keeps buckets per worker, so the
+    # effective budget scales with the worker count; a redis:// URL shares them (needs `redis`).
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000      # buckets kept by the memory backend
+    # Reverse proxies in front of the app whose X-Forwarded-For entry is trusted (0 = use the socket peer).
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0
+    # burst = bucket size, per minute = refill rate
+    LOGIN_RATE_LIMIT_IP_BURST: int = 10
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 10
+    LOGIN_RATE_LIMIT_ACCOUNT_BURST: int = 5
+    LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE: float = 5
+    REGISTER_RATE_LIMIT_IP_BURST: int = 5
+    REGISTER_RATE_LIMIT_IP_PER_MINUTE: float = 5
+
+    # Per-request profiling (app.core.profiling): share of requests whose SQL and
+    # serialization time is tracked; 0 leaves the middleware out entirely.
+    PROFILE_SAMPLE_RATE: float = 1.0
+    SERVER_TIMING_HEADER: bool = True      # Server-Timing: db;dur=..., serialize;dur=..., app;dur=...
+    # Profiled requests at least this slow are logged to "app.profiling" as one JSON line.
+    SLOW_REQUEST_MS: float = 500
+    SLOW_REQUEST_LOG_SAMPLE_RATE: float = 1.0
+    SLOW_REQUEST_TOP_STATEMENTS: int = 5
+
+    # Prometheus metrics at GET /metrics. With more than one worker, point METRICS_MULTIPROC_DIR
+    # at an empty directory shared by all of them (wipe it on deploy) so a scrape sees every
+    # worker. Set a bearer token unless /metrics is only reachable from the scraper's network.
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_BEARER_TOKEN: Optional[str] = None
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,32 +1,65 @@
 # backend/app/core/dependencies.py
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.security import decode_access_token
+from app.db.session import get_db, get_async_db
+from app.core.security import InvalidToken, decode_access_token
+from app.core.principal_cache import PRINCIPALS, Principal, principal_cache
+from app.core.versioned_cache import version_query
 from app import models
+from app.services import user_service
 from app.schemas.user import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _user_id_from_token(token: str) -> int:
     try:
         payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    user = db.query(models.user.User).filter(models.user.User.id == int(user_id)).first()
-    if user is None:
-        raise credentials_exception
-    return user
+            raise _credentials_exception()
+    except InvalidToken:
+        raise _credentials_exception()
+    return int(user_id)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user_id = _user_id_from_token(token)
+    # a users write anywhere drops every cached snapshot at this worker's next version check
+    if principal_cache.needs_version_check():
+        principal_cache.validate_version(db.execute(version_query(PRINCIPALS)).scalar() or 0)
+    # cached snapshot first; the users lookup only runs on a miss
+    generation = principal_cache.generation
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = db.query(models.user.User).filter(models.user.User.id == user_id).first()
+        if user is None:
+            raise _credentials_exception()
+        principal = Principal.from_user(user)
+        principal_cache.put(principal, generation)
+    return principal
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Same as get_current_user, for async handlers: a cache miss is served by the async session."""
+    user_id = _user_id_from_token(token)
+    if principal_cache.needs_version_check():
+        principal_cache.validate_version((await db.execute(version_query(PRINCIPALS))).scalar() or 0)
+    generation = principal_cache.generation
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await user_service.get_user_async(db, user_id)
+        if user is None:
+            raise _credentials_exception()
+        principal = Principal.from_user(user)
+        principal_cache.put(principal, generation)
+    return principal
 
 def get_current_active_user(current_user=Depends(get_current_user)):
     # placeholder for e.g. checking is_active
@@ -0,0 +1,41 @@
+# backend/app/core/fast_json.py
+"""
+Fast path for large list responses: plain dicts from column-projected queries,
+encoded straight to bytes. Output matches what FastAPI's jsonable_encoder would
+produce for the same response_model (Decimal -> float, datetime -> ISO 8601).
+orjson is used when installed; the stdlib encoder is the fallback.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+from app.core.profiling import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # orjson encodes datetimes itself; OPT_PASSTHROUGH_DATETIME keeps isoformat() output identical
+        return orjson.dumps(content, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """Returned directly from an endpoint, so the response_model (and OpenAPI) stay as declared."""
+
+    def render(self, content: Any) -> bytes:
+        with timed_serialization():
+            return dumps(content)
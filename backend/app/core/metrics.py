@@ -0,0 +1,125 @@
+# backend/app/core/metrics.py
+"""
+Prometheus metrics, exposed at GET /metrics.
+
+Each worker process counts in its own memory, so with several workers
+(uvicorn --workers / gunicorn) a scrape would only see whichever worker
+answered it. Set METRICS_MULTIPROC_DIR to an empty directory shared by the
+workers (and cleared before the server starts): every worker then writes its
+samples to files there and /metrics aggregates all of them.
+"""
+import os
+import time
+from app.core.config import settings
+
+if settings.METRICS_MULTIPROC_DIR:
+    # prometheus_client picks its storage when it is first imported
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.METRICS_MULTIPROC_DIR)
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# ---- HTTP ----
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requests served, by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time from receiving a request to the end of its response body.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size.",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+# ---- Database pool (fed by app.db.pool_stats) ----
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT.", ["engine"])
+DB_POOL_CONNECTS = Counter("db_pool_connects_total", "New database connections opened.", ["engine"])
+DB_POOL_INVALIDATIONS = Counter("db_pool_invalidations_total", "Pooled connections discarded as broken.", ["engine"])
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections currently checked out.", ["engine"], multiprocess_mode="livesum",
+)
+
+# ---- Auth ----
+PASSWORD_VERIFY_DURATION = Histogram(
+    "password_verify_seconds", "bcrypt verification time in the hashing pool (excludes queueing).",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5),
+)
+
+# ---- Business ----
+TRANSACTIONS_CREATED = Counter("transactions_created_total", "Wallet transactions created.", ["type"])
+TRANSACTION_STATUS_CHANGES = Counter(
+    "transaction_status_changes_total", "Transactions moved to a new status (approved, rejected, pending).",
+    ["type", "status"],
+)
+INVESTMENTS_CREATED = Counter("investments_created_total", "User investments opened.")
+
+
+def record_status_changes(rows, status: str) -> None:
+    """Count a committed batch of status changes; `rows` need a `.type`."""
+    counts = {}
+    for row in rows:
+        counts[row.type] = counts.get(row.type, 0) + 1
+    for type_, n in counts.items():
+        TRANSACTION_STATUS_CHANGES.labels(type_, status).inc(n)
+
+
+# ---- Exposition ----
+def render() -> bytes:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead() -> None:
+    """Shutdown hook: drop this worker's live gauges from the shared directory."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording count, latency and size per route template (not raw path)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500, "size": 0}
+
+        async def send_counting(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                status["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_counting)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                path = route.path
+            else:
+                # plain Starlette routes (/docs, /openapi.json) have fixed paths; 404s collapse into one series
+                path = scope["path"] if "endpoint" in scope else "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, path, str(status["code"])).inc()
+            HTTP_REQUEST_DURATION.labels(method, path).observe(time.perf_counter() - started)
+            HTTP_RESPONSE_SIZE.labels(method, path).observe(status["size"])
@@ -0,0 +1,40 @@
+# backend/app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque, URL-safe token.
+    Datetimes are stored as ISO strings so they round-trip through decode_cursor.
+    """
+    raw = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    token = base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode())
+    return token.decode().rstrip("=")
+
+
+def decode_cursor(token: str, *types: type) -> Tuple[Any, ...]:
+    """
+    Decode a token produced by encode_cursor. `types` gives the expected type of
+    each key part (datetime, int, str). Raises ValueError for malformed tokens.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(raw, list) or len(raw) != len(types):
+        raise ValueError("Invalid cursor")
+
+    values = []
+    try:
+        for value, typ in zip(raw, types):
+            if typ is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(typ(value))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
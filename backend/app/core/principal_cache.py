@@ -0,0 +1,138 @@
+# backend/app/core/principal_cache.py
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.versioned_cache import VersionedCache, bump_version
+
+# Version of the users table behind every cached Principal, bumped by any write to users
+PRINCIPALS = "principals"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Detached, read-only snapshot of the authenticated user.
+    Carries only what auth checks need; load the User row when relationships are required.
+    """
+    id: int
+    email: str
+    role: str
+    verification_level: int
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            verification_level=user.verification_level,
+            created_at=user.created_at,
+        )
+
+
+class PrincipalCache:
+    """
+    Thread-safe LRU of Principal snapshots by user id, with a per-entry TTL.
+    Entries are only served while the "principals" version they were read under is current:
+    callers check it with needs_version_check() / validate_version() (at most every
+    `check_interval` seconds, sooner on the worker that wrote), and a new version drops them all.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, check_interval: float, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.versions = VersionedCache(PRINCIPALS, check_interval)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0  # bumped by clear(); a lookup started before it must not put()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def needs_version_check(self) -> bool:
+        return self.enabled and self.versions.fresh_entry() is None
+
+    def validate_version(self, version: int) -> None:
+        """Record the current "principals" version, dropping every entry if it moved."""
+        if self.versions.validate(version) is None:
+            self.clear()
+            self.versions.store(version, None)
+
+    def put(self, principal: Principal, generation: int) -> None:
+        """Cache a snapshot read after `generation` was observed; dropped if the cache was cleared since."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "version": self.versions.stats()["version"],
+                "check_interval": self.versions.check_interval,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    check_interval=settings.CACHE_VERSION_CHECK_SECONDS,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
+
+# ---------------- Invalidation ----------------
+# Matched on the SQL itself, so ORM flushes, bulk query().update() / delete(), Core statements
+# and text() all count. The bump runs on the same connection, inside the writer's transaction.
+_USERS_WRITE = re.compile(r'^\s*(?:update|delete\s+from)\s+"?users"?(?=[\s(]|$)', re.IGNORECASE)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _users_written(conn, cursor, statement, parameters, context, executemany):
+    if _USERS_WRITE.match(statement):
+        bump_version(conn, PRINCIPALS)
@@ -0,0 +1,219 @@
+# backend/app/core/profiling.py
+"""
+Per-request cost accounting.
+
+ProfilingMiddleware opens a RequestProfile for a sampled request; SQLAlchemy
+engine events add every statement's time to the profile of the request that
+issued it, and the statement's cursor is wrapped so the rows actually fetched
+from it are counted as they are read (drivers' rowcount is -1 for SELECTs on
+SQLite and for server-side cursors). The profile is carried in a context
+variable, which FastAPI copies into the threadpool, so sync and async endpoints
+are both covered.
+
+"serialize" is the time spent in FastJSONResponse.render (the fast path for
+large lists); FastAPI's own response_model serialization is counted in "app".
+
+Each profiled response gets a Server-Timing header (db, serialize, app) and
+requests slower than SLOW_REQUEST_MS are logged as one JSON line with their
+most expensive statements, which is where N+1 patterns show up: the same
+statement repeated once per row.
+"""
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger("app.profiling")
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    __slots__ = ("started", "sql_count", "sql_time", "rows", "serialize_time", "statements")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.rows = 0
+        self.serialize_time = 0.0
+        # statement text -> [executions, seconds, rows fetched]
+        self.statements: Dict[str, list] = {}
+
+    def add_statement(self, statement: str, seconds: float) -> list:
+        """Record one execution; returns the statement's entry so fetched rows can be added to it."""
+        self.sql_count += 1
+        self.sql_time += seconds
+        entry = self.statements.get(statement)
+        if entry is None:
+            entry = self.statements[statement] = [1, seconds, 0]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+        return entry
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        total = self.elapsed()
+        app_time = max(total - self.sql_time - self.serialize_time, 0.0)
+        return (
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries", '
+            f"serialize;dur={self.serialize_time * 1000:.1f}, "
+            f"app;dur={app_time * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+    def top_statements(self, limit: int) -> List[dict]:
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"sql": " ".join(sql.split())[:300], "count": count, "ms": round(seconds * 1000, 2), "rows": rows}
+            for sql, (count, seconds, rows) in ranked
+        ]
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+class timed_serialization:
+    """`with timed_serialization():` adds the block's time to the current request's serialize bucket."""
+
+    __slots__ = ("profile", "started")
+
+    def __enter__(self):
+        self.profile = _current.get()
+        self.started = time.perf_counter() if self.profile is not None else 0.0
+        return self
+
+    def __exit__(self, *exc):
+        if self.profile is not None:
+            self.profile.serialize_time += time.perf_counter() - self.started
+        return False
+
+
+# ---------------- SQL accounting ----------------
+class _CountingCursor:
+    """DBAPI cursor proxy that adds every row fetched through it to the request profile."""
+
+    __slots__ = ("_cursor", "_profile", "_entry")
+
+    def __init__(self, cursor, profile: RequestProfile, entry: list):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_profile", profile)
+        object.__setattr__(self, "_entry", entry)
+
+    def _count(self, n: int) -> None:
+        self._profile.rows += n
+        self._entry[2] += n
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    stack = conn.info.get("profiling_started")
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    entry = profile.add_statement(statement, elapsed)
+    # the result object is built from context.cursor right after this event, so its fetches go through the proxy
+    if context is not None and context.cursor is cursor:
+        context.cursor = _CountingCursor(cursor, profile, entry)
+
+
+_installed = False
+
+
+def install() -> None:
+    """Listen on every Engine (sync, and the async engines' sync_engine)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------------- Middleware ----------------
+class ProfilingMiddleware:
+    """Pure ASGI middleware, so streaming responses and context variables pass through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+        install()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= settings.PROFILE_SAMPLE_RATE:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        status = {"code": None}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if settings.SERVER_TIMING_HEADER:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = profile.elapsed()
+            if elapsed * 1000 >= settings.SLOW_REQUEST_MS and random.random() < settings.SLOW_REQUEST_LOG_SAMPLE_RATE:
+                endpoint = scope.get("endpoint")
+                logger.warning(json.dumps({
+                    "event": "slow_request",
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "endpoint": getattr(endpoint, "__name__", None),
+                    "status": status["code"],
+                    "ms": round(elapsed * 1000, 1),
+                    "sql_count": profile.sql_count,
+                    "sql_ms": round(profile.sql_time * 1000, 1),
+                    "rows": profile.rows,
+                    "serialize_ms": round(profile.serialize_time * 1000, 1),
+                    "top_statements": profile.top_statements(settings.SLOW_REQUEST_TOP_STATEMENTS),
+                }))
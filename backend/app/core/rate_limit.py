@@ -0,0 +1,163 @@
+# backend/app/core/rate_limit.py
+"""
+Token-bucket rate limiting for the auth endpoints.
+
+A bucket holds up to `burst` tokens and refills at `per_minute` tokens a
+minute; every request takes one. When the bucket is empty the caller is told
+how many seconds until a token is available, which becomes Retry-After.
+
+Buckets live in a backend. MemoryBackend keeps them in the worker process, so
+with N workers a client effectively gets N times the budget. RedisBackend keeps
+them in Redis (one Lua call per check) so all workers share them; it needs the
+optional `redis` package. Anything with the same `take()` coroutine can be
+plugged in with configure().
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Limit:
+    burst: int
+    per_minute: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens per second."""
+        return self.per_minute / 60.0
+
+
+class MemoryBackend:
+    """Per-process buckets in a bounded LRU; the least recently used bucket is dropped (i.e. refilled) first."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take one token from `key`'s bucket. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(limit.burst), now))
+            tokens = min(float(limit.burst), tokens + (now - updated) * limit.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / limit.rate if limit.rate else float("inf")
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# Same arithmetic as MemoryBackend.take, run atomically in Redis against the server clock.
+_REDIS_TAKE = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Buckets shared by every worker through Redis."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND points at Redis but the 'redis' package is not installed") from e
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    async def take(self, key: str, limit: Limit) -> float:
+        wait = await self._take(keys=[self.prefix + key], args=[limit.burst, limit.rate])
+        return float(wait)
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limited, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def create_backend(spec: str):
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(spec)
+    if spec == "memory":
+        return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {spec!r}")
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = create_backend(settings.RATE_LIMIT_BACKEND)
+    return _backend
+
+
+def configure(backend) -> None:
+    """Swap in a different backend (e.g. a shared one built by the deployment)."""
+    global _backend
+    _backend = backend
+
+
+async def check(*buckets) -> None:
+    """
+    Take a token from each (key, Limit) bucket; raise RateLimited with the longest wait if any is empty.
+    Every bucket is charged even when an earlier one refuses, so hammering one key can't
+    spare the others.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    backend = get_backend()
+    wait = 0.0
+    for key, limit in buckets:
+        wait = max(wait, await backend.take(key, limit))
+    if wait > 0:
+        raise RateLimited(wait)
+
+
+def client_ip(request) -> str:
+    """
+    Caller address. Behind RATE_LIMIT_TRUSTED_PROXIES reverse proxies, the address the
+    outermost trusted proxy saw, taken from X-Forwarded-For; the left part of that header
+    is client-controlled and never used on its own.
+    """
+    hops = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if hops > 0:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+
+def account_key(email: Optional[str]) -> str:
+    return (email or "").strip().lower()
@@ -1,16 +1,114 @@
-from passlib.context import CryptContext
+import asyncio
+import threading
+import time
 from datetime import datetime, timedelta
-from jose import jwt
 from typing import Optional
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib, jose (with its cryptography backend) and the process pool machinery are
+# imported on first use rather than with this module, keeping them off worker boot
+# and out of CLI scripts that never hash or sign anything.
+_pwd_context = None
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+# ---------------- Password hashing pool ----------------
+# bcrypt is deliberately slow. Running it in request threads lets a login burst
+# occupy the AnyIO threadpool that every sync endpoint shares, so hashing gets
+# its own process pool with a bounded number of in-flight jobs.
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool already has its maximum number of jobs in flight."""
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+_hash_inflight = 0
+
+def _lower_priority(increment: int) -> None:
+    # runs in each pool process; bcrypt then only gets CPU the web workers leave idle
+    import os
+    if increment > 0 and hasattr(os, "nice"):
+        os.nice(increment)
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    initializer=_lower_priority,
+                    initargs=(settings.PASSWORD_HASH_NICE,),
+                )
+    return _hash_pool
+
+def _hash_capacity() -> int:
+    return max(settings.PASSWORD_HASH_WORKERS, 1) + settings.PASSWORD_HASH_MAX_QUEUE
+
+def ensure_hashing_capacity() -> None:
+    """Cheap pre-check so saturated requests are turned away before any DB work."""
+    if _hash_inflight >= _hash_capacity():
+        raise PasswordHashingBusy()
+
+async def _run_hashing(fn, *args):
+    global _hash_inflight
+    with _hash_pool_lock:
+        if _hash_inflight >= _hash_capacity():
+            raise PasswordHashingBusy()
+        _hash_inflight += 1
+    try:
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            # pool disabled: fall back to the shared threadpool
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.wrap_future(_get_hash_pool().submit(fn, *args))
+    finally:
+        with _hash_pool_lock:
+            _hash_inflight -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+def _timed_verify(plain_password: str, hashed_password: str):
+    started = time.perf_counter()
+    return verify_password(plain_password, hashed_password), time.perf_counter() - started
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    valid, seconds = await _run_hashing(_timed_verify, plain_password, hashed_password)
+    # imported here: the hashing pool's processes load this module and have no use for metrics
+    from app.core.metrics import PASSWORD_VERIFY_DURATION
+    PASSWORD_VERIFY_DURATION.observe(seconds)
+    return valid
+
+def hash_pool_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+        "nice": settings.PASSWORD_HASH_NICE,
+        "in_flight": _hash_inflight,
+    }
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+class InvalidToken(Exception):
+    """The bearer token is malformed, expired or not signed with SECRET_KEY."""
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None, role: Optional[str] = None) -> str:
     """
@@ -25,12 +123,17 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None,
     if role:
         to_encode["role"] = role
 
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def decode_access_token(token: str) -> dict:
     """
-    Decode JWT token into a dictionary.
+    Decode JWT token into a dictionary. Raises InvalidToken.
     """
-    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    from jose import JWTError, jwt
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        raise InvalidToken(str(e)) from e
     return payload
@@ -0,0 +1,141 @@
+# backend/app/core/versioned_cache.py
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app import models
+from app.db.upsert import upsert_increment
+
+cache_versions = models.admin.CacheVersion.__table__
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    version: int
+    value: Any
+    etag: str
+
+
+class VersionedCache:
+    """
+    Per-worker cache of one value whose freshness is tracked by a row in cache_versions.
+    Writers call bump_version() in their transaction; every worker notices the new version
+    at its next check (at most every `check_interval` seconds), the writing worker at commit.
+    """
+
+    def __init__(self, name: str, check_interval: float):
+        self.name = name
+        self.check_interval = check_interval
+        self._entry: Optional[CacheEntry] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.version_checks = 0
+        self.loads = 0
+        _registry[name] = self
+
+    def fresh_entry(self) -> Optional[CacheEntry]:
+        """The cached entry if it was validated against the database recently enough, else None."""
+        with self._lock:
+            if self._entry is not None and time.monotonic() - self._checked_at < self.check_interval:
+                self.hits += 1
+                return self._entry
+            return None
+
+    def validate(self, version: int) -> Optional[CacheEntry]:
+        """Record a version check; returns the entry if it is still current."""
+        with self._lock:
+            self.version_checks += 1
+            if self._entry is not None and self._entry.version == version:
+                self._checked_at = time.monotonic()
+                return self._entry
+            return None
+
+    def store(self, version: int, value: Any) -> CacheEntry:
+        entry = CacheEntry(version=version, value=value, etag=f'"{self.name}-v{version}"')
+        with self._lock:
+            self.loads += 1
+            self._entry = entry
+            self._checked_at = time.monotonic()
+        return entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "version": self._entry.version if self._entry else None,
+                "check_interval": self.check_interval,
+                "hits": self.hits,
+                "version_checks": self.version_checks,
+                "loads": self.loads,
+            }
+
+
+_registry: Dict[str, VersionedCache] = {}
+_PENDING_KEY = "versioned_cache_bumped"
+
+
+def _slot_names(name: str, slots: int):
+    return [f"{name}:{slot}" for slot in range(slots)]
+
+
+def version_query(name: str, slots: int = 1):
+    """
+    SELECT of the current version (None until the first bump); run it with a sync or async session.
+    A striped version (slots > 1) is the sum of its slot rows, which only ever grows.
+    """
+    if slots == 1:
+        return select(cache_versions.c.version).where(cache_versions.c.name == name)
+    return select(func.sum(cache_versions.c.version)).where(cache_versions.c.name.in_(_slot_names(name, slots)))
+
+
+def bump_version(db, name: str, slots: int = 1) -> None:
+    """
+    Increment `name`'s version inside the caller's transaction (a Session, or a Connection
+    from an engine event). Does not commit.
+    With slots > 1 a random slot row is bumped, so frequent writers don't queue on one row lock.
+    """
+    row_name = name if slots == 1 else random.choice(_slot_names(name, slots))
+    upsert_increment(
+        db, cache_versions, ["name"],
+        [{"name": row_name, "version": 1, "updated_at": datetime.utcnow()}],
+        ["version"], ["updated_at"],
+    )
+    db.info.setdefault(_PENDING_KEY, set()).add(name)
+
+
+def _invalidate(names) -> None:
+    for name in names:
+        cache = _registry.get(name)
+        if cache is not None:
+            cache.invalidate()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    _invalidate(session.info.pop(_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# bumps made on a Connection are tracked in its info until its transaction ends
+@event.listens_for(Engine, "commit")
+def _invalidate_committed_connection(conn):
+    _invalidate(conn.info.pop(_PENDING_KEY, ()))
+
+
+@event.listens_for(Engine, "rollback")
+def _forget_rolled_back_connection(conn):
+    conn.info.pop(_PENDING_KEY, None)
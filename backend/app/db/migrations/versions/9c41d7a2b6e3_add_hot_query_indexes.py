@@ -0,0 +1,54 @@
+"""Add indexes for hot query shapes
+
+Revision ID: 9c41d7a2b6e3
+Revises: 68298e64f9a4
+Create Date: 2026-10-17 09:12:40.118204
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9c41d7a2b6e3'
+down_revision = '68298e64f9a4'
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'pending'")
+
+def upgrade() -> None:
+    # Build the indexes CONCURRENTLY on Postgres so live tables are not write-locked.
+    # That cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_wallet_id_created_at', 'transactions',
+            ['wallet_id', 'created_at', 'id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_transactions_created_at_id', 'transactions',
+            ['created_at', 'id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_transactions_status_created_at', 'transactions',
+            ['status', 'created_at', 'id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_transactions_pending_created_at', 'transactions',
+            ['created_at', 'id'], postgresql_where=PENDING, sqlite_where=PENDING,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_user_investments_user_id', 'user_investments',
+            ['user_id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_user_investments_status_end_date', 'user_investments',
+            ['status', 'end_date'], postgresql_concurrently=True
+        )
+
+def downgrade() -> None:
+    op.drop_index('ix_user_investments_status_end_date', table_name='user_investments')
+    op.drop_index('ix_user_investments_user_id', table_name='user_investments')
+    op.drop_index('ix_transactions_pending_created_at', table_name='transactions')
+    op.drop_index('ix_transactions_status_created_at', table_name='transactions')
+    op.drop_index('ix_transactions_created_at_id', table_name='transactions')
+    op.drop_index('ix_transactions_wallet_id_created_at', table_name='transactions')
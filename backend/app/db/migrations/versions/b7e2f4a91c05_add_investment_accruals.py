@@ -0,0 +1,32 @@
+"""Add investment accrual ledger
+
+Revision ID: b7e2f4a91c05
+Revises: 9c41d7a2b6e3
+Create Date: 2026-10-17 11:02:15.504873
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2f4a91c05'
+down_revision = '9c41d7a2b6e3'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('investment_accruals',
+    sa.Column('accrual_date', sa.Date(), nullable=False),
+    sa.Column('investment_id', sa.Integer(), nullable=False),
+    sa.Column('wallet_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=18, scale=6), nullable=False),
+    sa.Column('run_id', sa.String(length=32), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['investment_id'], ['user_investments.id'], ),
+    sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+    sa.PrimaryKeyConstraint('accrual_date', 'investment_id')
+    )
+    op.create_index('ix_investment_accruals_date_wallet', 'investment_accruals', ['accrual_date', 'wallet_id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_investment_accruals_date_wallet', table_name='investment_accruals')
+    op.drop_table('investment_accruals')
@@ -0,0 +1,37 @@
+"""Add transactions archive
+
+Revision ID: c6e1a8f3d925
+Revises: a53e8f0c2d76
+Create Date: 2026-10-17 22:04:51.310417
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c6e1a8f3d925'
+down_revision = 'a53e8f0c2d76'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('transactions_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('wallet_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=18, scale=6), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('reference', sa.String(), nullable=True),
+    sa.Column('note', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_archive_wallet_id_created_at', 'transactions_archive', ['wallet_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_transactions_archive_created_at_id', 'transactions_archive', ['created_at', 'id'], unique=False)
+    op.create_index('ix_transactions_archive_status_created_at', 'transactions_archive', ['status', 'created_at', 'id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_archive_status_created_at', table_name='transactions_archive')
+    op.drop_index('ix_transactions_archive_created_at_id', table_name='transactions_archive')
+    op.drop_index('ix_transactions_archive_wallet_id_created_at', table_name='transactions_archive')
+    op.drop_table('transactions_archive')
@@ -0,0 +1,30 @@
+"""Add indexes for the paginated admin user listing
+
+Revision ID: d41f6c8e2a17
+Revises: b7e2f4a91c05
+Create Date: 2026-10-17 14:05:22.530917
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd41f6c8e2a17'
+down_revision = 'b7e2f4a91c05'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # CONCURRENTLY on Postgres so the users table stays writable while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at_id', 'users',
+            ['created_at', 'id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_users_role_created_at', 'users',
+            ['role', 'created_at', 'id'], postgresql_concurrently=True
+        )
+
+def downgrade() -> None:
+    op.drop_index('ix_users_role_created_at', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
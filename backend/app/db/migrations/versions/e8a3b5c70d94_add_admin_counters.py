@@ -0,0 +1,27 @@
+"""Add admin summary counters
+
+Revision ID: e8a3b5c70d94
+Revises: d41f6c8e2a17
+Create Date: 2026-10-17 16:40:09.271634
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e8a3b5c70d94'
+down_revision = 'd41f6c8e2a17'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('admin_counters',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=20, scale=6), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name', 'slot')
+    )
+    # the table starts empty: run scripts/rebuild_admin_summary.py once after upgrading
+
+def downgrade() -> None:
+    op.drop_table('admin_counters')
@@ -0,0 +1,25 @@
+"""Add cache version table
+
+Revision ID: f27c9d4e1b58
+Revises: e8a3b5c70d94
+Create Date: 2026-10-17 18:22:47.006318
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f27c9d4e1b58'
+down_revision = 'e8a3b5c70d94'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
@@ -0,0 +1,139 @@
+# backend/app/db/pool_stats.py
+import threading
+from collections import deque
+from time import perf_counter
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core import metrics as prometheus
+
+# how many recent checkout waits to keep for percentiles
+WAIT_SAMPLES = 2048
+
+
+class PoolMetrics:
+    """
+    Checkout wait times, in-use count and overflow usage for one engine's pool.
+    Everything recorded here is also exported to Prometheus, labelled engine=<name>.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        prometheus.DB_POOL_CHECKOUT_WAIT.labels(self.name).observe(seconds)
+        if timed_out:
+            prometheus.DB_POOL_TIMEOUTS.labels(self.name).inc()
+        with self._lock:
+            self._waits.append(seconds)
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, engine) -> None:
+        self.pool = engine.pool
+        target = engine.pool
+
+        @event.listens_for(target, "connect")
+        def _connect(dbapi_connection, connection_record):
+            prometheus.DB_POOL_CONNECTS.labels(self.name).inc()
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(target, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            prometheus.DB_POOL_IN_USE.labels(self.name).inc()
+            with self._lock:
+                self.checkouts += 1
+                self.in_use += 1
+                self.peak_in_use = max(self.peak_in_use, self.in_use)
+                overflow = self._overflow()
+                if overflow is not None:
+                    self.peak_overflow = max(self.peak_overflow, overflow)
+
+        @event.listens_for(target, "checkin")
+        def _checkin(dbapi_connection, connection_record):
+            prometheus.DB_POOL_IN_USE.labels(self.name).dec()
+            with self._lock:
+                self.checkins += 1
+                self.in_use = max(self.in_use - 1, 0)
+
+        @event.listens_for(target, "invalidate")
+        def _invalidate(dbapi_connection, connection_record, exception):
+            prometheus.DB_POOL_INVALIDATIONS.labels(self.name).inc()
+            with self._lock:
+                self.invalidations += 1
+
+    def _overflow(self):
+        overflow = getattr(self.pool, "overflow", None)
+        return max(overflow(), 0) if callable(overflow) else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            pick = lambda q: round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 3) if waits else None
+            size = getattr(self.pool, "size", None)
+            return {
+                "engine": self.name,
+                "pool_class": type(self.pool).__name__ if self.pool is not None else None,
+                "size": size() if callable(size) else None,
+                "max_overflow": getattr(self.pool, "_max_overflow", None),
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "overflow_in_use": self._overflow(),
+                "peak_overflow": self.peak_overflow,
+                "idle": self.pool.checkedin() if hasattr(self.pool, "checkedin") else None,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "mean": round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else None,
+                    "p50": pick(0.50),
+                    "p95": pick(0.95),
+                    "p99": pick(0.99),
+                    "max": round(self.wait_max * 1000, 3),
+                },
+            }
+
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+
+def _timed_do_get(pool_cls, metrics: PoolMetrics):
+    # QueuePool has no "before checkout" event, so the wait is measured around _do_get
+    class TimedPool(pool_cls):
+        def _do_get(self):
+            started = perf_counter()
+            try:
+                conn = super()._do_get()
+            except PoolTimeout:
+                metrics.record_wait(perf_counter() - started, timed_out=True)
+                raise
+            metrics.record_wait(perf_counter() - started)
+            return conn
+
+    TimedPool.__name__ = f"Timed{pool_cls.__name__}"
+    return TimedPool
+
+
+TimedQueuePool = _timed_do_get(QueuePool, sync_pool_metrics)
+TimedAsyncAdaptedQueuePool = _timed_do_get(AsyncAdaptedQueuePool, async_pool_metrics)
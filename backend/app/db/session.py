@@ -1,12 +1,51 @@
 # backend/app/db/session.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Callable, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.pool_stats import TimedAsyncAdaptedQueuePool, TimedQueuePool, async_pool_metrics, sync_pool_metrics
+# imported for its engine listener: any process writing users through these engines bumps
+# the version behind cached principals
+from app.core import principal_cache  # noqa: F401
+
+def engine_options(url: str, poolclass) -> dict:
+    """create_engine keyword arguments for the pool settings in Settings."""
+    if url.startswith("sqlite"):
+        # SQLite keeps SQLAlchemy's own pool choice; sessions are opened and used
+        # from different threadpool threads (local runs / benchmarks)
+        return {"connect_args": {"check_same_thread": False}} if "aiosqlite" not in url else {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
 
 # echo for dev
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, TimedQueuePool))
+sync_pool_metrics.attach(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ---------------- After-commit hooks ----------------
+# For side effects that must only happen once the rows are durable (Prometheus
+# counters), when the function doing the writes leaves the commit to its caller.
+def after_commit(db: Session, fn: Callable[[], None]) -> None:
+    """Run `fn` after `db`'s current transaction commits; dropped if it rolls back instead."""
+    db.info.setdefault("after_commit", []).append(fn)
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for fn in session.info.pop("after_commit", ()):
+        fn()
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session):
+    session.info.pop("after_commit", None)
+
 # dependency
 def get_db():
     db = SessionLocal()
@@ -14,3 +53,45 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# ---------------- Async stack ----------------
+# Used by the read-heavy async endpoints. Created lazily so the async driver
+# (asyncpg / aiosqlite) is only imported by workers that actually serve them.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for '{backend}'; set ASYNC_DATABASE_URL")
+    return str(url.set(drivername=ASYNC_DRIVERS[backend]))
+
+_async_engine = None
+_async_sessionmaker: Optional[sessionmaker] = None
+
+def get_async_engine():
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        url = async_database_url()
+        _async_engine = create_async_engine(url, **engine_options(url, TimedAsyncAdaptedQueuePool))
+        async_pool_metrics.attach(_async_engine.sync_engine)
+        # expire_on_commit=False: response serialization happens after the handler
+        # returns, where an expired attribute would need an (impossible) implicit await
+        _async_sessionmaker = sessionmaker(
+            bind=_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        yield db
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine, _async_sessionmaker = None, None
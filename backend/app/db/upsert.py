@@ -0,0 +1,46 @@
+# backend/app/db/upsert.py
+from typing import Iterable, List
+from sqlalchemy import and_, update
+from sqlalchemy.engine import Connection
+
+
+def _dialect_insert(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _dialect_name(db) -> str:
+    # a Session, or a Connection when called from an engine event
+    return (db.dialect if isinstance(db, Connection) else db.get_bind().dialect).name
+
+
+def upsert_increment(db, table, key_columns: Iterable[str], rows: List[dict],
+                     increment_columns: Iterable[str], replace_columns: Iterable[str] = ()) -> None:
+    """
+    Insert `rows`; where a row with the same key exists, add its increment_columns to
+    the stored values and overwrite replace_columns. Runs in the caller's transaction.
+    Uses INSERT .. ON CONFLICT on Postgres / SQLite, UPDATE-then-INSERT elsewhere.
+    """
+    if not rows:
+        return
+    key_columns, increment_columns, replace_columns = list(key_columns), list(increment_columns), list(replace_columns)
+    insert = _dialect_insert(_dialect_name(db))
+    if insert is not None:
+        stmt = insert(table)
+        set_ = {name: table.c[name] + stmt.excluded[name] for name in increment_columns}
+        set_.update({name: stmt.excluded[name] for name in replace_columns})
+        db.execute(stmt.on_conflict_do_update(index_elements=[table.c[k] for k in key_columns], set_=set_), rows)
+        return
+    for row in rows:
+        values = {name: table.c[name] + row[name] for name in increment_columns}
+        values.update({name: row[name] for name in replace_columns})
+        updated = db.execute(
+            update(table).where(and_(*(table.c[k] == row[k] for k in key_columns))).values(**values)
+        ).rowcount
+        if not updated:
+            db.execute(table.insert().values(**row))
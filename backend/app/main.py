@@ -2,13 +2,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.db.session import engine
-from app.db.base import Base
-from app.api import auth, users, wallets, investments, admin as admin_router
+from app.core.metrics import MetricsMiddleware, mark_worker_dead
+from app.core.profiling import ProfilingMiddleware
+from app.core.security import shutdown_hash_pool
+from app.db.session import engine, dispose_async_engine
+from app.db.startup import prepare_database
+from app.api import auth, users, wallets, investments, admin as admin_router, metrics as metrics_router
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Fund Manager API")
-    Base.metadata.create_all(bind=engine)
 
     allow_origins = ["*"] if settings.DEBUG else settings.cors_origins
     app.add_middleware(
@@ -18,6 +20,13 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router.router, tags=["metrics"])
+        app.add_event_handler("shutdown", mark_worker_dead)
+    # outermost, so its timings cover CORS and every route
+    if settings.PROFILE_SAMPLE_RATE > 0:
+        app.add_middleware(ProfilingMiddleware)
 
     app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
     app.include_router(users.router, prefix="/api/users", tags=["users"])
@@ -25,6 +34,11 @@ def create_app() -> FastAPI:
     app.include_router(investments.router, prefix="/api/investments", tags=["investments"])
     app.include_router(admin_router.router, prefix="/api/admin", tags=["admin"])
 
+    # schema check / create_all runs when the worker starts serving, not at import
+    app.add_event_handler("startup", lambda: prepare_database(engine))
+    app.add_event_handler("shutdown", shutdown_hash_pool)
+    app.add_event_handler("shutdown", dispose_async_engine)
+
     return app
 
 app = create_app()
@@ -1,3 +1,3 @@
 # backend/app/models/__init__.py
 # this file intentionally imports model modules so alembic discoverability works
-from . import user, wallet, investment, admin
+from . import user, wallet, investment, admin, idempotency
@@ -1,5 +1,5 @@
 # backend/app/models/admin.py
-from sqlalchemy import Column, Integer, Boolean, DateTime
+from sqlalchemy import Column, Integer, Boolean, DateTime, Numeric, String
 from app.db.base import Base
 from datetime import datetime
 
@@ -10,3 +10,22 @@ class AdminControl(Base):
     allow_withdrawals = Column(Boolean, default=True)
     allow_purchases = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+class AdminCounter(Base):
+    """
+    Running totals behind /api/admin/summary, updated in the same transaction as the change they track.
+    Each metric is spread over a few slots so concurrent writers rarely contend for one row;
+    its value is the sum over slots.
+    """
+    __tablename__ = "admin_counters"
+    name = Column(String(64), primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    amount = Column(Numeric(20, 6), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+class CacheVersion(Base):
+    """Version number per in-process cache; bumped in the transaction that changes the cached data."""
+    __tablename__ = "cache_versions"
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,21 @@
+# backend/app/models/idempotency.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.db.base import Base
+
+class IdempotencyKey(Base):
+    """Client-supplied Idempotency-Key of a money-moving request, with the response it produced."""
+    __tablename__ = "idempotency_keys"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    scope = Column(String(64), nullable=False)              # endpoint, e.g. "wallets.create_transaction"
+    request_hash = Column(String(64), nullable=False)       # sha256 of the request body
+    status = Column(String(16), nullable=False, default="in_progress")  # in_progress, completed
+    response_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
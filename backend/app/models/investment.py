@@ -1,5 +1,5 @@
 # backend/app/models/investment.py
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -31,3 +31,24 @@ class UserInvestment(Base):
 
     user = relationship("User", back_populates="investments")
     package = relationship("InvestmentPackage", back_populates="user_investments")
+
+    # keep in sync with migration 9c41d7a2b6e3_add_hot_query_indexes
+    __table_args__ = (
+        Index("ix_user_investments_user_id", "user_id"),
+        # maturity scan: status = 'active' AND end_date <= now
+        Index("ix_user_investments_status_end_date", "status", "end_date"),
+    )
+
+class InvestmentAccrual(Base):
+    """One row per (day, investment) credited by the accrual engine; the primary key makes reruns no-ops."""
+    __tablename__ = "investment_accruals"
+    accrual_date = Column(Date, primary_key=True)
+    investment_id = Column(Integer, ForeignKey("user_investments.id"), primary_key=True)
+    wallet_id = Column(Integer, ForeignKey("wallets.id"), nullable=False)
+    amount = Column(Numeric(18,6), nullable=False)
+    run_id = Column(String(32), nullable=False)  # chunk that created the row
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_investment_accruals_date_wallet", "accrual_date", "wallet_id"),
+    )
@@ -1,5 +1,5 @@
 # backend/app/models/user.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -17,3 +17,10 @@ class User(Base):
     profile = relationship("UserProfile", back_populates="user", uselist=False)
     wallet = relationship("Wallet", back_populates="user", uselist=False)
     investments = relationship("UserInvestment", back_populates="user")
+
+    # keep in sync with migration d41f6c8e2a17_add_user_listing_indexes
+    __table_args__ = (
+        # admin user listing: keyset pages on (created_at, id), optionally per role
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role_created_at", "role", "created_at", "id"),
+    )
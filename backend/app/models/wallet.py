@@ -1,5 +1,5 @@
 # backend/app/models/wallet.py
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Enum, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Enum, Text, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -52,3 +52,44 @@ class Transaction(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     wallet = relationship("Wallet", back_populates="transactions")
+
+    # keep in sync with migration 9c41d7a2b6e3_add_hot_query_indexes
+    __table_args__ = (
+        # per-wallet history, newest first
+        Index("ix_transactions_wallet_id_created_at", "wallet_id", "created_at", "id"),
+        # unfiltered admin feed (keyset on created_at, id)
+        Index("ix_transactions_created_at_id", "created_at", "id"),
+        # admin feed filtered by status
+        Index("ix_transactions_status_created_at", "status", "created_at", "id"),
+        # approval queue; only pending rows, so it stays small
+        Index(
+            "ix_transactions_pending_created_at",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+class TransactionArchive(Base):
+    """
+    Settled transactions moved out of `transactions` once they are older than the hot
+    window (app.services.archive_service). Same columns and ids as Transaction;
+    the history queries read it only when a request reaches that far back.
+    """
+    __tablename__ = "transactions_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    wallet_id = Column(Integer, ForeignKey("wallets.id"), nullable=False)
+    type = Column(String, nullable=False)
+    amount = Column(Numeric(18, 6), nullable=False)
+    status = Column(String, nullable=False)  # approved, rejected
+    reference = Column(String, nullable=True)
+    note = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+    # keep in sync with migration c6e1a8f3d925_add_transactions_archive
+    __table_args__ = (
+        Index("ix_transactions_archive_wallet_id_created_at", "wallet_id", "created_at", "id"),
+        Index("ix_transactions_archive_created_at_id", "created_at", "id"),
+        Index("ix_transactions_archive_status_created_at", "status", "created_at", "id"),
+    )
@@ -0,0 +1,54 @@
+from datetime import date, datetime
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import List, Optional
+
+class CountAndAmount(BaseModel):
+    count: int
+    amount: Decimal
+
+class AdminSummary(BaseModel):
+    as_of: datetime
+    total_wallet_balance: Decimal
+    active_investment_principal: Decimal
+    active_investments: int
+    # wallet balances plus principal held in active investments
+    assets_under_management: Decimal
+    pending_deposits: CountAndAmount
+    pending_withdrawals: CountAndAmount
+    # approved, counted by the transaction's creation date (UTC)
+    deposits_today: CountAndAmount
+    withdrawals_today: CountAndAmount
+    # every transaction, including archived ones
+    total_transactions: int
+    total_users: int
+
+class AdminControlsOut(BaseModel):
+    allow_deposits: bool
+    allow_withdrawals: bool
+    allow_purchases: bool
+
+    class Config:
+        orm_mode = True
+
+class AdminControlsUpdate(BaseModel):
+    allow_deposits: Optional[bool] = None
+    allow_withdrawals: Optional[bool] = None
+    allow_purchases: Optional[bool] = None
+
+class PayoutForecastDay(BaseModel):
+    date: date
+    earnings: float
+    principal: float
+    total: float
+
+class PayoutForecast(BaseModel):
+    as_of: datetime
+    start: date
+    days: int
+    active_investments: int
+    # changes whenever an investment or package does
+    book_version: int
+    total_earnings: float
+    total_principal: float
+    schedule: List[PayoutForecastDay]
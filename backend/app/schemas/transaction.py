@@ -1,7 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 from pydantic import BaseModel
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 class TransactionBase(BaseModel):
     type: Literal["deposit", "withdrawal", "purchase", "earning"]
@@ -20,3 +20,23 @@ class Transaction(TransactionBase):
 
     class Config:
         orm_mode = True
+
+class TransactionPage(BaseModel):
+    items: List[Transaction]
+    # opaque keyset token; pass back as ?cursor= to fetch the next page, None on the last page
+    next_cursor: Optional[str] = None
+
+class BulkTransactionAction(BaseModel):
+    action: Literal["approve", "reject"]
+    ids: List[int]
+
+class BulkTransactionResult(BaseModel):
+    id: int
+    # approved | rejected | not_found | already_approved | already_rejected | archived
+    result: str
+
+class BulkTransactionResponse(BaseModel):
+    action: str
+    applied: int
+    wallets_updated: int
+    results: List[BulkTransactionResult]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # NEW: Schema for the profile data sent during registration
@@ -47,10 +47,15 @@ class UserOut(UserBase):
     wallet_status: Optional[str] = None
     allow_deposits: Optional[bool] = None
     allow_withdrawals: Optional[bool] = None
+    allow_purchases: Optional[bool] = None
 
     class Config:
         orm_mode = True # This tells Pydantic to read the `profile` relationship
 
+class UserPage(BaseModel):
+    items: List[UserOut]
+    next_cursor: Optional[str] = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -18,6 +18,10 @@ class WalletOut(BaseModel):
     class Config:
         orm_mode = True
 
+class WalletEarnings(BaseModel):
+    # approved earning transactions over the wallet's whole history, archived ones included
+    total_earnings: Decimal
+
 class TransactionCreate(BaseModel):
     type: str
     amount: Decimal
@@ -1,2 +1,2 @@
 # backend/app/services/__init__.py
-from . import user_service, wallet_service, investment_service, admin_service
+from . import user_service, wallet_service, investment_service, admin_service, accrual_service, export_service, summary_service, idempotency_service, archive_service, forecast_service
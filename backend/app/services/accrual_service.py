@@ -0,0 +1,173 @@
+# backend/app/services/accrual_service.py
+import uuid
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from sqlalchemy import String, and_, cast, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from app import models
+from app.services import summary_service
+
+DEFAULT_CHUNK_SIZE = 5000
+
+investments = models.investment.UserInvestment.__table__
+packages = models.investment.InvestmentPackage.__table__
+accruals = models.investment.InvestmentAccrual.__table__
+wallets = models.wallet.Wallet.__table__
+transactions = models.wallet.Transaction.__table__
+
+
+def _eligible(day_start: datetime):
+    """
+    Investments that earn for the day starting at day_start: started on or before it
+    and ending after it. Matured rows are included so that a catch-up run over missed
+    days still credits investments the maturity sweep has already closed.
+    """
+    return and_(
+        investments.c.status.in_(["active", "matured"]),
+        investments.c.end_date > day_start,
+        investments.c.start_date <= day_start,
+    )
+
+
+def accrue_earnings(db: Session, day: date, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Credit one day of earnings (amount_invested * daily_return) to every eligible investment.
+
+    Works in windows of `chunk_size` investment ids, each in its own transaction and each
+    done with four set-based statements: record the accruals, bulk-insert approved
+    `earning` transactions, bump total_earnings, and bump wallet balances (summed, so
+    one row update per wallet). Investments already accrued for `day` are skipped,
+    so reruns and overlapping catch-ups are safe.
+    """
+    day_start = datetime.combine(day, time.min)
+    eligible = _eligible(day_start)
+    started = perf_counter()
+    credited, total, chunks = 0, 0, 0
+
+    # walk fixed primary-key windows rather than re-scanning the eligible set for every chunk,
+    # so the whole pass stays linear in the number of investments
+    bounds = db.execute(select(func.min(investments.c.id), func.max(investments.c.id)).where(eligible)).first()
+    if bounds[0] is None:
+        return _report(day, credited, total, chunks, started)
+    last_id, max_id = bounds[0] - 1, bounds[1]
+
+    while last_id < max_id:
+        upper_id = min(last_id + chunk_size, max_id)
+        run_id = uuid.uuid4().hex
+        in_chunk = and_(investments.c.id > last_id, investments.c.id <= upper_id, eligible)
+        already_accrued = exists().where(
+            accruals.c.accrual_date == day,
+            accruals.c.investment_id == investments.c.id,
+        )
+
+        # 1. accrual ledger rows; the (accrual_date, investment_id) primary key is the idempotency guard
+        inserted = db.execute(
+            insert(accruals).from_select(
+                ["accrual_date", "investment_id", "wallet_id", "amount", "run_id", "created_at"],
+                select(
+                    literal(day),
+                    investments.c.id,
+                    wallets.c.id,
+                    investments.c.amount_invested * packages.c.daily_return,
+                    literal(run_id),
+                    literal(datetime.utcnow()),
+                )
+                .select_from(
+                    investments
+                    .join(packages, packages.c.id == investments.c.package_id)
+                    .join(wallets, wallets.c.user_id == investments.c.user_id)
+                )
+                .where(in_chunk, ~already_accrued),
+            )
+        ).rowcount
+
+        if inserted:
+            this_run = and_(
+                accruals.c.accrual_date == day,
+                accruals.c.investment_id > last_id,
+                accruals.c.investment_id <= upper_id,
+                accruals.c.run_id == run_id,
+            )
+
+            # 2. one approved earning transaction per accrual
+            db.execute(
+                insert(transactions).from_select(
+                    ["wallet_id", "type", "amount", "status", "reference", "note", "created_at"],
+                    select(
+                        accruals.c.wallet_id,
+                        literal("earning"),
+                        accruals.c.amount,
+                        literal("approved"),
+                        literal(f"accrual:{day.isoformat()}:").concat(cast(accruals.c.investment_id, String)),
+                        literal(f"Daily earnings for {day.isoformat()}"),
+                        literal(datetime.utcnow()),
+                    ).where(this_run),
+                )
+            )
+
+            # 3. running total on each investment (correlated lookup hits the primary key)
+            earned = (
+                select(accruals.c.amount)
+                .where(this_run, accruals.c.investment_id == investments.c.id)
+                .scalar_subquery()
+            )
+            db.execute(
+                update(investments)
+                .where(investments.c.id.in_(select(accruals.c.investment_id).where(this_run)))
+                .values(total_earnings=func.coalesce(investments.c.total_earnings, 0) + earned)
+            )
+
+            # 4. wallet balances, summed per wallet so each wallet row is updated once
+            # however many investments it holds (lookup hits ix_investment_accruals_date_wallet)
+            wallet_total = (
+                select(func.sum(accruals.c.amount))
+                .where(
+                    accruals.c.accrual_date == day,
+                    accruals.c.wallet_id == wallets.c.id,
+                    accruals.c.run_id == run_id,
+                )
+                .scalar_subquery()
+            )
+            db.execute(
+                update(wallets)
+                .where(wallets.c.id.in_(select(accruals.c.wallet_id).where(this_run)))
+                .values(balance=func.coalesce(wallets.c.balance, 0) + wallet_total)
+            )
+
+            run_total = db.execute(select(func.coalesce(func.sum(accruals.c.amount), 0)).where(this_run)).scalar()
+            summary_service.record(
+                db,
+                summary_service.Deltas()
+                .add(summary_service.WALLET_BALANCE, run_total)
+                .add(summary_service.TRANSACTIONS, count=inserted),
+            )
+            total += run_total
+
+        db.commit()
+        credited += inserted
+        chunks += 1
+        last_id = upper_id
+
+    return _report(day, credited, total, chunks, started)
+
+
+def _report(day: date, credited: int, total, chunks: int, started: float) -> dict:
+    elapsed = perf_counter() - started
+    return {
+        "date": day.isoformat(),
+        "investments_credited": credited,
+        "amount_credited": total,
+        "chunks": chunks,
+        "seconds": round(elapsed, 3),
+        "per_second": round(credited / elapsed, 1) if elapsed else None,
+    }
+
+
+def accrue_earnings_range(db: Session, start: date, end: date, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    """Catch up every day from start to end inclusive; days already accrued cost one cheap pass."""
+    results = []
+    day = start
+    while day <= end:
+        results.append(accrue_earnings(db, day, chunk_size=chunk_size))
+        day += timedelta(days=1)
+    return results
@@ -1,6 +1,10 @@
 # backend/app/services/admin_service.py
+import threading
+import time
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from app import models
+from app.core.config import settings
 
 def get_admin_controls(db: Session):
     ctrl = db.query(models.admin.AdminControl).first()
@@ -19,8 +23,95 @@ def update_admin_controls(db: Session, **kwargs):
     db.add(ctrl)
     db.commit()
     db.refresh(ctrl)
+    # this worker sees the change at once; other workers when their snapshot expires
+    admin_controls_cache.put(ControlsSnapshot.from_row(ctrl))
     return ctrl
 
+# ---------------- Cached global controls ----------------
+@dataclass(frozen=True)
+class ControlsSnapshot:
+    """Read-only copy of the platform-wide switches checked on every money movement."""
+    allow_deposits: bool = True
+    allow_withdrawals: bool = True
+    allow_purchases: bool = True
+
+    @classmethod
+    def from_row(cls, ctrl) -> "ControlsSnapshot":
+        if ctrl is None:
+            return cls()
+        # NULL columns count as enabled, like the model defaults
+        return cls(
+            allow_deposits=ctrl.allow_deposits is not False,
+            allow_withdrawals=ctrl.allow_withdrawals is not False,
+            allow_purchases=ctrl.allow_purchases is not False,
+        )
+
+    def allows(self, type: str) -> bool:
+        """Whether a transaction / action of `type` (deposit, withdrawal, purchase) is enabled."""
+        flag = {"deposit": "allow_deposits", "withdrawal": "allow_withdrawals", "purchase": "allow_purchases"}.get(type)
+        return getattr(self, flag) if flag else True
+
+class ControlsCache:
+    """One ControlsSnapshot per worker, re-read from admin_controls when its TTL runs out."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> ControlsSnapshot:
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() < self._expires_at:
+                return self._snapshot
+        # plain read: unlike get_admin_controls this never inserts or commits
+        snapshot = ControlsSnapshot.from_row(db.query(models.admin.AdminControl).first())
+        self.put(snapshot)
+        return snapshot
+
+    def put(self, snapshot: ControlsSnapshot) -> None:
+        with self._lock:
+            self._snapshot = snapshot
+            self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+admin_controls_cache = ControlsCache(settings.ADMIN_CONTROLS_TTL_SECONDS)
+
+def get_controls_snapshot(db: Session) -> ControlsSnapshot:
+    return admin_controls_cache.get(db)
+
+# ---------------- Wallet listing (fast response path) ----------------
+_WALLET_FIELDS = (
+    "id", "user_id", "balance", "currency", "status",
+    "allow_deposits", "allow_withdrawals", "allow_purchases", "created_at",
+)
+
+def list_wallet_rows(db: Session):
+    """WalletAdminOut-shaped dicts from one column-projected query (username falls back to the email)."""
+    Wallet = models.wallet.Wallet
+    rows = (
+        db.query(
+            *(getattr(Wallet, name) for name in _WALLET_FIELDS),
+            models.user.User.email,
+            models.wallet.UserProfile.full_name,
+        )
+        .outerjoin(models.user.User, models.user.User.id == Wallet.user_id)
+        .outerjoin(models.wallet.UserProfile, models.wallet.UserProfile.user_id == Wallet.user_id)
+        .order_by(Wallet.id)
+        .all()
+    )
+    return [
+        {
+            **{name: row[i] for i, name in enumerate(_WALLET_FIELDS)},
+            "username": row.email,
+            "full_name": row.full_name,
+        }
+        for row in rows
+    ]
+
 # Function to update wallet status (active, frozen, disabled, etc.)
 def update_user_wallet_status(db: Session, user_id: int, new_status: str):
     """Updates the status of a user's wallet."""
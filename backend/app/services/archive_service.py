@@ -0,0 +1,79 @@
+# backend/app/services/archive_service.py
+"""
+Hot/cold split of the transactions table.
+
+Settled (approved or rejected) transactions older than TRANSACTION_HOT_DAYS are
+moved to transactions_archive in batches, each batch one database transaction
+(copy, then delete). Pending transactions stay hot whatever their age, so
+approvals never look at the archive. History reads in wallet_service union
+the archive back in when a request reaches past the hot rows.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app import models
+from app.core.config import settings
+
+transactions = models.wallet.Transaction.__table__
+archive = models.wallet.TransactionArchive.__table__
+
+SETTLED_STATUSES = ("approved", "rejected")
+COLUMNS = [c.name for c in archive.columns]
+
+
+def archive_cutoff(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.utcnow()) - timedelta(days=settings.TRANSACTION_HOT_DAYS)
+
+
+def archive_transactions(
+    db: Session,
+    cutoff: Optional[datetime] = None,
+    batch_size: int = 5000,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Move settled transactions created before `cutoff` (default: the hot window) to the
+    archive, oldest first. Returns the number moved. Safe to run while the API serves:
+    rows are locked per batch (SKIP LOCKED on Postgres) so a concurrent status change
+    either finishes first or waits for the batch to commit.
+    """
+    cutoff = cutoff or archive_cutoff()
+    # SQLite hands the highest rowid out again once it is deleted; leave the newest row hot
+    newest_id = db.execute(select(func.max(transactions.c.id))).scalar()
+    if newest_id is None:
+        return 0
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = [
+            row.id for row in db.execute(
+                select(transactions.c.id)
+                .where(
+                    transactions.c.status.in_(SETTLED_STATUSES),
+                    transactions.c.created_at < cutoff,
+                    transactions.c.id < newest_id,
+                )
+                .order_by(transactions.c.created_at, transactions.c.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        ]
+        if not ids:
+            db.rollback()
+            break
+        db.execute(
+            insert(archive).from_select(
+                COLUMNS, select(*[transactions.c[name] for name in COLUMNS]).where(transactions.c.id.in_(ids))
+            )
+        )
+        db.execute(delete(transactions).where(transactions.c.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+        batches += 1
+    return moved
+
+
+def archive_stats(db: Session) -> dict:
+    hot, hot_oldest = db.execute(select(func.count(), func.min(transactions.c.created_at))).one()
+    cold, cold_newest = db.execute(select(func.count(), func.max(archive.c.created_at))).one()
+    return {"hot_rows": hot, "hot_oldest": hot_oldest, "archived_rows": cold, "archive_horizon": cold_newest}
@@ -0,0 +1,123 @@
+# backend/app/services/export_service.py
+"""
+Streaming CSV / NDJSON exports for the admin dashboard.
+
+Rows are read with a server-side cursor (stream_results) and encoded one
+partition at a time, so memory stays flat no matter how many rows match.
+Each generator opens its own session: the request-scoped one from get_db is
+closed before a StreamingResponse body starts iterating.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator
+from sqlalchemy import select, union_all
+from app import models
+from app.db.session import SessionLocal
+from app.services.investment_service import investment_filters
+from app.services.wallet_service import transaction_filters
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+# rows fetched from the cursor per round trip / encoded per chunk
+EXPORT_BATCH_SIZE = 2000
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode(columns, partition, fmt: str) -> str:
+    buf = io.StringIO()
+    if fmt == "csv":
+        csv.writer(buf).writerows([_csv_value(v) for v in row] for row in partition)
+    else:
+        for row in partition:
+            buf.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+            buf.write("\n")
+    return buf.getvalue()
+
+
+def _stream(stmt, fmt: str, batch_size: int) -> Iterator[str]:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    columns = [c.name for c in stmt.selected_columns]
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, max_row_buffer=batch_size))
+        if fmt == "csv":
+            yield _encode(columns, [columns], fmt)
+        for partition in result.partitions(batch_size):
+            yield _encode(columns, partition, fmt)
+    finally:
+        db.close()
+
+
+def transactions_export_stmt(**filters):
+    Wallet = models.wallet.Wallet
+    parts = [
+        select(
+            model.id,
+            model.wallet_id,
+            Wallet.user_id,
+            model.type,
+            model.amount,
+            model.status,
+            model.reference,
+            model.note,
+            model.created_at,
+        )
+        .join(Wallet, Wallet.id == model.wallet_id)
+        .where(*transaction_filters(model=model, **filters))
+        for model in (models.wallet.Transaction, models.wallet.TransactionArchive)
+    ]
+    # hot and archived rows together
+    feed = union_all(*parts).subquery()
+    return select(feed).order_by(feed.c.created_at.desc(), feed.c.id.desc())
+
+
+def investments_export_stmt(**filters):
+    UserInvestment = models.investment.UserInvestment
+    InvestmentPackage = models.investment.InvestmentPackage
+    return (
+        select(
+            UserInvestment.id,
+            UserInvestment.user_id,
+            UserInvestment.package_id,
+            InvestmentPackage.name.label("package_name"),
+            UserInvestment.amount_invested,
+            UserInvestment.start_date,
+            UserInvestment.end_date,
+            UserInvestment.status,
+            UserInvestment.total_earnings,
+        )
+        .join(InvestmentPackage, InvestmentPackage.id == UserInvestment.package_id)
+        .where(*investment_filters(**filters))
+        .order_by(UserInvestment.id)
+    )
+
+
+def stream_transactions(fmt: str = "csv", batch_size: int = EXPORT_BATCH_SIZE, **filters) -> Iterator[str]:
+    """Every transaction, hot or archived, matching the admin feed filters, newest first."""
+    return _stream(transactions_export_stmt(**filters), fmt, batch_size)
+
+
+def stream_investments(fmt: str = "csv", batch_size: int = EXPORT_BATCH_SIZE, **filters) -> Iterator[str]:
+    """Every user investment matching the admin listing filters, by id."""
+    return _stream(investments_export_stmt(**filters), fmt, batch_size)
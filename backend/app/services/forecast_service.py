@@ -0,0 +1,148 @@
+# backend/app/services/forecast_service.py
+"""
+Payout forecast: the cash the fund owes on each of the next N days.
+
+  * earnings  - amount_invested * daily_return for every day an active investment
+                accrues, with the same eligibility as accrual_service (the day's 00:00
+                UTC falls on or after start_date and before end_date);
+  * principal - amount_invested on the day end_date falls (the maturity sweep pays it
+                out); investments already past end_date count on day 0.
+
+The active book is read with one columnar query into NumPy arrays and kept per worker
+until an investment or package write bumps the "investment_book" version. A forecast is
+then a few array operations over the book, O(investments + days), with no per-row Python.
+NumPy is imported on first use, so workers that never forecast don't load it.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session
+from app import models
+from app.core.config import settings
+from app.core.versioned_cache import VersionedCache, version_query
+from app.services.investment_service import INVESTMENT_BOOK, INVESTMENT_BOOK_SLOTS
+
+DAY = 86400.0
+EPOCH = datetime(1970, 1, 1)
+FETCH_BATCH = 100_000
+
+investment_book = VersionedCache(INVESTMENT_BOOK, settings.CACHE_VERSION_CHECK_SECONDS)
+
+
+@dataclass(frozen=True)
+class Book:
+    """Active investments as parallel float64 arrays; times are UTC epoch seconds."""
+    principal: Any
+    daily: Any      # principal * daily_return
+    start: Any
+    end: Any
+
+    def __len__(self):
+        return len(self.principal)
+
+
+def _epoch_seconds(column, dialect: str):
+    if dialect == "sqlite":
+        return (func.julianday(column) - 2440587.5) * DAY
+    # Postgres returns numeric here; float8 keeps Decimals out of the fetch
+    return cast(func.extract("epoch", column), Float)
+
+
+def load_book(db: Session) -> Book:
+    """One query over active investments joined to their package; rows go straight into arrays."""
+    import numpy as np
+
+    UserInvestment = models.investment.UserInvestment
+    InvestmentPackage = models.investment.InvestmentPackage
+    dialect = db.get_bind().dialect.name
+    start = _epoch_seconds(UserInvestment.start_date, dialect)
+    # end_date is set on purchase; rows written without one end after the package duration
+    end = func.coalesce(_epoch_seconds(UserInvestment.end_date, dialect), start + InvestmentPackage.duration_days * DAY)
+    stmt = (
+        select(
+            cast(UserInvestment.amount_invested, Float),
+            cast(UserInvestment.amount_invested * InvestmentPackage.daily_return, Float),
+            start,
+            end,
+        )
+        .join(InvestmentPackage, InvestmentPackage.id == UserInvestment.package_id)
+        .where(UserInvestment.status == "active")
+    )
+    result = db.connection().execution_options(stream_results=True).execute(stmt)
+    # every column is a float, so read the DBAPI cursor directly: plain tuples into arrays,
+    # without building a Row per investment
+    parts = []
+    try:
+        while True:
+            rows = result.cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            parts.append(np.array(rows, dtype=np.float64))
+    finally:
+        result.close()
+    columns = np.concatenate(parts) if parts else np.empty((0, 4))
+    # julianday is only good to ~50us; round so midnight timestamps stay on their day
+    times = np.round(columns[:, 2:4], 3)
+    return Book(
+        principal=np.ascontiguousarray(columns[:, 0]),
+        daily=np.ascontiguousarray(columns[:, 1]),
+        start=np.ascontiguousarray(times[:, 0]),
+        end=np.ascontiguousarray(times[:, 1]),
+    )
+
+
+def get_book(db: Session):
+    """CacheEntry holding the current Book; reloaded only after an investment or package change."""
+    entry = investment_book.fresh_entry()
+    if entry is not None:
+        return entry
+    version = db.execute(version_query(INVESTMENT_BOOK, INVESTMENT_BOOK_SLOTS)).scalar() or 0
+    entry = investment_book.validate(version)
+    if entry is not None:
+        return entry
+    return investment_book.store(version, load_book(db))
+
+
+def schedule(book: Book, start: date, days: int):
+    """(earnings, principal) owed on each of `days` days from `start`, as float64 arrays."""
+    import numpy as np
+
+    origin = (datetime.combine(start, time.min) - EPOCH).total_seconds()
+    # first day whose 00:00 is on or after start_date, and the first whose 00:00 is not before end_date
+    first = np.clip(np.ceil((book.start - origin) / DAY), 0, days)
+    stop = np.clip(np.ceil((book.end - origin) / DAY), 0, days).astype(np.int64)
+    first = np.minimum(first, stop).astype(np.int64)
+    # each investment adds its daily amount from `first` and takes it away at `stop`;
+    # the running sum of those steps is every day's total
+    steps = (
+        np.bincount(first, weights=book.daily, minlength=days + 1)
+        - np.bincount(stop, weights=book.daily, minlength=days + 1)
+    )
+    earnings = np.cumsum(steps)[:days]
+
+    due = np.maximum(np.floor((book.end - origin) / DAY), 0)
+    in_horizon = due < days
+    principal = np.bincount(due[in_horizon].astype(np.int64), weights=book.principal[in_horizon], minlength=days)
+    return earnings, principal
+
+
+def payout_forecast(db: Session, days: int, start: Optional[date] = None) -> dict:
+    """Day-by-day earnings and principal owed, starting today (UTC) unless `start` is given."""
+    start = start or datetime.utcnow().date()
+    entry = get_book(db)
+    earnings, principal = schedule(entry.value, start, days)
+    earnings, principal = earnings.round(6).tolist(), principal.round(6).tolist()
+    return {
+        "as_of": datetime.utcnow(),
+        "start": start,
+        "days": days,
+        "active_investments": len(entry.value),
+        "book_version": entry.version,
+        "total_earnings": round(sum(earnings), 6),
+        "total_principal": round(sum(principal), 6),
+        "schedule": [
+            {"date": start + timedelta(days=i), "earnings": e, "principal": p, "total": round(e + p, 6)}
+            for i, (e, p) in enumerate(zip(earnings, principal))
+        ],
+    }
@@ -0,0 +1,166 @@
+# backend/app/services/idempotency_service.py
+"""
+Idempotency-Key bookkeeping for money-moving POSTs.
+
+The first request with a key inserts an in_progress row and commits it before
+doing any work; the primary key (user_id, key) guarantees only one request
+wins that insert. It then runs, and stores its response on the row in the same
+database transaction as the request's own writes, so a worker dying in between
+leaves neither behind and a retry that takes the key over runs the request once.
+Requests that lose the insert either replay the stored response or, while the
+first is still running, poll for it.
+
+A claim is identified by the created_at its owner wrote (the claim token). A
+takeover rewrites it, so a request that was only slow, not dead, finds its token
+gone when it tries to complete: it rolls its writes back and replays the winner.
+"""
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app import models
+from app.core.config import settings
+
+IdempotencyKey = models.idempotency.IdempotencyKey
+POLL_INTERVAL = 0.05
+
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used for a different request body or endpoint."""
+
+
+class IdempotencyInProgress(ValueError):
+    """Another request with this key is still running."""
+
+
+def request_hash(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _load(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    db.expire_all()
+    return db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key).first()
+
+
+def _claim(db: Session, user_id: int, key: str, scope: str, digest: str) -> Tuple[Optional[IdempotencyKey], Optional[datetime]]:
+    """
+    Insert the in_progress row. Returns (None, token) when this request owns the key,
+    otherwise (existing row, None).
+    """
+    for _ in range(3):
+        now = datetime.utcnow()
+        db.add(IdempotencyKey(
+            user_id=user_id, key=key, scope=scope, request_hash=digest, status="in_progress",
+            created_at=now, expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+        ))
+        try:
+            db.commit()
+            return None, now
+        except IntegrityError:
+            db.rollback()
+
+        existing = _load(db, user_id, key)
+        if existing is None:
+            continue  # expired row purged in between; try again
+        if existing.expires_at <= now:
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.expires_at <= now
+            ).delete(synchronize_session=False)
+            db.commit()
+            continue
+        if existing.scope != scope or existing.request_hash != digest:
+            raise IdempotencyKeyReused("Idempotency-Key was already used for a different request")
+        if existing.status == "in_progress" and existing.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS):
+            # the owner died without completing or releasing the key, or is still running and will
+            # find its token replaced when it tries to complete: take it over
+            taken = db.query(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+                IdempotencyKey.status == "in_progress", IdempotencyKey.created_at == existing.created_at,
+            ).update({IdempotencyKey.created_at: now}, synchronize_session=False)
+            db.commit()
+            if taken:
+                return None, now
+            continue
+        return existing, None
+    raise IdempotencyInProgress("Could not claim Idempotency-Key; retry the request")
+
+
+def acquire(db: Session, user_id: int, key: str, scope: str, payload: dict) -> Tuple[Optional[IdempotencyKey], Optional[datetime]]:
+    """
+    Claim `key` for this request. Returns (None, token) when the caller must execute the
+    request and later pass `token` to complete() or release(), or (completed row, None)
+    whose stored response should be replayed. Waits up to IDEMPOTENCY_WAIT_SECONDS for a
+    concurrent request with the same key to finish.
+    """
+    digest = request_hash(payload)
+    existing, token = _claim(db, user_id, key, scope, digest)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while existing is not None and existing.status != "completed":
+        if time.monotonic() >= deadline:
+            raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+        time.sleep(POLL_INTERVAL)
+        db.rollback()  # end the read transaction so the next poll sees new commits
+        existing = _load(db, user_id, key)
+        if existing is None:
+            # the first request failed and released the key; this one runs instead
+            existing, token = _claim(db, user_id, key, scope, digest)
+    return existing, token
+
+
+def _owned(user_id: int, key: str, token: datetime):
+    return (
+        IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+        IdempotencyKey.status == "in_progress", IdempotencyKey.created_at == token,
+    )
+
+
+def complete(db: Session, user_id: int, key: str, token: datetime, status_code: int, body: bytes, commit: bool = True) -> bool:
+    """
+    Store the response on the key if this request still holds the claim `token`. Returns False,
+    having written nothing, when the claim was taken over; the caller must roll back its writes.
+    Pass commit=False to commit the response together with the request's writes.
+    """
+    stored = db.query(IdempotencyKey).filter(*_owned(user_id, key, token)).update(
+        {
+            IdempotencyKey.status: "completed",
+            IdempotencyKey.response_code: status_code,
+            IdempotencyKey.response_body: body.decode(),
+        },
+        synchronize_session=False,
+    )
+    if stored and commit:
+        db.commit()
+    return bool(stored)
+
+
+def release(db: Session, user_id: int, key: str, token: datetime) -> None:
+    """Forget a claim whose request failed, so the client can retry with the same key."""
+    db.rollback()
+    # a claim taken over in the meantime belongs to the retry and is left alone
+    db.query(IdempotencyKey).filter(*_owned(user_id, key, token)).delete(synchronize_session=False)
+    db.commit()
+
+
+def purge_expired(db: Session, batch_size: int = 5000) -> int:
+    """Delete expired keys in batches (ix_idempotency_keys_expires_at). Returns the number removed."""
+    removed = 0
+    while True:
+        now = datetime.utcnow()
+        expired = [
+            (user_id, key) for user_id, key in
+            db.query(IdempotencyKey.user_id, IdempotencyKey.key)
+            .filter(IdempotencyKey.expires_at <= now)
+            .limit(batch_size)
+            .all()
+        ]
+        if not expired:
+            return removed
+        db.query(IdempotencyKey).filter(
+            tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired), IdempotencyKey.expires_at <= now
+        ).delete(synchronize_session=False)
+        db.commit()
+        removed += len(expired)
@@ -1,12 +1,55 @@
 # backend/app/services/investment_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+import json
+from fastapi.encoders import jsonable_encoder
 from app import models
+from app.core import metrics
+from app.core.config import settings
+from app.core.versioned_cache import CacheEntry, VersionedCache, bump_version, version_query
+from app.db.session import after_commit
+from app.schemas.investment import InvestmentPackageOut
+from app.services import summary_service
 from datetime import datetime, timedelta
 from decimal import Decimal
+from time import perf_counter
+from typing import List, Optional
+
+# ---- Package catalog cache ----
+# Public package list, cached per worker as ready-to-send JSON. Every package write bumps
+# the "package_catalog" version in the same transaction; workers re-check it periodically.
+PACKAGE_CATALOG = "package_catalog"
+package_catalog = VersionedCache(PACKAGE_CATALOG, settings.CACHE_VERSION_CHECK_SECONDS)
+
+# Version of the active investment book (investments + their packages) behind the payout
+# forecast (forecast_service). Bumped by every purchase, so it is striped over several rows.
+INVESTMENT_BOOK = "investment_book"
+INVESTMENT_BOOK_SLOTS = 8
+
+def _book_changed(db: Session) -> None:
+    bump_version(db, INVESTMENT_BOOK, INVESTMENT_BOOK_SLOTS)
 
 def create_package(db: Session, **kwargs):
     pkg = models.investment.InvestmentPackage(**kwargs)
     db.add(pkg)
+    bump_version(db, PACKAGE_CATALOG)
+    _book_changed(db)
+    db.commit()
+    db.refresh(pkg)
+    return pkg
+
+def update_package(db: Session, package_id: int, **fields):
+    """Returns None if the package does not exist."""
+    pkg = db.query(models.investment.InvestmentPackage).filter(
+        models.investment.InvestmentPackage.id == package_id
+    ).first()
+    if not pkg:
+        return None
+    for field, value in fields.items():
+        setattr(pkg, field, value)
+    bump_version(db, PACKAGE_CATALOG)
+    _book_changed(db)
     db.commit()
     db.refresh(pkg)
     return pkg
@@ -14,7 +57,37 @@ def create_package(db: Session, **kwargs):
 def list_active_packages(db: Session):
     return db.query(models.investment.InvestmentPackage).filter(models.investment.InvestmentPackage.is_active == True).all()
 
-def create_user_investment(db: Session, user_id: int, package_id: int, amount: Decimal):
+async def list_active_packages_async(db: AsyncSession):
+    result = await db.execute(
+        select(models.investment.InvestmentPackage).where(models.investment.InvestmentPackage.is_active == True)
+    )
+    return result.scalars().all()
+
+async def get_package_catalog_async(db: AsyncSession) -> CacheEntry:
+    """
+    Active packages as JSON bytes plus the catalog version / ETag.
+    Costs nothing inside the check interval, one primary-key read after it,
+    and a reload only when some worker changed a package.
+    """
+    entry = package_catalog.fresh_entry()
+    if entry is not None:
+        return entry
+    # read the version before the rows: a concurrent bump then forces a reload next time
+    version = (await db.execute(version_query(PACKAGE_CATALOG))).scalar() or 0
+    entry = package_catalog.validate(version)
+    if entry is not None:
+        return entry
+    packages = await list_active_packages_async(db)
+    body = json.dumps(jsonable_encoder([InvestmentPackageOut.from_orm(p) for p in packages])).encode()
+    return package_catalog.store(version, body)
+
+def create_user_investment(db: Session, user_id: int, package_id: int, amount: Decimal, commit: bool = True):
+    """
+    Open an investment and debit its principal from the user's wallet in one transaction.
+    The debit is a guarded `balance = balance - amount WHERE balance >= amount`, so two
+    concurrent purchases cannot overdraw the wallet.
+    With commit=False the rows are flushed but the caller commits (see app.api.idempotency).
+    """
     pkg = db.query(models.investment.InvestmentPackage).filter(models.investment.InvestmentPackage.id == package_id, models.investment.InvestmentPackage.is_active == True).first()
     if not pkg:
         raise ValueError("Package not found or inactive")
@@ -24,6 +97,14 @@ def create_user_investment(db: Session, user_id: int, package_id: int, amount: D
     if pkg.max_amount and amount > pkg.max_amount:
         raise ValueError("Amount greater than package maximum")
 
+    Wallet = models.wallet.Wallet
+    debited = db.query(Wallet).filter(Wallet.user_id == user_id, Wallet.balance >= amount).update(
+        {Wallet.balance: Wallet.balance - amount}, synchronize_session=False
+    )
+    if not debited:
+        db.rollback()
+        raise ValueError("Insufficient balance to invest")
+
     start = datetime.utcnow()
     end = start + timedelta(days=pkg.duration_days)
     inv = models.investment.UserInvestment(
@@ -36,16 +117,227 @@ def create_user_investment(db: Session, user_id: int, package_id: int, amount: D
         total_earnings=Decimal(0)
     )
     db.add(inv)
+    summary_service.record(
+        db,
+        summary_service.Deltas()
+        .add(summary_service.WALLET_BALANCE, -amount)
+        .add(summary_service.ACTIVE_INVESTMENTS, amount, 1),
+    )
+    _book_changed(db)
+    after_commit(db, metrics.INVESTMENTS_CREATED.inc)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    db.refresh(inv)
+    return inv
+
+def update_user_investment(db: Session, investment_id: int, **fields):
+    """Admin edit of an investment; keeps the active-investment totals in step. Returns None if missing."""
+    inv = db.query(models.investment.UserInvestment).filter(
+        models.investment.UserInvestment.id == investment_id
+    ).with_for_update().first()
+    if not inv:
+        return None
+
+    was_active, old_amount = inv.status == "active", Decimal(inv.amount_invested or 0)
+    for field, value in fields.items():
+        setattr(inv, field, value)
+    is_active, new_amount = inv.status == "active", Decimal(inv.amount_invested or 0)
+
+    deltas = summary_service.Deltas()
+    if was_active:
+        deltas.add(summary_service.ACTIVE_INVESTMENTS, -old_amount, -1)
+    if is_active:
+        deltas.add(summary_service.ACTIVE_INVESTMENTS, new_amount, 1)
+    summary_service.record(db, deltas)
+    _book_changed(db)
     db.commit()
     db.refresh(inv)
     return inv
 
+def investment_filters(
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    package_id: Optional[int] = None,
+):
+    """WHERE conditions shared by the admin investment listing and the export."""
+    UserInvestment = models.investment.UserInvestment
+    conditions = []
+    if status:
+        conditions.append(UserInvestment.status == status)
+    if user_id is not None:
+        conditions.append(UserInvestment.user_id == user_id)
+    if package_id is not None:
+        conditions.append(UserInvestment.package_id == package_id)
+    return conditions
+
+def list_investments(db: Session, **filters):
+    return db.query(models.investment.UserInvestment).filter(*investment_filters(**filters)).all()
+
+def list_user_investments(db: Session, user_id: int):
+    # UserInvestmentOut nests the package; load it in the same query instead of once per row
+    return db.query(models.investment.UserInvestment).options(
+        joinedload(models.investment.UserInvestment.package)
+    ).filter(
+        models.investment.UserInvestment.user_id == user_id
+    ).all()
+
+# ---- Column-projected listings (fast response path) ----
+# fields of UserInvestmentOut / InvestmentPackageOut
+_INVESTMENT_FIELDS = ("id", "user_id", "package_id", "amount_invested", "start_date", "end_date", "status", "total_earnings")
+_PACKAGE_FIELDS = ("name", "description", "min_amount", "max_amount", "daily_return", "duration_days", "is_active", "id", "created_at")
+
+def list_investment_rows(db: Session, *conditions):
+    """UserInvestmentOut-shaped dicts (package nested) from one joined, column-projected query."""
+    UserInvestment = models.investment.UserInvestment
+    InvestmentPackage = models.investment.InvestmentPackage
+    columns = [getattr(UserInvestment, name) for name in _INVESTMENT_FIELDS]
+    columns += [getattr(InvestmentPackage, name).label(f"package_{name}") for name in _PACKAGE_FIELDS]
+    rows = (
+        db.query(*columns)
+        .join(InvestmentPackage, InvestmentPackage.id == UserInvestment.package_id)
+        .filter(*conditions)
+        .order_by(UserInvestment.id)
+        .all()
+    )
+    return [
+        {
+            **{name: row[i] for i, name in enumerate(_INVESTMENT_FIELDS)},
+            "package": {name: row[len(_INVESTMENT_FIELDS) + i] for i, name in enumerate(_PACKAGE_FIELDS)},
+        }
+        for row in rows
+    ]
+
+def select_due_investments(db: Session, as_of: datetime, limit: int):
+    """
+    Ids of active investments whose end_date has passed, oldest first (ix_user_investments_status_end_date).
+    Rows are locked with SKIP LOCKED on Postgres so concurrent sweeps split the work instead of blocking.
+    Investments whose owner has no wallet are left out: there is nowhere to return the principal.
+    """
+    UserInvestment = models.investment.UserInvestment
+    Wallet = models.wallet.Wallet
+    rows = (
+        db.query(UserInvestment.id)
+        .join(Wallet, Wallet.user_id == UserInvestment.user_id)
+        .filter(UserInvestment.status == "active", UserInvestment.end_date <= as_of)
+        .order_by(UserInvestment.end_date)
+        .limit(limit)
+        .with_for_update(of=UserInvestment, skip_locked=True)
+        .all()
+    )
+    return [r.id for r in rows]
+
+def count_unpayable_investments(db: Session, as_of: datetime) -> int:
+    """Active investments past end_date whose owner has no wallet; the sweep skips them."""
+    UserInvestment = models.investment.UserInvestment
+    Wallet = models.wallet.Wallet
+    return (
+        db.query(func.count(UserInvestment.id))
+        .outerjoin(Wallet, Wallet.user_id == UserInvestment.user_id)
+        .filter(UserInvestment.status == "active", UserInvestment.end_date <= as_of, Wallet.id.is_(None))
+        .scalar()
+    )
+
+class MaturityConflict(ValueError):
+    """Another writer matured some of a batch's investments between its locked read and its update."""
+
+def _mature_batch(db: Session, investment_ids: List[int]):
+    """
+    Flip a batch of investments to matured and return their principal, one balance update per wallet.
+    Only active investments whose owner has a wallet are matured; the rest stay untouched, so the
+    count, the principal and the ACTIVE_INVESTMENTS delta all come from the same rows.
+    Does not commit. Returns (matured_count, principal_returned, wallet_updates).
+    Rolls the transaction back and raises MaturityConflict if the rows changed underneath it.
+    """
+    UserInvestment = models.investment.UserInvestment
+    Wallet = models.wallet.Wallet
+    if not investment_ids:
+        return 0, Decimal(0), 0
+
+    # the status guard keeps an investment from being matured (and paid out) twice
+    payable = (
+        db.query(UserInvestment.id, UserInvestment.amount_invested, Wallet.id)
+        .join(Wallet, Wallet.user_id == UserInvestment.user_id)
+        .filter(UserInvestment.id.in_(investment_ids), UserInvestment.status == "active")
+        .with_for_update(of=UserInvestment)
+        .all()
+    )
+    if not payable:
+        return 0, Decimal(0), 0
+
+    matured = db.query(UserInvestment).filter(
+        UserInvestment.id.in_([investment_id for investment_id, _, _ in payable]),
+        UserInvestment.status == "active",
+    ).update({UserInvestment.status: "matured"}, synchronize_session=False)
+    if matured != len(payable):
+        # another writer matured some of these rows between the read and the update (only possible
+        # where FOR UPDATE is a no-op); nothing of this batch may be kept
+        db.rollback()
+        raise MaturityConflict("Investments were matured concurrently; retry the sweep")
+
+    per_wallet = {}
+    for _, amount, wallet_id in payable:
+        per_wallet[wallet_id] = per_wallet.get(wallet_id, Decimal(0)) + Decimal(amount)
+    db.execute(
+        update(Wallet.__table__)
+        .where(Wallet.__table__.c.id == bindparam("wallet_id"))
+        .values(balance=func.coalesce(Wallet.__table__.c.balance, 0) + bindparam("delta")),
+        [{"wallet_id": wallet_id, "delta": delta} for wallet_id, delta in per_wallet.items()],
+    )
+    principal = sum(per_wallet.values(), Decimal(0))
+    summary_service.record(
+        db,
+        summary_service.Deltas()
+        .add(summary_service.ACTIVE_INVESTMENTS, -principal, -matured)
+        .add(summary_service.WALLET_BALANCE, principal),
+    )
+    _book_changed(db)
+    return matured, principal, len(per_wallet)
+
+def sweep_matured_investments(db: Session, as_of: Optional[datetime] = None, batch_size: int = 1000):
+    """
+    Mature every active investment whose end_date is before `as_of` (default: now),
+    in batches of `batch_size`, each batch committed on its own so locks stay short.
+    Investments whose owner has no wallet stay active and are counted in `skipped_without_wallet`.
+    Raises MaturityConflict if a concurrent sweep got in the way; batches committed before it stay.
+    """
+    as_of = as_of or datetime.utcnow()
+    started = perf_counter()
+    matured, principal, wallet_updates, batches = 0, Decimal(0), 0, 0
+
+    while True:
+        ids = select_due_investments(db, as_of, batch_size)
+        if not ids:
+            db.rollback()
+            break
+        count, amount, credited = _mature_batch(db, ids)
+        db.commit()
+        matured += count
+        principal += amount
+        wallet_updates += credited
+        batches += 1
+
+    skipped = count_unpayable_investments(db, as_of)
+    db.rollback()
+    elapsed = perf_counter() - started
+    return {
+        "as_of": as_of.isoformat(),
+        "matured": matured,
+        "principal_returned": principal,
+        "wallet_updates": wallet_updates,
+        "skipped_without_wallet": skipped,
+        "batches": batches,
+        "seconds": round(elapsed, 3),
+        "per_second": round(matured / elapsed, 1) if elapsed else None,
+    }
+
 def mature_investment(db: Session, investment_id: int):
     inv = db.query(models.investment.UserInvestment).filter(models.investment.UserInvestment.id == investment_id).first()
     if not inv:
         raise ValueError("Investment not found")
-    inv.status = "matured"
-    db.add(inv)
+    if inv.status == "active" and not _mature_batch(db, [investment_id])[0]:
+        raise ValueError("Investment owner has no wallet to return the principal to")
     db.commit()
     db.refresh(inv)
     return inv
@@ -0,0 +1,192 @@
+# backend/app/services/summary_service.py
+"""
+Admin dashboard totals kept in the admin_counters table.
+
+Services call record() with their deltas before they commit, so a counter
+moves in the same database transaction as the rows it summarises. Reading the
+summary touches a fixed number of counter rows regardless of table sizes.
+rebuild_summary() recomputes everything from the source tables if the
+counters ever drift (e.g. after manual SQL).
+"""
+import random
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func, select, text, union_all
+from sqlalchemy.orm import Session
+from app import models
+from app.core.config import settings
+from app.db.upsert import upsert_increment
+
+counters = models.admin.AdminCounter.__table__
+transactions = models.wallet.Transaction.__table__
+archived_transactions = models.wallet.TransactionArchive.__table__
+wallets = models.wallet.Wallet.__table__
+investments = models.investment.UserInvestment.__table__
+users = models.user.User.__table__
+
+# ---- Metric names ----
+WALLET_BALANCE = "wallet_balance"            # sum of wallets.balance
+PENDING_DEPOSITS = "pending_deposits"
+PENDING_WITHDRAWALS = "pending_withdrawals"
+ACTIVE_INVESTMENTS = "active_investments"    # amount = principal of active investments
+TRANSACTIONS = "transactions"                # count of every transaction, hot and archived
+USERS = "users"                              # count of registered users
+PENDING = {"deposit": PENDING_DEPOSITS, "withdrawal": PENDING_WITHDRAWALS}
+
+
+def approved_on(type: str, day: date) -> str:
+    """Daily bucket of approved deposits / withdrawals, keyed by the transaction's created_at date."""
+    return f"approved_{type}s:{day.isoformat()}"
+
+
+class Deltas:
+    """Accumulates (amount, count) changes per metric so a batch is written in one statement."""
+
+    def __init__(self):
+        self.items: Dict[str, list] = defaultdict(lambda: [Decimal(0), 0])
+
+    def add(self, name: str, amount=0, count: int = 0) -> "Deltas":
+        entry = self.items[name]
+        entry[0] += Decimal(amount or 0)
+        entry[1] += count
+        return self
+
+    def transaction_status(self, type: str, amount, created_at: Optional[datetime], old: Optional[str], new: str) -> "Deltas":
+        """Counter changes for a transaction moving from status `old` (None = new row) to `new`."""
+        if old is None:
+            self.add(TRANSACTIONS, count=1)
+        if type not in PENDING or old == new:
+            return self
+        if old == "pending":
+            self.add(PENDING[type], -amount, -1)
+        if new == "pending":
+            self.add(PENDING[type], amount, 1)
+        day = (created_at or datetime.utcnow()).date()
+        if old == "approved":
+            self.add(approved_on(type, day), -amount, -1)
+        if new == "approved":
+            self.add(approved_on(type, day), amount, 1)
+        return self
+
+    def __bool__(self):
+        return any(amount or count for amount, count in self.items.values())
+
+
+def record(db: Session, deltas: Deltas) -> None:
+    """Add `deltas` to the counters inside the caller's transaction. Does not commit."""
+    rows = [
+        {"name": name, "slot": random.randrange(settings.ADMIN_SUMMARY_SLOTS), "amount": amount, "count": count}
+        for name, (amount, count) in deltas.items.items()
+        if amount or count
+    ]
+    upsert_increment(db, counters, ["name", "slot"], rows, ["amount", "count"])
+
+
+def _read(db: Session, names) -> Dict[str, Tuple[Decimal, int]]:
+    rows = db.execute(
+        select(counters.c.name, func.sum(counters.c.amount), func.sum(counters.c.count))
+        .where(counters.c.name.in_(names))
+        .group_by(counters.c.name)
+    ).all()
+    values = {name: (Decimal(0), 0) for name in names}
+    values.update({name: (Decimal(amount or 0), int(count or 0)) for name, amount, count in rows})
+    return values
+
+
+def get_summary(db: Session, today: Optional[date] = None) -> dict:
+    today = today or datetime.utcnow().date()
+    names = [
+        WALLET_BALANCE, PENDING_DEPOSITS, PENDING_WITHDRAWALS, ACTIVE_INVESTMENTS, TRANSACTIONS, USERS,
+        approved_on("deposit", today), approved_on("withdrawal", today),
+    ]
+    v = _read(db, names)
+    as_total = lambda name: {"count": v[name][1], "amount": v[name][0]}
+    return {
+        "as_of": datetime.utcnow(),
+        "total_wallet_balance": v[WALLET_BALANCE][0],
+        "active_investment_principal": v[ACTIVE_INVESTMENTS][0],
+        "active_investments": v[ACTIVE_INVESTMENTS][1],
+        "assets_under_management": v[WALLET_BALANCE][0] + v[ACTIVE_INVESTMENTS][0],
+        "pending_deposits": as_total(PENDING_DEPOSITS),
+        "pending_withdrawals": as_total(PENDING_WITHDRAWALS),
+        "deposits_today": as_total(approved_on("deposit", today)),
+        "withdrawals_today": as_total(approved_on("withdrawal", today)),
+        "total_transactions": v[TRANSACTIONS][1],
+        "total_users": v[USERS][1],
+    }
+
+
+# ---------------- Rebuild ----------------
+def _recompute(db: Session) -> Deltas:
+    totals = Deltas()
+    balance = db.execute(select(func.coalesce(func.sum(wallets.c.balance), 0))).scalar()
+    totals.add(WALLET_BALANCE, balance)
+
+    principal, active = db.execute(
+        select(func.coalesce(func.sum(investments.c.amount_invested), 0), func.count())
+        .where(investments.c.status == "active")
+    ).one()
+    totals.add(ACTIVE_INVESTMENTS, principal, active)
+
+    for type, amount, count in db.execute(
+        select(transactions.c.type, func.sum(transactions.c.amount), func.count())
+        .where(transactions.c.status == "pending", transactions.c.type.in_(list(PENDING)))
+        .group_by(transactions.c.type)
+    ):
+        totals.add(PENDING[type], amount, count)
+
+    totals.add(USERS, count=db.execute(select(func.count()).select_from(users)).scalar())
+
+    for table in (transactions, archived_transactions):
+        totals.add(TRANSACTIONS, count=db.execute(select(func.count()).select_from(table)).scalar())
+
+    # approved transactions may have been archived (pending ones never are)
+    approved = union_all(*[
+        select(table.c.type, table.c.amount, table.c.created_at)
+        .where(table.c.status == "approved", table.c.type.in_(list(PENDING)))
+        for table in (transactions, archived_transactions)
+    ]).subquery()
+    day = func.date(approved.c.created_at)
+    for type, created_on, amount, count in db.execute(
+        select(approved.c.type, day, func.sum(approved.c.amount), func.count())
+        .group_by(approved.c.type, day)
+    ):
+        created_on = created_on if isinstance(created_on, date) else date.fromisoformat(created_on)
+        totals.add(approved_on(type, created_on), amount, count)
+    return totals
+
+
+def rebuild_summary(db: Session) -> dict:
+    """
+    Replace every counter with totals recomputed from the source tables. Does not commit.
+    On Postgres the counters table is locked first, so writers that commit during the rebuild
+    are either already visible to it or add their delta afterwards, never both.
+    Returns {name: (old_amount, old_count, new_amount, new_count)} for metrics that drifted.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE admin_counters IN EXCLUSIVE MODE"))
+    old = {
+        name: (Decimal(amount or 0), int(count or 0))
+        for name, amount, count in db.execute(
+            select(counters.c.name, func.sum(counters.c.amount), func.sum(counters.c.count)).group_by(counters.c.name)
+        )
+    }
+    fresh = _recompute(db)
+    db.execute(counters.delete())
+    rows = [
+        {"name": name, "slot": 0, "amount": amount, "count": count}
+        for name, (amount, count) in fresh.items.items()
+        if amount or count
+    ]
+    if rows:
+        db.execute(counters.insert(), rows)
+
+    drift = {}
+    for name in set(old) | {r["name"] for r in rows}:
+        before = old.get(name, (Decimal(0), 0))
+        after = tuple(fresh.items[name]) if name in fresh.items else (Decimal(0), 0)
+        if before[0] != after[0] or before[1] != after[1]:
+            drift[name] = (before[0], before[1], after[0], after[1])
+    return drift
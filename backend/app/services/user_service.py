@@ -1,12 +1,18 @@
+from datetime import datetime
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from app import models
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.security import hash_password
+from app.services import summary_service
 from app.schemas.user import UserProfileCreate # Import the new schema
 
-def create_user(db: Session, email: str, password: str, profile_data: Optional[UserProfileCreate] = None, role: str = "user"):
+def create_user(db: Session, email: str, password: Optional[str], profile_data: Optional[UserProfileCreate] = None, role: str = "user", password_hash: Optional[str] = None):
     """
     Creates a User and optionally their UserProfile in one operation.
+    Pass `password_hash` instead of `password` when the hash was already computed (e.g. in the hashing pool).
     """
     existing = db.query(models.user.User).filter(models.user.User.email == email).first()
     if existing:
@@ -15,7 +21,7 @@ def create_user(db: Session, email: str, password: str, profile_data: Optional[U
     # 1. Create the core User object
     user = models.user.User(
         email=email,
-        password_hash=hash_password(password),
+        password_hash=password_hash or hash_password(password),
         role=role
     )
     db.add(user)
@@ -37,6 +43,7 @@ def create_user(db: Session, email: str, password: str, profile_data: Optional[U
         **new_profile_data # Apply full_name and phone_number if they exist
     )
     db.add(profile)
+    summary_service.record(db, summary_service.Deltas().add(summary_service.USERS, count=1))
     
     db.commit()
     db.refresh(user)
@@ -47,3 +54,102 @@ def get_user_by_email(db: Session, email: str):
 
 def get_user(db: Session, user_id: int):
     return db.query(models.user.User).filter(models.user.User.id == user_id).first()
+
+async def get_user_async(db: AsyncSession, user_id: int):
+    result = await db.execute(select(models.user.User).where(models.user.User.id == user_id))
+    return result.scalars().first()
+
+async def get_user_with_profile_async(db: AsyncSession, user_id: int):
+    # profile is eager-loaded: lazy loads are not possible once the async handler returns
+    result = await db.execute(
+        select(models.user.User)
+        .options(joinedload(models.user.User.profile))
+        .where(models.user.User.id == user_id)
+    )
+    return result.scalars().first()
+
+
+# ---------------- Admin user listing ----------------
+# sort key -> (column, cursor type); id is always the tie-breaker
+USER_SORTS = {
+    "created_at": (models.user.User.created_at, datetime),
+    "email": (models.user.User.email, str),
+    "id": (models.user.User.id, int),
+}
+_PROFILE_FIELDS = ("full_name", "dob", "nationality", "phone_number", "address", "city", "state", "country")
+_WALLET_FIELDS = ("allow_deposits", "allow_withdrawals", "allow_purchases")
+
+def list_users_page(
+    db: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    role: Optional[str] = None,
+    wallet_status: Optional[str] = None,
+):
+    """
+    Keyset-paginated admin user listing as plain dicts shaped like UserOut.
+    One SELECT of just the listed columns, users LEFT JOIN profile and wallet; no ORM objects.
+    wallet_status="wallet_missing" matches users without a wallet.
+    Returns (rows, next_cursor); raises ValueError for an unknown sort or a malformed cursor.
+    """
+    User = models.user.User
+    Profile = models.wallet.UserProfile
+    Wallet = models.wallet.Wallet
+    if sort not in USER_SORTS:
+        raise ValueError(f"Unknown sort: {sort}")
+    sort_col, sort_type = USER_SORTS[sort]
+    descending = order == "desc"
+
+    stmt = (
+        select(
+            User.id, User.email, User.role, User.verification_level, User.created_at,
+            Profile.id.label("profile_id"),
+            *(getattr(Profile, name) for name in _PROFILE_FIELDS),
+            Wallet.id.label("wallet_id"),
+            Wallet.status.label("wallet_status"),
+            *(getattr(Wallet, name) for name in _WALLET_FIELDS),
+        )
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .outerjoin(Wallet, Wallet.user_id == User.id)
+    )
+    if role:
+        stmt = stmt.where(User.role == role)
+    if wallet_status == "wallet_missing":
+        stmt = stmt.where(Wallet.id.is_(None))
+    elif wallet_status:
+        stmt = stmt.where(Wallet.status == wallet_status)
+
+    if sort == "id":
+        key, key_types = User.id, (int,)
+    else:
+        key, key_types = tuple_(sort_col, User.id), (sort_type, int)
+    if cursor:
+        last = decode_cursor(cursor, *key_types)
+        bound = last[0] if sort == "id" else tuple_(*last)
+        stmt = stmt.where(key < bound if descending else key > bound)
+    order_cols = (User.id,) if sort == "id" else (sort_col, User.id)
+    stmt = stmt.order_by(*(c.desc() if descending else c.asc() for c in order_cols)).limit(limit + 1)
+
+    rows = db.execute(stmt).mappings().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["id"]) if sort == "id" else encode_cursor(last[sort], last["id"])
+
+    items = []
+    for row in rows:
+        has_wallet = row["wallet_id"] is not None
+        items.append({
+            "id": row["id"],
+            "email": row["email"],
+            "role": row["role"],
+            "verification_level": row["verification_level"],
+            "created_at": row["created_at"],
+            "profile": {name: row[name] for name in _PROFILE_FIELDS} if row["profile_id"] is not None else None,
+            "wallet_status": row["wallet_status"] if has_wallet else "wallet_missing",
+            **{name: bool(row[name]) if has_wallet else False for name in _WALLET_FIELDS},
+        })
+    return items, next_cursor
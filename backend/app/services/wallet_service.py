@@ -1,7 +1,15 @@
 # backend/app/services/wallet_service.py
+from sqlalchemy import bindparam, func, select, tuple_, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from decimal import Decimal
+from collections import defaultdict
+from typing import List, Optional
 from app import models
+from app.core import metrics
+from app.core.pagination import encode_cursor, decode_cursor
+from app.db.session import after_commit
+from app.services import summary_service
 from datetime import datetime
 from app.schemas import transaction as transaction_schema  # if using schema-based transaction creation
 
@@ -23,8 +31,15 @@ def get_wallet_by_user(db: Session, user_id: int):
         models.wallet.Wallet.user_id == user_id
     ).first()
 
+async def get_wallet_by_user_async(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(models.wallet.Wallet).where(models.wallet.Wallet.user_id == user_id)
+    )
+    return result.scalars().first()
+
 # -------------------- TRANSACTIONS --------------------
-def create_transaction(db: Session, wallet_id: int, type: str, amount, reference=None, note=None, status="pending"):
+def create_transaction(db: Session, wallet_id: int, type: str, amount, reference=None, note=None, status="pending", commit: bool = True):
+    """With commit=False the row is flushed and refreshed but the caller commits (see app.api.idempotency)."""
     txn = models.wallet.Transaction(
         wallet_id=wallet_id,
         type=type,
@@ -35,7 +50,12 @@ def create_transaction(db: Session, wallet_id: int, type: str, amount, reference
         created_at=datetime.utcnow()
     )
     db.add(txn)
-    db.commit()
+    summary_service.record(db, summary_service.Deltas().transaction_status(type, amount, txn.created_at, None, status))
+    after_commit(db, metrics.TRANSACTIONS_CREATED.labels(type).inc)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
     db.refresh(txn)
     return txn
 
@@ -51,41 +71,371 @@ def create_transaction_from_schema(db: Session, tx: transaction_schema.Transacti
         created_at=datetime.utcnow(),
     )
     db.add(new_tx)
+    summary_service.record(
+        db, summary_service.Deltas().transaction_status(tx.type, tx.amount, new_tx.created_at, None, tx.status)
+    )
     db.commit()
+    metrics.TRANSACTIONS_CREATED.labels(tx.type).inc()
     db.refresh(new_tx)
     return new_tx
 
+def _wallet_history_stmt(wallet_id: int):
+    """
+    A wallet's whole history, hot and archived; each half is a range scan on its (wallet_id, created_at, id) index.
+    Unpaged, so it always reads both tables: for scripts and exports only. Request paths use
+    list_wallet_transactions_page_async, which reads the archive only past the hot rows.
+    """
+    parts = [
+        select(*[getattr(model, name) for name in TRANSACTION_COLUMNS]).where(model.wallet_id == wallet_id)
+        for model in (models.wallet.Transaction, models.wallet.TransactionArchive)
+    ]
+    history = union_all(*parts).subquery()
+    return select(history).order_by(history.c.created_at.desc(), history.c.id.desc())
+
 def list_transactions(db: Session, wallet_id: int):
-    return db.query(models.wallet.Transaction).filter(
-        models.wallet.Transaction.wallet_id == wallet_id
-    ).order_by(models.wallet.Transaction.created_at.desc()).all()
+    """Rows with the Transaction schema's attributes, newest first. The whole history (see _wallet_history_stmt)."""
+    return db.execute(_wallet_history_stmt(wallet_id)).all()
+
+async def wallet_earnings_total_async(db: AsyncSession, wallet_id: int) -> Decimal:
+    """
+    Sum of the wallet's approved earnings, hot and archived. One aggregate per table over the wallet's
+    (wallet_id, created_at, id) range; no rows are sent back, so the cost is the wallet's own history.
+    """
+    parts = [
+        select(model.amount).where(model.wallet_id == wallet_id, model.type == "earning", model.status == "approved")
+        for model in (models.wallet.Transaction, models.wallet.TransactionArchive)
+    ]
+    earnings = union_all(*parts).subquery()
+    total = (await db.execute(select(func.coalesce(func.sum(earnings.c.amount), 0)))).scalar()
+    return Decimal(total)
+
+def transaction_filters(
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    wallet_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    model=None,
+):
+    """WHERE conditions shared by the admin transaction feed and the export; `model` may be TransactionArchive."""
+    Transaction = model if model is not None else models.wallet.Transaction
+    conditions = []
+    if status:
+        conditions.append(Transaction.status == status)
+    if type:
+        conditions.append(Transaction.type == type)
+    if wallet_id is not None:
+        conditions.append(Transaction.wallet_id == wallet_id)
+    if user_id is not None:
+        # wallets.user_id is unique, so this resolves to a single wallet id
+        wallet_ids = select(models.wallet.Wallet.id).where(
+            models.wallet.Wallet.user_id == user_id
+        ).scalar_subquery()
+        conditions.append(Transaction.wallet_id == wallet_ids)
+    if created_from is not None:
+        conditions.append(Transaction.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(Transaction.created_at < created_to)
+    return conditions
+
+# columns of the Transaction schema, for column-projected (as_rows) queries
+TRANSACTION_COLUMNS = ("id", "wallet_id", "type", "amount", "status", "reference", "note", "created_at")
+
+def archive_horizon(db: Session) -> Optional[datetime]:
+    """Newest created_at in transactions_archive, None while it is empty. One index probe."""
+    TransactionArchive = models.wallet.TransactionArchive
+    return db.query(func.max(TransactionArchive.created_at)).scalar()
+
+def _feed_stmt(model, entities, after: Optional[tuple], limit: int, filters: dict):
+    stmt = select(*entities).where(*transaction_filters(model=model, **filters))
+    if after:
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(*after))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+def _feed_page(db: Session, model, as_rows: bool, after: Optional[tuple], limit: int, filters: dict):
+    if as_rows:
+        return db.execute(_feed_stmt(model, [getattr(model, name) for name in TRANSACTION_COLUMNS], after, limit, filters)).all()
+    return db.execute(_feed_stmt(model, [model], after, limit, filters)).scalars().all()
+
+def _archive_needed(horizon: Optional[datetime], hot_rows: list, limit: int, filters: dict) -> bool:
+    """
+    Archived rows are all at or before the horizon, so they can only belong on this page
+    if the hot rows ran out or reach back that far.
+    """
+    if horizon is None:
+        return False
+    created_from = filters.get("created_from")
+    if created_from is not None and created_from > horizon:
+        return False
+    return not (len(hot_rows) > limit and hot_rows[-1].created_at > horizon)
+
+def _merge_page(rows: list, archived: list, limit: int) -> list:
+    return sorted(rows + archived, key=lambda row: (row.created_at, row.id), reverse=True)[:limit + 1]
+
+def _finish_page(rows: list, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+def list_transactions_page(
+    db: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    as_rows: bool = False,
+    **filters,
+):
+    """
+    Keyset-paginated transaction feed, newest first; `filters` are those of transaction_filters.
+    Pages are sliced on (created_at, id) instead of OFFSET, so page N costs the same as page 1.
+    The hot table is read first; transactions_archive only when the page reaches back past
+    the newest archived row.
+    Returns (transactions, next_cursor); next_cursor is None on the last page.
+    With as_rows the transactions are plain dicts of TRANSACTION_COLUMNS instead of ORM objects.
+    Raises ValueError for a malformed cursor.
+    """
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+
+    # fetch one extra row to know whether another page exists
+    rows = _feed_page(db, models.wallet.Transaction, as_rows, after, limit + 1, filters)
+    if _archive_needed(archive_horizon(db), rows, limit, filters):
+        archived = _feed_page(db, models.wallet.TransactionArchive, as_rows, after, limit + 1, filters)
+        rows = _merge_page(rows, archived, limit)
+
+    rows, next_cursor = _finish_page(rows, limit)
+    if as_rows:
+        rows = [row._asdict() for row in rows]
+    return rows, next_cursor
+
+async def list_wallet_transactions_page_async(db: AsyncSession, wallet_id: int, limit: int = 50, cursor: Optional[str] = None):
+    """
+    One page of a wallet's history, newest first, read like list_transactions_page: the archive
+    only once the page reaches back past its horizon. Rows carry TRANSACTION_COLUMNS.
+    Returns (rows, next_cursor). Raises ValueError for a malformed cursor.
+    """
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+    filters = {"wallet_id": wallet_id}
+    columns = lambda model: [getattr(model, name) for name in TRANSACTION_COLUMNS]
+
+    Transaction, TransactionArchive = models.wallet.Transaction, models.wallet.TransactionArchive
+    rows = (await db.execute(_feed_stmt(Transaction, columns(Transaction), after, limit + 1, filters))).all()
+    horizon = (await db.execute(select(func.max(TransactionArchive.created_at)))).scalar()
+    if _archive_needed(horizon, rows, limit, filters):
+        stmt = _feed_stmt(TransactionArchive, columns(TransactionArchive), after, limit + 1, filters)
+        rows = _merge_page(rows, (await db.execute(stmt)).all(), limit)
+    return _finish_page(rows, limit)
+
+class InvalidTransition(ValueError):
+    """Raised when TRANSITIONS does not allow a transaction to move from `old_status` to `new_status`."""
+
+    def __init__(self, old_status: str, new_status: str, message: Optional[str] = None):
+        self.old_status, self.new_status = old_status, new_status
+        super().__init__(message or f"Transaction cannot move from {old_status} to {new_status}")
+
+class TransactionAlreadyApproved(InvalidTransition):
+    """
+    Raised when changing a transaction whose status is already 'approved': approving it again,
+    or moving it back to pending / rejected after its amount went into the wallet balance.
+    """
+
+    def __init__(self, new_status: str):
+        super().__init__("approved", new_status, "Transaction already approved")
+
+def balance_delta(type: str, amount) -> Decimal:
+    """Signed effect of an approved transaction on its wallet balance."""
+    if type in ["deposit", "earning"]:
+        return Decimal(amount)
+    if type == "withdrawal":
+        return -Decimal(amount)
+    return Decimal(0)
+
+def apply_balance_delta(db: Session, wallet_id: int, delta) -> None:
+    """Atomic `balance = balance + delta` in the database; concurrent callers cannot lose an update."""
+    Wallet = models.wallet.Wallet
+    db.query(Wallet).filter(Wallet.id == wallet_id).update(
+        {Wallet.balance: func.coalesce(Wallet.balance, 0) + delta}, synchronize_session=False
+    )
+
+# status changes allowed from each status; approved is final, its amount is already in the balance
+TRANSITIONS = {
+    "pending": {"approved", "rejected"},
+    "rejected": {"approved", "pending"},
+    "approved": set(),
+}
+
+def can_transition(old_status: str, new_status: str) -> bool:
+    return new_status in TRANSITIONS.get(old_status, ())
+
+def is_noop(old_status: str, new_status: str) -> bool:
+    """Setting a status a transaction already has changes nothing; approving twice is still refused."""
+    return old_status == new_status and old_status != "approved"
+
+def check_transition(old_status: str, new_status: str) -> None:
+    """Raises TransactionAlreadyApproved out of approved, InvalidTransition for any other change TRANSITIONS refuses."""
+    if can_transition(old_status, new_status):
+        return
+    if old_status == "approved":
+        raise TransactionAlreadyApproved(new_status)
+    raise InvalidTransition(old_status, new_status)
+
+def _transition(db: Session, txn, new_status: str) -> bool:
+    """
+    Compare-and-set txn.status -> new_status, applying the balance change when it becomes approved
+    and the matching admin summary deltas. Does not commit. False if the row changed underneath us.
+    Raises InvalidTransition (TransactionAlreadyApproved out of approved) for a change TRANSITIONS refuses.
+    """
+    Transaction = models.wallet.Transaction
+    old_status = txn.status
+    check_transition(old_status, new_status)
+    claimed = db.query(Transaction).filter(
+        Transaction.id == txn.id, Transaction.status == old_status
+    ).update({Transaction.status: new_status}, synchronize_session=False)
+    if not claimed:
+        return False
+
+    deltas = summary_service.Deltas().transaction_status(txn.type, txn.amount, txn.created_at, old_status, new_status)
+    if new_status == "approved":
+        delta = balance_delta(txn.type, txn.amount)
+        if delta:
+            apply_balance_delta(db, txn.wallet_id, delta)
+            deltas.add(summary_service.WALLET_BALANCE, delta)
+    summary_service.record(db, deltas)
+    return True
+
+def _set_status(db: Session, txn_id: int, new_status: str, attempts: int = 3):
+    Transaction = models.wallet.Transaction
+    for _ in range(attempts):
+        # FOR UPDATE where supported; on SQLite the compare-and-set in _transition catches races
+        txn = db.query(Transaction).filter(Transaction.id == txn_id).with_for_update().first()
+        if not txn:
+            if _archived_statuses(db, [txn_id]):
+                raise ValueError("Transaction is archived; settled transactions past the hot window cannot change")
+            raise ValueError("Transaction not found")
+        if is_noop(txn.status, new_status):
+            db.rollback()
+            return txn
+        try:
+            changed = _transition(db, txn, new_status)
+        except InvalidTransition:
+            db.rollback()
+            raise
+        if changed:
+            db.commit()
+            metrics.TRANSACTION_STATUS_CHANGES.labels(txn.type, new_status).inc()
+            db.refresh(txn)
+            return txn
+        db.rollback()
+    raise ValueError("Transaction is being updated concurrently; retry the request")
 
 def approve_transaction(db: Session, txn_id: int):
-    txn = db.query(models.wallet.Transaction).filter(
-        models.wallet.Transaction.id == txn_id
-    ).first()
-    if not txn:
-        raise ValueError("Transaction not found")
-    wallet = txn.wallet
-    txn.status = "approved"
-    if txn.type in ["deposit", "earning"]:
-        wallet.balance += txn.amount
-    elif txn.type == "withdrawal":
-        wallet.balance -= txn.amount
-    db.add(txn)
-    db.add(wallet)
-    db.commit()
-    db.refresh(txn)
-    return txn
+    """
+    Approve a transaction and apply it to its wallet in one database transaction.
+    The status flip is a compare-and-set on the locked row, so only one of several
+    concurrent approvals credits the wallet.
+    Raises ValueError if missing, TransactionAlreadyApproved if it was approved already.
+    """
+    return _set_status(db, txn_id, "approved")
 
 def reject_transaction(db: Session, txn_id: int):
-    txn = db.query(models.wallet.Transaction).filter(
-        models.wallet.Transaction.id == txn_id
-    ).first()
-    if not txn:
-        raise ValueError("Transaction not found")
-    txn.status = "rejected"
-    db.add(txn)
-    db.commit()
-    db.refresh(txn)
-    return txn
+    """
+    No-op if already rejected. Raises TransactionAlreadyApproved for an approved transaction (the bulk
+    reject skips it) and InvalidTransition from a status TRANSITIONS does not know.
+    """
+    return _set_status(db, txn_id, "rejected")
+
+def pend_transaction(db: Session, txn_id: int):
+    """No-op if already pending. Raises InvalidTransition like reject_transaction."""
+    return _set_status(db, txn_id, "pending")
+
+def _archived_statuses(db: Session, txn_ids: List[int]) -> dict:
+    TransactionArchive = models.wallet.TransactionArchive
+    return dict(db.query(TransactionArchive.id, TransactionArchive.status).filter(TransactionArchive.id.in_(txn_ids)).all())
+
+_BULK_DONE = {"approve": "approved", "reject": "rejected"}
+
+def bulk_update_transactions(db: Session, txn_ids: List[int], action: str, attempts: int = 3):
+    """
+    Approve or reject many transactions in one database transaction.
+    Approved deltas are summed per wallet, so each wallet gets a single balance UPDATE.
+    Rows the TRANSITIONS table does not allow to move to the target (already there, or approved)
+    are left alone and reported as "already_<status>"; the single-item endpoints treat the same rows
+    as a no-op (status unchanged) or refuse them (InvalidTransition).
+    Returns (results, wallets_updated); results is [{"id", "result"}] in request order.
+    """
+    if action not in _BULK_DONE:
+        raise ValueError(f"Unknown action: {action}")
+    Transaction = models.wallet.Transaction
+    Wallet = models.wallet.Wallet
+    ids = list(dict.fromkeys(txn_ids))
+    target = _BULK_DONE[action]
+
+    def result_for(status, default):
+        return default if can_transition(status, target) else f"already_{status}"
+
+    for _ in range(attempts):
+        # lock in id order so two overlapping batches cannot deadlock
+        rows = (
+            db.query(
+                Transaction.id, Transaction.wallet_id, Transaction.type,
+                Transaction.amount, Transaction.status, Transaction.created_at,
+            )
+            .filter(Transaction.id.in_(ids))
+            .order_by(Transaction.id)
+            .with_for_update()
+            .all()
+        )
+        found = {row.id: row for row in rows}
+        todo = [row for row in rows if can_transition(row.status, target)]
+
+        # compare-and-set per previous status, so the summary deltas below are exact
+        by_status = defaultdict(list)
+        for row in todo:
+            by_status[row.status].append(row.id)
+        claimed = 0
+        for old_status, group in by_status.items():
+            claimed += db.query(Transaction).filter(
+                Transaction.id.in_(group), Transaction.status == old_status
+            ).update({Transaction.status: target}, synchronize_session=False)
+        if claimed != len(todo):
+            # without row locks (SQLite) another request changed a row in between; start over
+            db.rollback()
+            continue
+
+        summary = summary_service.Deltas()
+        per_wallet = defaultdict(Decimal)
+        for row in todo:
+            summary.transaction_status(row.type, row.amount, row.created_at, row.status, target)
+            if action == "approve":
+                per_wallet[row.wallet_id] += balance_delta(row.type, row.amount)
+        deltas = [{"wallet_id": wallet_id, "delta": delta} for wallet_id, delta in per_wallet.items() if delta]
+        if deltas:
+            db.execute(
+                update(Wallet.__table__)
+                .where(Wallet.__table__.c.id == bindparam("wallet_id"))
+                .values(balance=func.coalesce(Wallet.__table__.c.balance, 0) + bindparam("delta")),
+                deltas,
+            )
+            summary.add(summary_service.WALLET_BALANCE, sum(d["delta"] for d in deltas))
+        summary_service.record(db, summary)
+        db.commit()
+        metrics.record_status_changes(todo, target)
+
+        # archived transactions are settled and read-only
+        missing = [txn_id for txn_id in ids if txn_id not in found]
+        archived = _archived_statuses(db, missing) if missing else {}
+
+        results = []
+        for txn_id in ids:
+            row = found.get(txn_id)
+            if row is not None:
+                result = result_for(row.status, target)
+            elif txn_id in archived:
+                result = result_for(archived[txn_id], "archived")
+            else:
+                result = "not_found"
+            results.append({"id": txn_id, "result": result})
+        return results, len(deltas)
+
+    raise RuntimeError("Transactions kept changing during the bulk update; retry the request")
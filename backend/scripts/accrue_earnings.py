@@ -0,0 +1,48 @@
+# backend/scripts/accrue_earnings.py
+# Credit daily investment earnings. Safe to rerun: days already accrued are skipped.
+#   python scripts/accrue_earnings.py                       # yesterday (UTC)
+#   python scripts/accrue_earnings.py --date 2026-10-01
+#   python scripts/accrue_earnings.py --from 2026-10-01 --to 2026-10-07   # catch-up
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.db.session import SessionLocal
+from app.services import accrual_service
+
+def parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def run():
+    parser = argparse.ArgumentParser(description="Accrue daily investment earnings")
+    parser.add_argument("--date", type=parse_date, help="single day to accrue (default: yesterday, UTC)")
+    parser.add_argument("--from", dest="start", type=parse_date, help="first day of a catch-up range")
+    parser.add_argument("--to", dest="end", type=parse_date, help="last day of a catch-up range (default: yesterday)")
+    parser.add_argument("--chunk-size", type=int, default=accrual_service.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    if args.start:
+        start, end = args.start, args.end or yesterday
+    else:
+        start = end = args.date or yesterday
+
+    db = SessionLocal()
+    try:
+        results = accrual_service.accrue_earnings_range(db, start, end, chunk_size=args.chunk_size)
+        for r in results:
+            print(
+                f"{r['date']}: credited {r['investments_credited']} investments, "
+                f"{r['amount_credited']} total, {r['chunks']} chunks, "
+                f"{r['seconds']}s ({r['per_second']}/s)"
+            )
+    except Exception as e:
+        db.rollback()
+        print("Error:", e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
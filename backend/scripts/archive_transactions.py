@@ -0,0 +1,39 @@
+# backend/scripts/archive_transactions.py
+# Move settled transactions older than TRANSACTION_HOT_DAYS into transactions_archive.
+# Run from cron, e.g. nightly; batches commit one by one, so it can be stopped at any time.
+#   python scripts/archive_transactions.py
+#   python scripts/archive_transactions.py --hot-days 30 --batch-size 20000 --max-batches 50
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from datetime import datetime, timedelta
+from app.db.session import SessionLocal
+from app.services import archive_service
+
+def run():
+    parser = argparse.ArgumentParser(description="Archive settled transactions past the hot window")
+    parser.add_argument("--hot-days", type=int, help="override TRANSACTION_HOT_DAYS")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches (spread a backlog over several runs)")
+    args = parser.parse_args()
+
+    cutoff = datetime.utcnow() - timedelta(days=args.hot_days) if args.hot_days is not None else None
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        moved = archive_service.archive_transactions(
+            db, cutoff=cutoff, batch_size=args.batch_size, max_batches=args.max_batches
+        )
+        print(f"archived {moved} transactions in {time.perf_counter() - started:.1f}s")
+        print(archive_service.archive_stats(db))
+    except Exception as e:
+        db.rollback()
+        print("Error:", e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
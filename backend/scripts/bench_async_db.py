@@ -0,0 +1,100 @@
+# backend/scripts/bench_async_db.py
+"""
+Side-by-side throughput of the sync and async DB stacks.
+
+Serves the real app under uvicorn plus one bench-only route that is the pre-async
+version of GET /api/wallets/me/transactions (sync handler, sync Session, threadpool),
+reading the same newest-500 page.
+Both routes are then driven at increasing client concurrency, and req/s plus
+latency percentiles are printed for each.
+
+Usage:
+    python scripts/bench_async_db.py
+    python scripts/bench_async_db.py --database-url postgresql://... --concurrency 16 64 256
+"""
+import argparse
+import threading
+import time
+from benchlib import SCRIPTS_DIR, login, percentiles, request, scratch_env, seed_users, serve
+
+ASYNC_PATH = "/api/wallets/me/transactions"
+SYNC_PATH = "/bench/sync/wallets/me/transactions"
+
+
+def create_bench_app():
+    """uvicorn factory: the real app plus the sync twin of the async route."""
+    from typing import List
+    from fastapi import Depends, HTTPException
+    from sqlalchemy.orm import Session
+    from app.core.dependencies import get_current_user
+    from app.db.session import get_db
+    from app.main import app
+    from app.schemas.wallet import TransactionOut
+    from app.services import wallet_service
+
+    @app.get(SYNC_PATH, response_model=List[TransactionOut], include_in_schema=False)
+    def sync_transactions(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+        wallet = wallet_service.get_wallet_by_user(db, current_user.id)
+        if not wallet:
+            raise HTTPException(404, "Wallet not found")
+        transactions, _ = wallet_service.list_transactions_page(db, limit=500, wallet_id=wallet.id)
+        return transactions
+
+    return app
+
+
+def drive(base, path, tokens, clients, duration):
+    stop = time.monotonic() + duration
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def client(i):
+        nonlocal errors
+        headers = {"Authorization": "Bearer " + tokens[i % len(tokens)]}
+        while time.monotonic() < stop:
+            t = time.perf_counter()
+            status, _ = request(base + path, headers=headers)
+            elapsed = time.perf_counter() - t
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+    stats = percentiles(latencies)
+    stats["rps"] = round(len(latencies) / elapsed, 1)
+    stats["errors"] = errors
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5, help="seconds per measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 96])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--transactions-per-user", type=int, default=20)
+    parser.add_argument("--database-url", help="benchmark against this database instead of scratch SQLite")
+    args = parser.parse_args()
+
+    env = scratch_env(args.database_url)
+    seed_users(env, args.users, args.transactions_per_user)
+
+    with serve(env, app="bench_async_db:create_bench_app", app_dir=SCRIPTS_DIR, factory=True) as base:
+        tokens = [login(base, f"bench{i}@example.com") for i in range(args.users)]
+        print(f"{'clients':>7}  {'stack':<5}  {'req/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'p99 ms':>7}  errors")
+        for clients in args.concurrency:
+            for label, path in (("sync", SYNC_PATH), ("async", ASYNC_PATH)):
+                s = drive(base, path, tokens, clients, args.duration)
+                print(f"{clients:>7}  {label:<5}  {s['rps']:>8}  {s.get('p50_ms', '-'):>7}  "
+                      f"{s.get('p95_ms', '-'):>7}  {s.get('p99_ms', '-'):>7}  {s['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# backend/scripts/bench_auth_rate_limit.py
+"""
+Load test for the auth rate limiter: does a credential-stuffing burst hurt real users?
+
+Starts the API under uvicorn against a scratch SQLite database and runs the same
+mix twice, once with RATE_LIMIT_ENABLED and once without:
+
+  * legitimate users: each has its own address and account and logs in with the
+    right password every few seconds;
+  * attackers: a handful of addresses spraying wrong passwords across other existing
+    accounts at a fixed rate far above the limits, so every admitted attempt costs a
+    bcrypt check. The rate is fixed (open loop) rather than as-fast-as-possible so the
+    load generator doesn't starve the server of CPU when both share one machine.
+
+Attackers start --warmup seconds before the legitimate users, so the numbers show a
+sustained attack. The opening burst an attacker address gets (LOGIN_RATE_LIMIT_IP_BURST
+attempts) is a one-off cost bounded by burst x addresses.
+
+Client addresses are simulated with X-Forwarded-For (RATE_LIMIT_TRUSTED_PROXIES=1).
+With the limiter on, legitimate logins should all succeed with roughly the latency
+of a quiet server, while the attackers mostly get fast 429s and never reach bcrypt.
+
+Usage:
+    python scripts/bench_auth_rate_limit.py
+    python scripts/bench_auth_rate_limit.py --duration 30 --attack-clients 64
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from benchlib import PASSWORD, percentiles, request, scratch_env, seed_users, serve
+
+
+def run_phase(base, duration, warmup, legit_users, legit_interval, attack_clients, attack_ips, attack_rate, victims):
+    started = time.monotonic() + (warmup if attack_clients else 0)
+    stop = started + duration
+    legit_latencies, legit_statuses = [], Counter()
+    attack_latencies, attack_statuses = [], Counter()
+    lock = threading.Lock()
+
+    def legit(i):
+        headers = {"X-Forwarded-For": f"10.1.{i // 250}.{i % 250 + 1}"}
+        time.sleep(max(0.0, started - time.monotonic()) + random.uniform(0, legit_interval))
+        while time.monotonic() < stop:
+            t = time.perf_counter()
+            status, _ = request(
+                base + "/api/auth/token",
+                {"username": f"bench{i}@example.com", "password": PASSWORD},
+                headers=headers,
+                form=True,
+            )
+            elapsed = time.perf_counter() - t
+            with lock:
+                legit_statuses[status] += 1
+                if status == 200:
+                    legit_latencies.append(elapsed)
+            time.sleep(legit_interval * random.uniform(0.5, 1.5))
+
+    def attacker(i):
+        headers = {"X-Forwarded-For": f"203.0.113.{i % attack_ips + 1}"}
+        n = 0
+        interval = attack_clients / attack_rate
+        next_at = time.monotonic() + random.uniform(0, interval)
+        while time.monotonic() < stop:
+            n += 1
+            time.sleep(max(0.0, next_at - time.monotonic()))
+            next_at += interval
+            t = time.perf_counter()
+            status, _ = request(
+                base + "/api/auth/token",
+                {"username": f"bench{legit_users + (i * 7919 + n) % victims}@example.com", "password": "hunter2"},
+                headers=headers,
+                form=True,
+            )
+            elapsed = time.perf_counter() - t
+            with lock:
+                attack_statuses[status] += 1
+                attack_latencies.append(elapsed)
+
+    threads = [threading.Thread(target=legit, args=(i,)) for i in range(legit_users)]
+    threads += [threading.Thread(target=attacker, args=(i,)) for i in range(attack_clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {
+        "legit": percentiles(legit_latencies),
+        "legit_statuses": dict(legit_statuses),
+        "attack": percentiles(attack_latencies),
+        "attack_statuses": dict(attack_statuses),
+    }
+
+
+def report(label, result):
+    print(f"[{label}]")
+    print(f"  legit logins   : {result['legit_statuses']}  {result['legit']}")
+    if result["attack_statuses"]:
+        print(f"  attack attempts: {result['attack_statuses']}  {result['attack']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per phase")
+    parser.add_argument("--warmup", type=float, default=20, help="seconds the attack runs before measuring")
+    parser.add_argument("--legit-users", type=int, default=10)
+    parser.add_argument("--legit-interval", type=float, default=10, help="mean seconds between a user's logins")
+    parser.add_argument("--attack-clients", type=int, default=32)
+    parser.add_argument("--attack-ips", type=int, default=4)
+    parser.add_argument("--attack-rate", type=float, default=40, help="attempts per second across all attackers")
+    parser.add_argument("--victims", type=int, default=200, help="accounts the attackers spray")
+    args = parser.parse_args()
+
+    env = scratch_env(RATE_LIMIT_TRUSTED_PROXIES=1)
+    seed_users(env, args.legit_users + args.victims)
+    phase = lambda attack_clients: run_phase(
+        base, args.duration, args.warmup, args.legit_users, args.legit_interval, attack_clients, args.attack_ips, args.attack_rate, args.victims
+    )
+
+    with serve(dict(env, RATE_LIMIT_ENABLED="true")) as base:
+        quiet = phase(0)
+        limited = phase(args.attack_clients)
+    with serve(dict(env, RATE_LIMIT_ENABLED="false")) as base:
+        unlimited = phase(args.attack_clients)
+
+    report("no attack, limiter on", quiet)
+    report("attack, limiter on", limited)
+    report("attack, limiter off", unlimited)
+
+    legit_ok = set(limited["legit_statuses"]) == {200}
+    blocked = limited["attack_statuses"].get(429, 0) / max(sum(limited["attack_statuses"].values()), 1)
+    print(f"attack attempts refused with 429: {blocked:.1%}")
+    if quiet["legit"].get("n") and limited["legit"].get("n"):
+        print(f"legit p99 attack/quiet          : {limited['legit']['p99_ms'] / max(quiet['legit']['p99_ms'], 0.1):.2f}x")
+    print("PASS" if legit_ok and blocked > 0.9 else "FAIL")
+    sys.exit(0 if legit_ok and blocked > 0.9 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backend/scripts/bench_fast_json.py
+"""
+List-endpoint serialization benchmark: response_model validation vs the
+FAST_LIST_RESPONSES path (column-projected rows + app.core.fast_json).
+
+Seeds one scratch SQLite database, then serves it twice under uvicorn, once per
+mode, and times the same list requests against each. It also checks that both
+modes return the same JSON and the same OpenAPI document.
+
+Usage:
+    python scripts/bench_fast_json.py
+    python scripts/bench_fast_json.py --users 2000 --investments-per-user 5 --requests 30
+"""
+import argparse
+import json
+import time
+from benchlib import login, percentiles, request, run_python, scratch_env, seed_users, serve
+
+ENDPOINTS = [
+    "/api/admin/investments",
+    "/api/admin/wallets",
+    "/api/admin/transactions?limit=500",
+    "/api/admin/users?limit=500",
+    "/api/investments/me/investments",
+]
+
+
+def seed_investments(env, per_user):
+    run_python(
+        "from datetime import datetime, timedelta\n"
+        "from sqlalchemy import insert\n"
+        "from app.db.session import SessionLocal\n"
+        "from app import models\n"
+        "db = SessionLocal()\n"
+        "db.query(models.user.User).filter(models.user.User.email == 'bench0@example.com').update({'role': 'admin'})\n"
+        "pkgs = [models.investment.InvestmentPackage(name=f'Plan {i}', description='x', min_amount=10,\n"
+        "        max_amount=100000, daily_return=0.0125, duration_days=30 * (i + 1)) for i in range(4)]\n"
+        "db.add_all(pkgs); db.flush()\n"
+        "now = datetime.utcnow()\n"
+        "user_ids = [u for (u,) in db.query(models.user.User.id).all()]\n"
+        "db.execute(insert(models.investment.UserInvestment.__table__), [\n"
+        "    dict(user_id=u, package_id=pkgs[(u + j) % 4].id, amount_invested=100 + j, start_date=now,\n"
+        "         end_date=now + timedelta(days=30), status='active', total_earnings=1.5)\n"
+        f"    for u in user_ids for j in range({per_user})])\n"
+        "db.commit()\n",
+        env,
+    )
+
+
+def fetch(base, path, headers):
+    status, body = request(base + path, headers=headers)
+    if status != 200:
+        raise RuntimeError(f"{path}: {status} {body[:200]!r}")
+    return body
+
+
+def normalise(payload):
+    # the ORM listings carry no ORDER BY; compare as sets keyed by id
+    items = payload["items"] if isinstance(payload, dict) else payload
+    items = sorted(items, key=lambda item: item["id"])
+    return {**payload, "items": items} if isinstance(payload, dict) else items
+
+
+def run_mode(env, fast, requests):
+    env = dict(env, FAST_LIST_RESPONSES=str(fast).lower())
+    results, bodies = {}, {}
+    with serve(env) as base:
+        headers = {"Authorization": "Bearer " + login(base, "bench0@example.com")}
+        _, openapi = request(base + "/openapi.json")
+        for path in ENDPOINTS:
+            body = fetch(base, path, headers)  # warm-up
+            bodies[path] = normalise(json.loads(body))
+            samples = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                body = fetch(base, path, headers)
+                samples.append(time.perf_counter() - started)
+            results[path] = dict(percentiles(samples), kib=round(len(body) / 1024, 1))
+    return results, bodies, json.loads(openapi)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--investments-per-user", type=int, default=3)
+    parser.add_argument("--transactions-per-user", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=20, help="timed requests per endpoint and mode")
+    args = parser.parse_args()
+
+    env = scratch_env(PRINCIPAL_CACHE_ENABLED="true")
+    seed_users(env, args.users, transactions_per_user=args.transactions_per_user)
+    seed_investments(env, args.investments_per_user)
+
+    slow, slow_bodies, slow_openapi = run_mode(env, False, args.requests)
+    fast, fast_bodies, fast_openapi = run_mode(env, True, args.requests)
+
+    print(f"{'endpoint':40} {'size':>8} {'model p50':>10} {'fast p50':>10} {'model p95':>10} {'fast p95':>10} {'speed-up':>9}")
+    for path in ENDPOINTS:
+        s, f = slow[path], fast[path]
+        print(f"{path:40} {s['kib']:>6}Ki {s['p50_ms']:>8}ms {f['p50_ms']:>8}ms "
+              f"{s['p95_ms']:>8}ms {f['p95_ms']:>8}ms {s['p50_ms'] / max(f['p50_ms'], 0.1):>8.1f}x")
+
+    mismatched = [path for path in ENDPOINTS if slow_bodies[path] != fast_bodies[path]]
+    print("identical JSON  :", "yes" if not mismatched else f"NO - {', '.join(mismatched)}")
+    print("identical OpenAPI:", "yes" if slow_openapi == fast_openapi else "NO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# backend/scripts/bench_forecast.py
+"""
+Payout forecast benchmark and cross-check.
+
+Generates --investments investments into a scratch SQLite database (or uses --url),
+then times:
+  * load   - the columnar query that fills the cached book (cold cache);
+  * cached - a full forecast served from the cached book;
+and checks the vectorized schedule against a straightforward per-investment loop
+over a sample, plus that opening an investment makes the next forecast reload.
+
+Usage:
+    python scripts/bench_forecast.py                          # 1M investments, 365 days
+    python scripts/bench_forecast.py --investments 100000 --days 90
+    python scripts/bench_forecast.py --url postgresql://...   # an existing dataset
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, time as day_time, timedelta
+from benchlib import scratch_env
+
+
+def reference(book, start, days, sample):
+    """The same schedule, one investment and one day at a time, mirroring accrual_service's eligibility."""
+    earnings, principal = [0.0] * days, [0.0] * days
+    origin = datetime.combine(start, day_time.min)
+    epoch = datetime(1970, 1, 1)
+    for i in range(sample):
+        started = epoch + timedelta(seconds=float(book.start[i]))
+        ends = epoch + timedelta(seconds=float(book.end[i]))
+        for d in range(days):
+            day_start = origin + timedelta(days=d)
+            if started <= day_start < ends:
+                earnings[d] += float(book.daily[i])
+        due = max((ends - origin) // timedelta(days=1), 0)
+        if due < days:
+            principal[due] += float(book.principal[i])
+    return earnings, principal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL with data already in it (default: generate into scratch SQLite)")
+    parser.add_argument("--investments", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sample", type=int, default=2000, help="investments cross-checked against the loop")
+    args = parser.parse_args()
+
+    os.environ.update(scratch_env(args.url))
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import numpy as np
+    from decimal import Decimal
+    from app import models
+    from app.db.session import SessionLocal, engine
+    from app.services import forecast_service, investment_service
+
+    if not args.url:
+        import generate_data
+        from app.db.base import Base
+        Base.metadata.create_all(bind=engine)
+        t = time.perf_counter()
+        generate_data.generate(args.users, 0, args.investments, report=lambda *a: None)
+        print(f"generated {args.users} users / {args.investments} investments in {time.perf_counter() - t:.1f}s")
+
+    db = SessionLocal()
+    t = time.perf_counter()
+    entry = forecast_service.get_book(db)
+    load = time.perf_counter() - t
+    book = entry.value
+    print(f"load   : {load:.2f}s for {len(book)} active investments ({sum(a.nbytes for a in vars(book).values()) / 2**20:.0f} MiB)")
+
+    samples = []
+    for _ in range(args.repeat):
+        t = time.perf_counter()
+        forecast = forecast_service.payout_forecast(db, args.days)
+        samples.append(time.perf_counter() - t)
+    print(f"cached : median {statistics.median(samples) * 1000:.1f} ms for {args.days} days "
+          f"(earnings {forecast['total_earnings']:,.2f}, principal {forecast['total_principal']:,.2f})")
+
+    failures = []
+    sample = min(args.sample, len(book))
+    subset = forecast_service.Book(*(a[:sample] for a in (book.principal, book.daily, book.start, book.end)))
+    start = forecast["start"]
+    earnings, principal = forecast_service.schedule(subset, start, args.days)
+    ref_earnings, ref_principal = reference(subset, start, args.days, sample)
+    if not (np.allclose(earnings, ref_earnings) and np.allclose(principal, ref_principal)):
+        failures.append("vectorized schedule differs from the per-investment loop")
+
+    # a purchase bumps the book version; the next forecast must include it
+    user_id, package_id = db.query(models.investment.UserInvestment.user_id, models.investment.UserInvestment.package_id).first()
+    db.query(models.wallet.Wallet).filter(models.wallet.Wallet.user_id == user_id).update({"balance": 10**6})
+    db.commit()
+    minimum = db.query(models.investment.InvestmentPackage.min_amount).filter_by(id=package_id).scalar()
+    investment_service.create_user_investment(db, user_id, package_id, Decimal(minimum))
+    after = forecast_service.payout_forecast(db, args.days)
+    if after["active_investments"] != forecast["active_investments"] + 1 or after["book_version"] == forecast["book_version"]:
+        failures.append("forecast did not pick up a new investment")
+    db.close()
+
+    if load + statistics.median(samples) > 10:
+        failures.append("cold forecast took longer than 10s")
+    if failures:
+        print("FAIL")
+        for failure in failures:
+            print("  " + failure)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# backend/scripts/bench_login_storm.py
+"""
+Login-storm benchmark: does a burst of bcrypt logins slow down wallet reads?
+
+Starts the API under uvicorn against a scratch SQLite database, then measures
+GET /api/wallets/me latency twice: once on its own and once while a pool of
+clients hammers POST /api/auth/token. With hashing in its own low-priority
+process pool the wallet-read p99 should stay roughly flat, and excess logins
+should get fast 503s instead of queueing. Storm clients retry a 503 at once
+unless --backoff is given; the latency of admitted (200) logins is reported too.
+
+Usage:
+    python scripts/bench_login_storm.py
+    python scripts/bench_login_storm.py --backoff 1                      # clients honour Retry-After
+    python scripts/bench_login_storm.py --hash-workers 1 --hash-queue 4
+    python scripts/bench_login_storm.py --duration 20 --login-clients 64 --hash-workers 0   # old behaviour
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+from benchlib import PASSWORD, login, percentiles, request, scratch_env, seed_users, serve
+
+
+def run_phase(base, tokens, duration, reader_clients, login_clients, backoff=0.0):
+    stop = time.monotonic() + duration
+    read_latencies, login_latencies, login_statuses = [], [], Counter()
+    lock = threading.Lock()
+
+    def reader(i):
+        headers = {"Authorization": "Bearer " + tokens[i % len(tokens)]}
+        while time.monotonic() < stop:
+            t = time.perf_counter()
+            status, _ = request(base + "/api/wallets/me", headers=headers)
+            elapsed = time.perf_counter() - t
+            with lock:
+                if status == 200:
+                    read_latencies.append(elapsed)
+
+    def login_storm(i):
+        while time.monotonic() < stop:
+            t = time.perf_counter()
+            status, _ = request(
+                base + "/api/auth/token",
+                {"username": f"bench{i % len(tokens)}@example.com", "password": PASSWORD},
+                form=True,
+            )
+            elapsed = time.perf_counter() - t
+            with lock:
+                login_statuses[status] += 1
+                if status == 200:
+                    login_latencies.append(elapsed)
+            if status == 503 and backoff:
+                time.sleep(backoff)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(reader_clients)]
+    threads += [threading.Thread(target=login_storm, args=(i,)) for i in range(login_clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return percentiles(read_latencies), percentiles(login_latencies), dict(login_statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per phase")
+    parser.add_argument("--reader-clients", type=int, default=8)
+    parser.add_argument("--login-clients", type=int, default=48)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--hash-workers", type=int, default=None, help="override PASSWORD_HASH_WORKERS")
+    parser.add_argument("--hash-queue", type=int, default=None, help="override PASSWORD_HASH_MAX_QUEUE")
+    parser.add_argument("--backoff", type=float, default=0.0,
+                        help="seconds a storm client waits after a 503, as a client honouring Retry-After would (default: retry at once)")
+    args = parser.parse_args()
+
+    overrides = {"PRINCIPAL_CACHE_ENABLED": "false"}  # keep the wallet read doing real DB work
+    if args.hash_workers is not None:
+        overrides["PASSWORD_HASH_WORKERS"] = args.hash_workers
+    if args.hash_queue is not None:
+        overrides["PASSWORD_HASH_MAX_QUEUE"] = args.hash_queue
+    env = scratch_env(**overrides)
+    seed_users(env, args.users)
+
+    with serve(env) as base:
+        tokens = [login(base, f"bench{i}@example.com") for i in range(min(args.users, args.reader_clients))]
+
+        quiet, _, _ = run_phase(base, tokens, args.duration, args.reader_clients, 0)
+        storm, admitted, logins = run_phase(base, tokens, args.duration, args.reader_clients, args.login_clients, args.backoff)
+
+        print(f"wallet reads, no logins : {quiet}")
+        print(f"wallet reads, login storm: {storm}")
+        print(f"login responses by status: {logins}")
+        print(f"admitted logins (200)    : {admitted}")
+        if quiet.get("n") and storm.get("n"):
+            print(f"p99 ratio storm/quiet    : {storm['p99_ms'] / max(quiet['p99_ms'], 0.1):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# backend/scripts/bench_startup.py
+"""
+Startup benchmark: how long until a fresh worker is useful?
+
+Measures, each in fresh processes so nothing is warm:
+
+  * cold import  - `import app.main` in a new interpreter (median of --repeat runs),
+                   plus the heaviest imports from `python -X importtime` with --top;
+  * ready        - spawning uvicorn until the first 200 from GET /api/investments/packages,
+                   for each DB_SCHEMA_STARTUP mode;
+  * first login / first authenticated request - the first requests pay for whatever
+                   was deferred (passlib, jose, the hashing pool).
+
+The scratch SQLite database is created and stamped at the migration head so the
+"check" mode passes. Pass --url to measure against a real (already migrated) database,
+where create_all's per-table round trips are visible.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 10 --top 15
+    python scripts/bench_startup.py --url postgresql://... --modes check skip
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from benchlib import BACKEND_DIR, free_port, login, request, run_python, scratch_env, seed_users
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def cold_import(env, repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env,
+                             check=True, capture_output=True, text=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return samples
+
+
+def heaviest_imports(env, top):
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR,
+                         env=env, check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 2:
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def time_to_ready(env, email):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(base + "/api/investments/packages", timeout=1)
+                break
+            except Exception:
+                if server.poll() is not None:
+                    return {"error": f"uvicorn exited with {server.returncode}"}
+                if time.perf_counter() - started > 60:
+                    return {"error": "not ready after 60s"}
+                time.sleep(0.01)
+        ready = time.perf_counter() - started
+
+        t = time.perf_counter()
+        token = login(base, email)
+        first_login = time.perf_counter() - t
+        t = time.perf_counter()
+        status, _ = request(base + "/api/wallets/me", headers={"Authorization": "Bearer " + token})
+        first_authed = time.perf_counter() - t
+        t = time.perf_counter()
+        request(base + "/api/wallets/me", headers={"Authorization": "Bearer " + token})
+        second_authed = time.perf_counter() - t
+        return {
+            "ready_ms": round(ready * 1000, 1),
+            "first_login_ms": round(first_login * 1000, 1),
+            "first_authed_ms": round(first_authed * 1000, 1),
+            "second_authed_ms": round(second_authed * 1000, 1),
+            "status": status,
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: scratch SQLite file)")
+    parser.add_argument("--repeat", type=int, default=5, help="cold imports / server starts per measurement")
+    parser.add_argument("--top", type=int, default=0, help="also list the N heaviest imports")
+    parser.add_argument("--modes", nargs="+", default=["create_all", "check"], help="DB_SCHEMA_STARTUP modes to time")
+    args = parser.parse_args()
+
+    env = scratch_env(args.url)
+    email = "bench0@example.com"
+    if not args.url:
+        seed_users(env, 1)
+        subprocess.run([sys.executable, "-m", "alembic", "stamp", "head"], cwd=BACKEND_DIR, env=env,
+                       check=True, capture_output=True)
+    else:
+        run_python(
+            "from app.db.session import SessionLocal\n"
+            "from app.services import user_service\n"
+            f"assert user_service.get_user_by_email(SessionLocal(), {email!r}), 'seed {email} first'\n",
+            env,
+        )
+
+    samples = cold_import(env, args.repeat)
+    print(f"cold import app.main : median {statistics.median(samples) * 1000:.1f} ms, "
+          f"min {min(samples) * 1000:.1f} ms over {len(samples)} runs")
+    if args.top:
+        print("heaviest imports (cumulative / self ms):")
+        for cumulative_us, self_us, name in heaviest_imports(env, args.top):
+            print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+    for mode in args.modes:
+        runs = [time_to_ready(dict(env, DB_SCHEMA_STARTUP=mode), email) for _ in range(args.repeat)]
+        errors = [r["error"] for r in runs if "error" in r]
+        if errors:
+            print(f"[{mode}] failed: {errors[0]}")
+            continue
+        summary = {key: statistics.median(r[key] for r in runs) for key in runs[0] if key.endswith("_ms")}
+        print(f"[{mode}] median of {len(runs)}: " + ", ".join(f"{k} {v}" for k, v in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
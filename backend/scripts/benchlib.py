@@ -0,0 +1,180 @@
+# backend/scripts/benchlib.py
+# Shared helpers for the bench_*.py scripts: scratch environments, a uvicorn
+# subprocess, a tiny stdlib HTTP client and latency percentiles.
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PASSWORD = "bench-password"
+
+
+def scratch_env(database_url: str = None, **overrides) -> dict:
+    """Environment for a child process: a throwaway SQLite DB unless database_url is given."""
+    env = dict(os.environ)
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    else:
+        workdir = tempfile.mkdtemp(prefix="bench-")
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    env.setdefault("SECRET_KEY", "bench-secret")
+    # benches log many users in from 127.0.0.1; bench_auth_rate_limit turns this back on
+    env.setdefault("RATE_LIMIT_ENABLED", "false")
+    env.update({k: str(v) for k, v in overrides.items()})
+    return env
+
+
+def run_python(code: str, env: dict) -> None:
+    """Run a snippet inside backend/ so it imports the app with env's settings."""
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True)
+
+
+def seed_users(env: dict, users: int, transactions_per_user: int = 0) -> None:
+    """Create bench{i}@example.com users with active wallets, sharing one precomputed hash."""
+    run_python(
+        "from datetime import datetime, timedelta\n"
+        "from sqlalchemy import insert\n"
+        "from app.db.base import Base\n"
+        "from app.db.session import engine, SessionLocal\n"
+        "from app import models\n"
+        "from app.core.security import hash_password\n"
+        "Base.metadata.create_all(bind=engine)\n"
+        "db = SessionLocal()\n"
+        f"h = hash_password({PASSWORD!r})\n"
+        "now = datetime.utcnow()\n"
+        f"for i in range({users}):\n"
+        "    u = models.user.User(email=f'bench{i}@example.com', password_hash=h, role='user')\n"
+        "    db.add(u); db.flush()\n"
+        "    w = models.wallet.Wallet(user_id=u.id, balance=0, status='active')\n"
+        "    db.add(w); db.flush()\n"
+        f"    if {transactions_per_user}:\n"
+        "        db.execute(insert(models.wallet.Transaction.__table__), [\n"
+        "            dict(wallet_id=w.id, type='deposit', amount=10, status='approved', created_at=now - timedelta(minutes=j))\n"
+        f"            for j in range({transactions_per_user})])\n"
+        "db.commit()\n",
+        env,
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(env: dict, app: str = "app.main:app", app_dir: str = None, factory: bool = False, workers: int = 1):
+    """Run uvicorn in a subprocess and yield its base URL once it answers."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    cmd = [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"]
+    if app_dir:
+        cmd += ["--app-dir", app_dir]
+    if factory:
+        cmd.append("--factory")
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    server = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+    try:
+        for _ in range(150):
+            try:
+                urllib.request.urlopen(base + "/docs", timeout=1)
+                break
+            except Exception:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                time.sleep(0.2)
+        yield base
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def request(url, data=None, headers=None, form=False, method=None):
+    """Minimal HTTP client; returns (status, body bytes) and never raises on HTTP errors."""
+    body = None
+    headers = dict(headers or {})
+    if data is not None:
+        if form:
+            body = urllib.parse.urlencode(data).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        else:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+    req = urllib.request.Request(url, data=body, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class KeepAliveClient:
+    """One persistent HTTP/1.1 connection (per thread), like a browser or API client reusing its socket."""
+
+    def __init__(self, base: str, timeout: float = 60):
+        parsed = urllib.parse.urlsplit(base)
+        self.host, self.port, self.timeout = parsed.hostname, parsed.port, timeout
+        self.headers = {}
+        self._conn = None
+
+    def request(self, method: str, path: str, data=None, headers=None, form=False):
+        """Same contract as request(): (status, body bytes), never raises on HTTP errors."""
+        body = None
+        headers = dict(self.headers, **(headers or {}))
+        if data is not None:
+            if form:
+                body = urllib.parse.urlencode(data).encode()
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            else:
+                body = json.dumps(data).encode()
+                headers["Content-Type"] = "application/json"
+        for attempt in (0, 1):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                resp = self._conn.getresponse()
+                return resp.status, resp.read()
+            except (http.client.HTTPException, ConnectionError):
+                # server closed the idle connection; reconnect once
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def login(base: str, email: str, password: str = PASSWORD) -> str:
+    status, body = request(base + "/api/auth/token", {"username": email, "password": password}, form=True)
+    if status != 200:
+        raise RuntimeError(f"login failed for {email}: {status} {body[:200]!r}")
+    return json.loads(body)["access_token"]
+
+
+def percentiles(samples) -> dict:
+    if not samples:
+        return {"n": 0}
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {
+        "n": len(samples),
+        "p50_ms": round(pick(0.50) * 1000, 1),
+        "p95_ms": round(pick(0.95) * 1000, 1),
+        "p99_ms": round(pick(0.99) * 1000, 1),
+        "mean_ms": round(statistics.mean(samples) * 1000, 1),
+    }
@@ -0,0 +1,183 @@
+# backend/scripts/check_archive.py
+"""
+Transaction archival check.
+
+Generates a scratch SQLite dataset (two years of history), records what the
+history reads return, archives every settled transaction past the hot window
+and reads again. Passes when:
+
+  * wallet histories (whole and paged), every page of the admin feed (several
+    filters, both response paths) and the CSV export are identical before and
+    after, and a paged history concatenates to the whole one;
+  * each wallet's earnings total matches its whole history, before and after;
+  * the admin summary counters still match the source tables;
+  * pending transactions stayed hot;
+  * a first feed page served by the hot rows never touches the archive.
+
+Usage:
+    python scripts/check_archive.py
+    python scripts/check_archive.py --users 2000 --transactions 100000 --hot-days 30
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from benchlib import scratch_env
+
+os.environ.update(scratch_env())
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event, func
+from app import models
+from app.db.base import Base
+from app.db import session as db_session
+from app.db.session import SessionLocal, engine
+from app.services import archive_service, export_service, summary_service, wallet_service
+import generate_data
+
+
+def walk_feed(db, as_rows, **filters):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = wallet_service.list_transactions_page(db, limit=50, cursor=cursor, as_rows=as_rows, **filters)
+        pages.append([tuple(row.values()) if as_rows else (row.id, row.status, row.created_at) for row in rows])
+        if cursor is None:
+            return pages
+
+
+async def walk_wallet_pages(wallet_ids):
+    db_session.get_async_engine()
+    histories = []
+    async with db_session._async_sessionmaker() as db:
+        for wallet_id in wallet_ids:
+            rows, cursor = [], None
+            while True:
+                page, cursor = await wallet_service.list_wallet_transactions_page_async(db, wallet_id, limit=7, cursor=cursor)
+                rows.extend(tuple(row) for row in page)
+                if cursor is None:
+                    break
+            histories.append(rows)
+    await db_session.dispose_async_engine()
+    return histories
+
+
+async def wallet_earnings(wallet_ids):
+    db_session.get_async_engine()
+    async with db_session._async_sessionmaker() as db:
+        totals = [await wallet_service.wallet_earnings_total_async(db, wallet_id) for wallet_id in wallet_ids]
+    await db_session.dispose_async_engine()
+    return totals
+
+
+async def first_wallet_page(wallet_id):
+    async with db_session._async_sessionmaker() as db:
+        await wallet_service.list_wallet_transactions_page_async(db, wallet_id, limit=7)
+    await db_session.dispose_async_engine()
+
+
+def snapshot(db, wallet_ids, now):
+    feeds = [
+        {},
+        {"status": "approved"},
+        {"type": "deposit", "created_from": now - timedelta(days=400)},
+        {"wallet_id": wallet_ids[0]},
+        {"created_to": now - timedelta(days=200)},
+    ]
+    return {
+        "histories": [[tuple(row) for row in wallet_service.list_transactions(db, w)] for w in wallet_ids],
+        "paged histories": asyncio.run(walk_wallet_pages(wallet_ids)),
+        "earnings totals": asyncio.run(wallet_earnings(wallet_ids)),
+        "feeds": [walk_feed(db, as_rows, **filters) for filters in feeds for as_rows in (False, True)],
+        "export": "".join(export_service.stream_transactions("csv")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--hot-days", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    generate_data.generate(args.users, args.transactions, 0, report=lambda *a: None)
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=args.hot_days)
+
+    db = SessionLocal()
+    wallet_ids = [w for (w,) in db.query(models.wallet.Wallet.id).order_by(models.wallet.Wallet.id).limit(20)]
+    before = snapshot(db, wallet_ids, now)
+    failures = []
+    if before["paged histories"] != before["histories"]:
+        failures.append("paged wallet histories differ from the whole histories")
+    summed = [
+        sum((row.amount for row in wallet_service.list_transactions(db, w) if row.type == "earning" and row.status == "approved"), Decimal(0))
+        for w in wallet_ids
+    ]
+    if before["earnings totals"] != summed:
+        failures.append("earnings totals differ from the whole histories")
+
+    started = time.perf_counter()
+    moved = archive_service.archive_transactions(db, cutoff=cutoff, batch_size=args.batch_size)
+    print(f"archived {moved} of {args.transactions} transactions in {time.perf_counter() - started:.2f}s")
+    print(archive_service.archive_stats(db))
+
+    if not moved:
+        failures.append("nothing was archived")
+    Archive = models.wallet.TransactionArchive
+    if db.query(func.count()).select_from(Archive).filter(Archive.status == "pending").scalar():
+        failures.append("pending transactions were archived")
+    if db.query(func.count()).select_from(Archive).filter(Archive.created_at >= cutoff).scalar():
+        failures.append("transactions inside the hot window were archived")
+
+    after = snapshot(db, wallet_ids, now)
+    for key in before:
+        if before[key] != after[key]:
+            failures.append(f"{key} differ after archiving")
+    drift = summary_service.rebuild_summary(db)
+    db.rollback()
+    if drift:
+        failures.append(f"summary counters drifted: {sorted(drift)}")
+
+    statements = []
+    listener = lambda conn, cursor, statement, *rest: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    wallet_service.list_transactions_page(db, limit=50)
+    event.remove(engine, "before_cursor_execute", listener)
+    if any("FROM transactions_archive" in s and "max(" not in s for s in statements):
+        failures.append("first feed page queried the archive")
+
+    # a wallet whose first page is filled by hot rows newer than the horizon
+    horizon = wallet_service.archive_horizon(db)
+    Transaction = models.wallet.Transaction
+    busy = (
+        db.query(Transaction.wallet_id)
+        .filter(Transaction.created_at > horizon)
+        .group_by(Transaction.wallet_id)
+        .having(func.count() > 7)
+        .first()
+    )
+    if busy is not None:
+        statements.clear()
+        async_engine = db_session.get_async_engine().sync_engine
+        event.listen(async_engine, "before_cursor_execute", listener)
+        asyncio.run(first_wallet_page(busy.wallet_id))
+        event.remove(async_engine, "before_cursor_execute", listener)
+        if any("FROM transactions_archive" in s and "max(" not in s for s in statements):
+            failures.append("first wallet history page queried the archive")
+    db.close()
+
+    if failures:
+        print("FAIL")
+        for failure in failures:
+            print("  " + failure)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# backend/scripts/check_concurrent_approvals.py
+"""
+Concurrency harness for wallet_service.approve_transaction.
+
+Creates one wallet with a batch of pending deposits and withdrawals, then has
+a pool of threads approve them in parallel. Every transaction is submitted
+more than once, so the harness also exercises the double-approval guard. Each
+thread uses its own session, like separate API requests.
+
+A second round then tries to reject, pend and re-approve every approved
+transaction (approve -> pend -> approve used to credit a deposit twice); each
+attempt must be refused with TransactionAlreadyApproved. Bulk reject and bulk
+approve over the same ids must report every one as already_approved.
+Re-rejecting a rejected or re-pending a pending transaction is a no-op, and a
+status outside TRANSITIONS is refused with InvalidTransition, not as "already
+approved".
+
+Passes when the final balance equals the sum of the approved deltas, every
+transaction was approved exactly once and (on a scratch database) the admin
+summary counters still match a rebuild from the source tables.
+
+Usage:
+    python scripts/check_concurrent_approvals.py                  # scratch SQLite file
+    python scripts/check_concurrent_approvals.py --url <db-url>   # an already migrated database
+    python scripts/check_concurrent_approvals.py --transactions 2000 --threads 32 --repeat 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: scratch SQLite file)")
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=2, help="times each transaction is submitted")
+    args = parser.parse_args()
+
+    scratch = not args.url
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='approvals-'), 'check.db')}"
+    os.environ.setdefault("SECRET_KEY", "approval-check")
+    # settings are read at import time, so import the app only after DATABASE_URL is set
+    from app import models
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.services import summary_service, wallet_service
+
+    if scratch:
+        Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = models.user.User(email=f"approvals-{time.time_ns()}@example.com", password_hash="x", role="user")
+    db.add(user)
+    db.flush()
+    wallet = models.wallet.Wallet(user_id=user.id, balance=Decimal("1000000"), status="active")
+    db.add(wallet)
+    db.flush()
+    txns = [
+        models.wallet.Transaction(
+            wallet_id=wallet.id,
+            type="withdrawal" if i % 4 == 0 else "deposit",
+            amount=Decimal(i % 97 + 1),
+            status="pending",
+        )
+        for i in range(args.transactions)
+    ]
+    # outside the approval rounds: same-status no-ops and a status TRANSITIONS does not know
+    extras = {
+        status: models.wallet.Transaction(wallet_id=wallet.id, type="deposit", amount=Decimal(5), status=status)
+        for status in ("rejected", "pending", "failed")
+    }
+    db.add_all(txns + list(extras.values()))
+    db.commit()
+    if scratch:
+        # the rows above bypassed the service, so start the counters from their true totals
+        summary_service.rebuild_summary(db)
+        db.commit()
+    wallet_id, opening = wallet.id, Decimal(wallet.balance)
+    expected = opening + sum(wallet_service.balance_delta(t.type, t.amount) for t in txns)
+    txn_ids = [t.id for t in txns]
+    extra_ids = {status: t.id for status, t in extras.items()}
+    db.close()
+
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def change(txn_id, action=wallet_service.approve_transaction, done="approved", tally=outcomes):
+        session = SessionLocal()
+        try:
+            action(session, txn_id)
+            result = done
+        except wallet_service.TransactionAlreadyApproved:
+            result = "duplicate"
+        except Exception as e:
+            session.rollback()
+            result = f"error: {type(e).__name__}: {e}"
+        finally:
+            session.close()
+        with lock:
+            tally[result] += 1
+
+    work = [txn_id for txn_id in txn_ids for _ in range(args.repeat)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(change, work))
+    elapsed = time.perf_counter() - started
+
+    # approved transactions are final: none of these may move a balance
+    reversals = Counter()
+    steps = [
+        (wallet_service.pend_transaction, "pended"),
+        (wallet_service.approve_transaction, "approved"),
+        (wallet_service.reject_transaction, "rejected"),
+    ]
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        for action, done in steps:
+            list(pool.map(lambda txn_id: change(txn_id, action, done, reversals), txn_ids))
+    bulk = Counter()
+    for action in ("reject", "approve"):
+        session = SessionLocal()
+        results, _ = wallet_service.bulk_update_transactions(session, txn_ids, action)
+        session.close()
+        bulk.update(r["result"] for r in results)
+
+    same_status = []
+    session = SessionLocal()
+    for action, status in ((wallet_service.reject_transaction, "rejected"), (wallet_service.pend_transaction, "pending")):
+        same_status.append(action(session, extra_ids[status]).status == status)
+    try:
+        wallet_service.reject_transaction(session, extra_ids["failed"])
+        unknown = "accepted"
+    except wallet_service.TransactionAlreadyApproved:
+        unknown = "already approved"
+    except wallet_service.InvalidTransition as e:
+        unknown = str(e)
+    session.close()
+
+    db = SessionLocal()
+    final = Decimal(db.query(models.wallet.Wallet.balance).filter(models.wallet.Wallet.id == wallet_id).scalar())
+    approved_rows = db.query(models.wallet.Transaction).filter(
+        models.wallet.Transaction.wallet_id == wallet_id, models.wallet.Transaction.status == "approved"
+    ).count()
+    drift = summary_service.rebuild_summary(db) if scratch else {}
+    db.rollback()
+    db.close()
+
+    print(f"{len(work)} approvals over {args.threads} threads in {elapsed:.2f}s ({len(work) / elapsed:.0f}/s)")
+    print(f"outcomes      : {dict(outcomes)}")
+    print(f"un-approvals  : {dict(reversals)}, bulk {dict(bulk)}")
+    print(f"same status   : {'no-op' if all(same_status) else 'changed'}, unknown status: {unknown}")
+    print(f"summary drift : {sorted(drift) or 'none'}")
+    print(f"balance       : opening {opening}, expected {expected}, final {final}")
+    ok = (
+        final == expected
+        and approved_rows == len(txn_ids)
+        and outcomes["approved"] == len(txn_ids)
+        and outcomes["duplicate"] == len(work) - len(txn_ids)
+        and reversals == Counter({"duplicate": len(steps) * len(txn_ids)})
+        and bulk == Counter({"already_approved": 2 * len(txn_ids)})
+        and all(same_status)
+        and unknown == "Transaction cannot move from failed to rejected"
+        and not drift
+    )
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
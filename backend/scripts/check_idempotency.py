@@ -0,0 +1,172 @@
+# backend/scripts/check_idempotency.py
+"""
+Idempotency-Key check for the money-moving POST endpoints.
+
+Starts the API against a scratch SQLite database and fires a burst of
+identical requests that all carry the same Idempotency-Key, first at
+POST /api/wallets/me/transactions and then at POST /api/investments/me/invest.
+
+It also kills a worker after a deposit's writes but before its commit, then
+retries that key once the claim goes stale (IDEMPOTENCY_LOCK_SECONDS). Finally a
+worker that is only slow has its key taken over by a retry while it runs; it
+must drop its own writes and replay the retry's response.
+
+Passes when each burst produced exactly one row, every client got the same
+response body, the wallet was debited once for the investment, the killed
+request left nothing behind so its retry created exactly one deposit, the slow
+request and its retry created one deposit between them, and reusing a key with
+a different body is rejected with 422.
+
+Usage:
+    python scripts/check_idempotency.py
+    python scripts/check_idempotency.py --clients 32
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from benchlib import BACKEND_DIR, login, request, run_python, scratch_env, seed_users, serve
+
+LOCK_SECONDS = 2
+
+# One "worker" handling a keyed deposit that dies right after run() did its writes,
+# before anything is committed (exit code 3)
+CRASH = (
+    "import os\n"
+    "from app import models\n"
+    "from app.api.idempotency import idempotent\n"
+    "from app.db.session import SessionLocal\n"
+    "from app.schemas.wallet import TransactionCreate, TransactionOut\n"
+    "from app.services import idempotency_service, wallet_service\n"
+    "db = SessionLocal()\n"
+    "user = db.query(models.user.User).filter_by(email='bench0@example.com').one()\n"
+    "wallet = wallet_service.get_wallet_by_user(db, user.id)\n"
+    "payload = TransactionCreate(type='deposit', amount='30')\n"
+    "run = lambda: wallet_service.create_transaction(db, wallet.id, 'deposit', payload.amount, commit=False)\n"
+    "idempotency_service.complete = lambda *args, **kwargs: os._exit(3)\n"
+    "idempotent(db, user.id, 'crash-1', 'wallets.create_transaction', payload.dict(), run, TransactionOut)\n"
+)
+
+# A keyed deposit that claims its key, then stalls past LOCK_SECONDS before writing
+# (the retry takes the key over meanwhile) and prints whether it ended up replaying
+SLOW = (
+    "import time\n"
+    "from app import models\n"
+    "from app.api.idempotency import idempotent\n"
+    "from app.db.session import SessionLocal\n"
+    "from app.schemas.wallet import TransactionCreate, TransactionOut\n"
+    "from app.services import wallet_service\n"
+    "db = SessionLocal()\n"
+    "user = db.query(models.user.User).filter_by(email='bench0@example.com').one()\n"
+    "wallet_id = wallet_service.get_wallet_by_user(db, user.id).id\n"
+    "payload = TransactionCreate(type='deposit', amount='31')\n"
+    f"run = lambda: time.sleep({LOCK_SECONDS} + 2) or "
+    "wallet_service.create_transaction(db, wallet_id, 'deposit', payload.amount, commit=False)\n"
+    "response = idempotent(db, user.id, 'slow-1', 'wallets.create_transaction', payload.dict(), run, TransactionOut)\n"
+    "print('replayed' if response.headers.get('Idempotent-Replayed') else 'ran')\n"
+)
+
+
+def burst(url, body, headers, clients):
+    results, lock = [], threading.Lock()
+
+    def send():
+        r = request(url, body, headers=headers)
+        with lock:
+            results.append(r)
+
+    threads = [threading.Thread(target=send) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return Counter(status for status, _ in results), {body for _, body in results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    env = scratch_env(IDEMPOTENCY_LOCK_SECONDS=LOCK_SECONDS)
+    seed_users(env, 1)
+    run_python(
+        "from decimal import Decimal\n"
+        "from app import models\n"
+        "from app.db.session import SessionLocal\n"
+        "db = SessionLocal()\n"
+        "db.query(models.wallet.Wallet).update({'balance': 1000})\n"
+        "db.add(models.investment.InvestmentPackage(name='Check', min_amount=1, daily_return=Decimal('0.01'), duration_days=30))\n"
+        "db.commit()\n",
+        env,
+    )
+
+    failures = []
+    with serve(env) as base:
+        auth = {"Authorization": "Bearer " + login(base, "bench0@example.com")}
+        with_key = lambda key: dict(auth, **{"Idempotency-Key": key})
+
+        deposit = {"type": "deposit", "amount": "25"}
+        statuses, bodies = burst(base + "/api/wallets/me/transactions", deposit, with_key("deposit-1"), args.clients)
+        print(f"deposit burst : {dict(statuses)}, {len(bodies)} distinct bodies")
+        if statuses != Counter({200: args.clients}) or len(bodies) != 1:
+            failures.append("deposit burst did not collapse to one response")
+
+        invest = {"package_id": 1, "amount_invested": "100"}
+        statuses, bodies = burst(base + "/api/investments/me/invest", invest, with_key("invest-1"), args.clients)
+        print(f"invest burst  : {dict(statuses)}, {len(bodies)} distinct bodies")
+        if statuses != Counter({200: args.clients}) or len(bodies) != 1:
+            failures.append("investment burst did not collapse to one response")
+
+        status, _ = request(base + "/api/wallets/me/transactions", dict(deposit, amount="26"), headers=with_key("deposit-1"))
+        print(f"key reuse     : {status}")
+        if status != 422:
+            failures.append(f"reusing a key with a different body returned {status}, expected 422")
+
+        try:
+            run_python(CRASH, env)
+            failures.append("the crashing worker did not exit")
+        except subprocess.CalledProcessError as e:
+            if e.returncode != 3:
+                failures.append(f"the crashing worker failed with exit code {e.returncode}")
+        time.sleep(LOCK_SECONDS + 1)
+        status, _ = request(base + "/api/wallets/me/transactions", {"type": "deposit", "amount": "30"}, headers=with_key("crash-1"))
+        print(f"crash retry   : {status}")
+        if status != 200:
+            failures.append(f"retrying the crashed request returned {status}")
+
+        slow = subprocess.Popen([sys.executable, "-c", SLOW], cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True)
+        time.sleep(LOCK_SECONDS + 1)
+        status, _ = request(base + "/api/wallets/me/transactions", {"type": "deposit", "amount": "31"}, headers=with_key("slow-1"))
+        outcome = slow.communicate(timeout=60)[0].strip()
+        print(f"slow takeover : retry {status}, slow worker {outcome or slow.returncode}")
+        if status != 200 or outcome != "replayed":
+            failures.append("the slow request did not replay the retry's response")
+
+        _, body = request(base + "/api/wallets/me/transactions", headers=auth)
+        deposits = Counter(float(txn["amount"]) for txn in json.loads(body))
+        transactions = sum(deposits.values())
+        if deposits[30] != 1:
+            failures.append(f"the crashed and retried deposit exists {deposits[30]} times, expected once")
+        if deposits[31] != 1:
+            failures.append(f"the slow and retried deposit exists {deposits[31]} times, expected once")
+        _, body = request(base + "/api/investments/me/investments", headers=auth)
+        investments = len(json.loads(body))
+        _, body = request(base + "/api/wallets/me", headers=auth)
+        balance = float(json.loads(body)["balance"])
+        print(f"rows          : {transactions} transactions, {investments} investments, balance {balance}")
+        if transactions != 3 or investments != 1 or balance != 900:
+            failures.append("duplicate rows or a double debit")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    print("FAIL" if failures else "PASS")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# backend/scripts/check_maturity.py
+"""
+Maturity sweep check.
+
+Generates a scratch SQLite dataset, removes the wallets of a few users who hold
+active investments, then sweeps everything due up to --years from now. Passes
+when:
+
+  * every matured investment's principal landed in its owner's wallet and the
+    reported count and principal match the rows that were flipped;
+  * investments whose owner has no wallet stayed active and were reported as
+    skipped_without_wallet, and mature_investment refuses them;
+  * the admin summary counters (ACTIVE_INVESTMENTS count and amount, wallet
+    balance) still match a rebuild from the source tables;
+  * a second sweep finds nothing left to do.
+
+Usage:
+    python scripts/check_maturity.py
+    python scripts/check_maturity.py --users 2000 --investments 20000 --batch-size 500
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from benchlib import scratch_env
+
+os.environ.update(scratch_env())
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func
+from app import models
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.services import investment_service, summary_service
+import generate_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--investments", type=int, default=5000)
+    parser.add_argument("--walletless", type=int, default=5, help="users whose wallet is removed")
+    parser.add_argument("--years", type=int, default=10, help="sweep cut-off, years from now")
+    parser.add_argument("--batch-size", type=int, default=300)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    generate_data.generate(args.users, 0, args.investments, report=lambda *a: None)
+    UserInvestment, Wallet = models.investment.UserInvestment, models.wallet.Wallet
+
+    db = SessionLocal()
+    owners = [
+        user_id for (user_id,) in db.query(UserInvestment.user_id)
+        .filter(UserInvestment.status == "active")
+        .distinct().order_by(UserInvestment.user_id).limit(args.walletless)
+    ]
+    db.query(Wallet).filter(Wallet.user_id.in_(owners)).delete(synchronize_session=False)
+    summary_service.rebuild_summary(db)  # baseline, after the wallets are gone
+    db.commit()
+
+    as_of = datetime.utcnow() + timedelta(days=365 * args.years)
+    active = lambda: dict(
+        db.query(UserInvestment.user_id, func.count()).filter(UserInvestment.status == "active")
+        .group_by(UserInvestment.user_id).all()
+    )
+    due = db.query(UserInvestment.user_id, UserInvestment.amount_invested).filter(
+        UserInvestment.status == "active", UserInvestment.end_date <= as_of
+    ).all()
+    expected = {}
+    for user_id, amount in due:
+        expected[user_id] = expected.get(user_id, Decimal(0)) + Decimal(amount)
+    payable = {user_id: amount for user_id, amount in expected.items() if user_id not in owners}
+    stranded = sum(1 for user_id, _ in due if user_id in owners)
+    balances = lambda: {w.user_id: Decimal(w.balance or 0) for w in db.query(Wallet.user_id, Wallet.balance)}
+    before, active_before = balances(), active()
+
+    result = investment_service.sweep_matured_investments(db, as_of=as_of, batch_size=args.batch_size)
+    print({k: result[k] for k in ("matured", "principal_returned", "wallet_updates", "skipped_without_wallet", "batches")})
+
+    failures = []
+    after = balances()
+    credited = {user_id: after[user_id] - before[user_id] for user_id in after if after[user_id] != before[user_id]}
+    if credited != payable:
+        failures.append("wallet credits differ from the principal of the matured investments")
+    if result["matured"] != len(due) - stranded or result["principal_returned"] != sum(payable.values(), Decimal(0)):
+        failures.append("reported matured count / principal differ from the rows flipped")
+    if result["skipped_without_wallet"] != stranded or not stranded:
+        failures.append(f"expected {stranded} skipped wallet-less investments, got {result['skipped_without_wallet']}")
+    if {u: n for u, n in active().items() if u in owners} != {u: n for u, n in active_before.items() if u in owners}:
+        failures.append("investments of wallet-less users were matured")
+
+    stuck = db.query(UserInvestment.id).filter(
+        UserInvestment.user_id.in_(owners), UserInvestment.status == "active"
+    ).first()
+    try:
+        investment_service.mature_investment(db, stuck.id)
+        failures.append("mature_investment accepted an investment without a wallet")
+    except ValueError:
+        db.rollback()
+
+    drift = summary_service.rebuild_summary(db)
+    db.rollback()
+    if drift:
+        failures.append(f"summary counters drifted: {drift}")
+
+    again = investment_service.sweep_matured_investments(db, as_of=as_of, batch_size=args.batch_size)
+    if again["matured"] or again["batches"]:
+        failures.append("second sweep matured more investments")
+    db.close()
+
+    if failures:
+        print("FAIL")
+        for failure in failures:
+            print("  " + failure)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
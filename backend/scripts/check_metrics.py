@@ -0,0 +1,114 @@
+# backend/scripts/check_metrics.py
+"""
+/metrics check under several workers.
+
+Starts the API with --workers N and a shared METRICS_MULTIPROC_DIR, creates
+deposits and withdrawals, approves some and rejects others (single and bulk),
+opens an investment and logs in a few times. Then it scrapes /metrics
+repeatedly. Different workers answer the scrapes, so every scrape must show the
+totals from all the workers.
+
+Usage:
+    python scripts/check_metrics.py
+    python scripts/check_metrics.py --workers 4 --deposits 40
+"""
+import argparse
+import re
+import sys
+import tempfile
+from benchlib import login, request, run_python, scratch_env, seed_users, serve
+
+
+def scrape(base):
+    status, body = request(base + "/metrics", headers={"Authorization": "Bearer check-metrics"})
+    if status != 200:
+        raise RuntimeError(f"/metrics returned {status}")
+    samples = {}
+    for line in body.decode().splitlines():
+        match = re.match(r"^(\w+)(\{.*\})? (\S+)$", line)
+        if match:
+            samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--deposits", type=int, default=20)
+    parser.add_argument("--scrapes", type=int, default=6)
+    args = parser.parse_args()
+
+    env = scratch_env(METRICS_MULTIPROC_DIR=tempfile.mkdtemp(prefix="metrics-"), METRICS_BEARER_TOKEN="check-metrics")
+    seed_users(env, 2)
+    run_python(
+        "from decimal import Decimal\n"
+        "from app import models\n"
+        "from app.db.session import SessionLocal\n"
+        "db = SessionLocal()\n"
+        "db.query(models.user.User).filter_by(email='bench1@example.com').update({'role': 'admin'})\n"
+        "db.query(models.wallet.Wallet).update({'balance': 1000})\n"
+        "db.add(models.investment.InvestmentPackage(name='Check', min_amount=1, daily_return=Decimal('0.01'), duration_days=30))\n"
+        "db.commit()\n",
+        env,
+    )
+
+    failures, scrape_checks = [], []
+    expect = lambda key, value: scrape_checks.append((key, value))
+    with serve(env, workers=args.workers) as base:
+        status, _ = request(base + "/metrics")
+        if status != 401:
+            failures.append(f"/metrics without the bearer token returned {status}, expected 401")
+
+        user = {"Authorization": "Bearer " + login(base, "bench0@example.com")}
+        admin = {"Authorization": "Bearer " + login(base, "bench1@example.com")}
+        logins = 2
+
+        ids = []
+        for i in range(args.deposits):
+            kind = "deposit" if i % 2 == 0 else "withdrawal"
+            status, body = request(base + "/api/wallets/me/transactions", {"type": kind, "amount": "5"}, headers=user)
+            if status != 200:
+                failures.append(f"creating a {kind} returned {status}")
+            ids.append(int(re.search(rb'"id":\s*(\d+)', body).group(1)))
+        deposits = len(range(0, args.deposits, 2))
+
+        half = args.deposits // 2
+        for txn_id in ids[:half]:
+            request(base + f"/api/admin/transactions/{txn_id}/approve", {}, headers=admin)
+        request(base + "/api/admin/transactions/bulk", {"ids": ids[half:], "action": "reject"}, headers=admin)
+        approved_deposits = len(range(0, half, 2))
+        rejected_deposits = deposits - approved_deposits
+
+        status, _ = request(base + "/api/investments/me/invest", {"package_id": 1, "amount_invested": "10"}, headers=user)
+        if status != 200:
+            failures.append(f"investing returned {status}")
+
+        expect('transactions_created_total{type="deposit"}', deposits)
+        expect('transactions_created_total{type="withdrawal"}', args.deposits - deposits)
+        expect('transaction_status_changes_total{status="approved",type="deposit"}', approved_deposits)
+        expect('transaction_status_changes_total{status="rejected",type="deposit"}', rejected_deposits)
+        expect("investments_created_total", 1)
+        expect("password_verify_seconds_count", logins)
+        expect('http_requests_total{method="POST",route="/api/wallets/me/transactions",status="200"}', args.deposits)
+        expect('http_requests_total{method="POST",route="/api/admin/transactions/{txn_id}/approve",status="200"}', half)
+
+        for n in range(args.scrapes):
+            samples = scrape(base)
+            for key, value in scrape_checks:
+                got = samples.get(key)
+                if got != value:
+                    failures.append(f"scrape {n}: {key} = {got}, expected {value}")
+        print(f"{args.scrapes} scrapes across {args.workers} workers, {len(scrape_checks)} series checked each")
+        for key, value in scrape_checks:
+            print(f"  {key} = {value}")
+
+    if failures:
+        print("FAIL")
+        for failure in failures[:20]:
+            print("  " + failure)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
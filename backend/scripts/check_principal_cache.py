@@ -0,0 +1,83 @@
+# backend/scripts/check_principal_cache.py
+"""
+Cross-worker principal cache invalidation check.
+
+Serves the API with two uvicorn workers, warms both workers' principal caches
+with an admin's token, then changes that user from a separate process, the way
+an admin tool or a migration would:
+
+  * demote with a bulk query().update()   -> admin endpoints must return 403
+  * promote with a text() UPDATE          -> 200 again
+  * delete the row through the ORM        -> 401
+
+Passes when, CACHE_VERSION_CHECK_SECONDS after each change, every request
+(spread over both workers) sees it, although PRINCIPAL_CACHE_TTL_SECONDS is far
+longer.
+
+Usage:
+    python scripts/check_principal_cache.py
+    python scripts/check_principal_cache.py --requests 100 --check-seconds 2
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from benchlib import login, request, run_python, scratch_env, seed_users, serve
+
+SETUP = (
+    "from app import models\n"
+    "from app.db.session import SessionLocal\n"
+    "from sqlalchemy import text\n"
+    "db = SessionLocal()\n"
+    "User = models.user.User\n"
+)
+CHANGES = [
+    ("bulk demote", "db.query(User).filter(User.email == 'bench0@example.com').update({'role': 'user'})\n", 403),
+    ("text promote", "db.execute(text(\"UPDATE users SET role = 'admin' WHERE email = 'bench0@example.com'\"))\n", 200),
+    ("orm delete",
+     "user = db.query(User).filter(User.email == 'bench0@example.com').one()\n"
+     "for model in (models.wallet.Wallet, models.wallet.UserProfile):\n"
+     "    db.query(model).filter(model.user_id == user.id).delete()\n"
+     "db.delete(user)\n", 401),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40, help="admin requests per round")
+    parser.add_argument("--check-seconds", type=float, default=1.0, help="CACHE_VERSION_CHECK_SECONDS")
+    args = parser.parse_args()
+
+    env = scratch_env(CACHE_VERSION_CHECK_SECONDS=args.check_seconds, PRINCIPAL_CACHE_TTL_SECONDS=3600)
+    seed_users(env, 1)
+    run_python(SETUP + "db.query(User).update({'role': 'admin'})\ndb.commit()\n", env)
+
+    failures = []
+    with serve(env, workers=2) as base:
+        headers = {"Authorization": "Bearer " + login(base, "bench0@example.com")}
+        probe = lambda: Counter(
+            request(base + "/api/admin/internal/principal-cache", headers=headers)[0] for _ in range(args.requests)
+        )
+        warm = probe()
+        print(f"warm          : {dict(warm)}")
+        if warm != Counter({200: args.requests}):
+            failures.append("admin token was not accepted before any change")
+
+        for name, statement, expected in CHANGES:
+            run_python(SETUP + statement + "db.commit()\n", env)
+            time.sleep(args.check_seconds + 0.5)
+            seen = probe()
+            print(f"{name:<14}: {dict(seen)}")
+            if seen != Counter({expected: args.requests}):
+                failures.append(f"after {name} expected only {expected}, got {dict(seen)}")
+
+    if failures:
+        print("FAIL")
+        for failure in failures:
+            print("  " + failure)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
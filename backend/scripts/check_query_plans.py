@@ -0,0 +1,147 @@
+# backend/scripts/check_query_plans.py
+"""
+Check that the hot service queries are served by the indexes added in
+migrations 9c41d7a2b6e3 and d41f6c8e2a17 (see __table_args__ on Transaction /
+UserInvestment / User).
+
+Each check calls the real service / endpoint function, captures the SQL it
+emits, and runs EXPLAIN on it. A check fails if none of the expected indexes
+shows up in the plan, or if an ordered query still needs a separate sort step.
+
+Usage:
+    python scripts/check_query_plans.py                 # scratch in-memory SQLite, model schema
+    python scripts/check_query_plans.py --url <db-url>  # an already migrated database
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# only needed so app settings can load when run outside the app environment
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "query-plan-check")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from app.api import admin as admin_api
+from app.core.pagination import encode_cursor
+from app.db.base import Base
+from app.services import wallet_service, investment_service, user_service
+
+TXN_WALLET = {"ix_transactions_wallet_id_created_at"}
+TXN_FEED = {"ix_transactions_created_at_id"}
+TXN_STATUS = {"ix_transactions_status_created_at", "ix_transactions_pending_created_at"}
+INV_USER = {"ix_user_investments_user_id"}
+INV_DUE = {"ix_user_investments_status_end_date"}
+USER_FEED = {"ix_users_created_at_id"}
+USER_ROLE = {"ix_users_role_created_at"}
+USER_EMAIL = {"ix_users_email"}
+
+CURSOR = encode_cursor(datetime(2030, 1, 1), 10**9)
+EMAIL_CURSOR = encode_cursor("m@example.com", 10**9)
+
+
+def admin_feed(**filters):
+    # call the endpoint function directly; every Query() param must be passed explicitly
+    params = dict(limit=50, cursor=None, status=None, type=None, wallet_id=None,
+                  user_id=None, created_from=None, created_to=None)
+    params.update(filters)
+    return lambda db: admin_api.list_all_transactions(db=db, admin_user=None, **params)
+
+
+# (label, table the checked SELECT reads, call, expected indexes, query has ORDER BY)
+CHECKS = [
+    ("wallet_service.list_transactions", "transactions",
+        lambda db: wallet_service.list_transactions(db, 1), TXN_WALLET, True),
+    ("wallet_service.list_transactions_page", "transactions",
+        lambda db: wallet_service.list_transactions_page(db), TXN_FEED, True),
+    ("wallet_service.list_transactions_page(cursor)", "transactions",
+        lambda db: wallet_service.list_transactions_page(db, cursor=CURSOR), TXN_FEED, True),
+    ("wallet_service.list_transactions_page(wallet_id)", "transactions",
+        lambda db: wallet_service.list_transactions_page(db, wallet_id=1), TXN_WALLET, True),
+    ("wallet_service.list_transactions_page(user_id)", "transactions",
+        lambda db: wallet_service.list_transactions_page(db, user_id=1), TXN_WALLET, True),
+    ("wallet_service.list_transactions_page(status=approved)", "transactions",
+        lambda db: wallet_service.list_transactions_page(db, status="approved"), TXN_STATUS, True),
+    ("admin.list_all_transactions(status=pending)", "transactions",
+        admin_feed(status="pending"), TXN_STATUS, True),
+    ("admin.list_all_transactions(status=pending, cursor)", "transactions",
+        admin_feed(status="pending", cursor=CURSOR), TXN_STATUS, True),
+    ("investment_service.list_user_investments", "user_investments",
+        lambda db: investment_service.list_user_investments(db, 1), INV_USER, False),
+    ("investment_service.select_due_investments", "user_investments",
+        lambda db: investment_service.select_due_investments(db, datetime.utcnow(), 1000), INV_DUE, True),
+    ("user_service.list_users_page", "users",
+        lambda db: user_service.list_users_page(db), USER_FEED, True),
+    ("user_service.list_users_page(cursor)", "users",
+        lambda db: user_service.list_users_page(db, cursor=CURSOR), USER_FEED, True),
+    ("user_service.list_users_page(role)", "users",
+        lambda db: user_service.list_users_page(db, role="user", cursor=CURSOR), USER_ROLE, True),
+    ("user_service.list_users_page(wallet_status)", "users",
+        lambda db: user_service.list_users_page(db, wallet_status="frozen"), USER_FEED, True),
+    ("user_service.list_users_page(sort=email, asc)", "users",
+        lambda db: user_service.list_users_page(db, sort="email", order="asc", cursor=EMAIL_CURSOR), USER_EMAIL, True),
+]
+
+
+def explain(conn, statement, parameters):
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        plan = "\n".join(str(r[-1]) for r in rows)
+        return plan, "TEMP B-TREE" in plan
+    rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+    plan = "\n".join(r[0] for r in rows)
+    sorted_ = any(line.strip().lstrip("-> ").startswith("Sort") for line in plan.splitlines())
+    return plan, sorted_
+
+
+def run(url: str) -> int:
+    engine = create_engine(url)
+    if url == "sqlite://":
+        # scratch database: build the schema straight from the models
+        Base.metadata.create_all(bind=engine)
+
+    failures = 0
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # empty or tiny tables would otherwise always get a seq scan
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        captured = []
+
+        def capture(conn_, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        for label, table, call, expected, ordered in CHECKS:
+            captured.clear()
+            event.listen(conn, "before_cursor_execute", capture)
+            try:
+                with Session(bind=conn) as db:
+                    call(db)
+            finally:
+                event.remove(conn, "before_cursor_execute", capture)
+
+            selects = [(s, p) for s, p in captured if s.lstrip().upper().startswith("SELECT") and table in s]
+            if not selects:
+                print(f"FAIL  {label}: no SELECT on {table} captured")
+                failures += 1
+                continue
+            statement, parameters = selects[0]
+            plan, needs_sort = explain(conn, statement, parameters)
+            used = sorted(name for name in expected if name in plan)
+            ok = bool(used) and not (ordered and needs_sort)
+            print(f"{'ok  ' if ok else 'FAIL'}  {label}: {', '.join(used) or 'no expected index'}"
+                  f"{' + separate sort' if ordered and needs_sort else ''}")
+            if not ok:
+                failures += 1
+                print("      " + plan.replace("\n", "\n      "))
+
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} query plans use their indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://", help="database URL to EXPLAIN against (default: scratch SQLite)")
+    args = parser.parse_args()
+    sys.exit(run(args.url))
@@ -0,0 +1,402 @@
+# backend/scripts/generate_data.py
+"""
+Synthetic data generator for scale testing.
+
+Creates users (with profiles and wallets), transactions and investments with
+skewed, production-like distributions:
+
+  * sign-ups grow over --days, so recent months have more users;
+  * wallet balances and amounts are log-normal, a few wallets carry most of the
+    transactions, and pending transactions are mostly recent;
+  * investments start after the owner signed up and are active, matured or
+    cancelled depending on their package's duration.
+
+Rows are streamed in batches straight to the driver: COPY FROM STDIN on Postgres,
+executemany with prepared tuples on SQLite (and other databases), never ORM
+add/commit. One bcrypt hash is computed up front and shared by every user.
+New ids start after the current maximum, so the tool can top up an existing
+database. Admin summary counters are rebuilt at the end.
+
+Usage:
+    python scripts/generate_data.py --users 100000 --transactions 1000000
+    python scripts/generate_data.py --url postgresql://... --users 1m --transactions 10m --investments 250k
+    python scripts/generate_data.py --users 10k --create-tables --email-prefix load   # scratch SQLite via DATABASE_URL
+"""
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import os
+import random
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import DateTime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+DEFAULT_PASSWORD = "bench-password"
+DEFAULT_BATCH_SIZE = 20000
+
+FIRST_NAMES = ("Ada", "Kwame", "Amara", "Chinedu", "Fatima", "John", "Mary", "Emeka", "Aisha", "David",
+               "Grace", "Tunde", "Ngozi", "Samuel", "Zainab", "Michael", "Esther", "Ibrahim", "Sarah", "Yusuf")
+LAST_NAMES = ("Okafor", "Mensah", "Adeyemi", "Smith", "Bello", "Johnson", "Eze", "Owusu", "Abubakar", "Brown",
+              "Nwosu", "Williams", "Balogun", "Boateng", "Mohammed", "Taylor", "Okeke", "Asante", "Lawal", "Davies")
+# (country, weight, cities)
+COUNTRIES = (
+    ("Nigeria", 45, ("Lagos", "Abuja", "Port Harcourt", "Ibadan", "Kano")),
+    ("Ghana", 20, ("Accra", "Kumasi", "Tamale")),
+    ("Kenya", 10, ("Nairobi", "Mombasa")),
+    ("United Kingdom", 10, ("London", "Manchester", "Birmingham")),
+    ("United States", 10, ("New York", "Houston", "Atlanta")),
+    ("South Africa", 5, ("Johannesburg", "Cape Town")),
+)
+DEFAULT_PACKAGES = (("Starter", "10", "0.005", 30), ("Growth", "100", "0.008", 90), ("Premium", "1000", "0.012", 180))
+
+
+def parse_count(value: str) -> int:
+    value = value.strip().lower()
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * factor)
+    return int(value)
+
+
+def money(value: float) -> float:
+    return round(value, 2)
+
+
+def picker(rng, values, weights):
+    """rng.choices(values, weights)[0] without rebuilding the cumulative weights on every call."""
+    cumulative = list(itertools.accumulate(weights))
+    total = cumulative[-1]
+    return lambda: values[bisect.bisect(cumulative, rng.random() * total)]
+
+
+# ---------------- Writers ----------------
+class BulkWriter:
+    """Streams row tuples into one table in batches, using the fastest path the driver offers."""
+
+    def __init__(self, connection, table, columns, batch_size):
+        self.connection = connection
+        self.dialect = connection.dialect
+        self.table = table
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.rows = 0
+        if self.dialect.name == "postgresql" and self.dialect.driver == "psycopg2":
+            self._flush = self._copy
+        else:
+            # the driver's executemany, with SQLAlchemy's own bind conversions (datetimes on SQLite, ...)
+            self._sql = "INSERT INTO {} ({}) VALUES ({})".format(
+                table.name, ", ".join(self.columns), ", ".join([self._placeholder()] * len(self.columns))
+            )
+            self._processors = [self._processor(table.c[name].type) for name in self.columns]
+            self._flush = self._executemany
+
+    def _processor(self, type_):
+        if self.dialect.name == "sqlite" and isinstance(type_, DateTime):
+            # same text SQLAlchemy stores, formatted in C rather than by its Python processor
+            return lambda value: value.isoformat(" ", "microseconds")
+        return type_.dialect_impl(self.dialect).bind_processor(self.dialect)
+
+    def _placeholder(self):
+        return {"qmark": "?", "format": "%s", "pyformat": "%s", "numeric": ":1"}.get(self.dialect.paramstyle, "?")
+
+    def _copy(self, batch):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in batch:
+            writer.writerow(["" if v is None else v for v in row])
+        buf.seek(0)
+        cursor = self.connection.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {self.table.name} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv)", buf
+        )
+
+    def _executemany(self, batch):
+        processors = [(i, p) for i, p in enumerate(self._processors) if p is not None]
+        if processors:
+            converted = []
+            for row in batch:
+                row = list(row)
+                for i, process in processors:
+                    if row[i] is not None:
+                        row[i] = process(row[i])
+                converted.append(row)
+            batch = converted
+        cursor = self.connection.connection.cursor()
+        cursor.executemany(self._sql, batch)
+
+    def write(self, rows) -> int:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                self.rows += len(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+            self.rows += len(batch)
+        return self.rows
+
+
+# ---------------- Generators ----------------
+class Generator:
+    def __init__(self, connection, rng, batch_size, now=None, days=730):
+        self.connection = connection
+        self.rng = rng
+        self.batch_size = batch_size
+        self.now = now or datetime.utcnow()
+        self.span = days * 86400
+        # per generated user: seconds between sign-up and now, and whether the wallet can transact
+        self.user_age = array("d")
+        self.wallet_active = bytearray()
+        self.first_user_id = self.first_wallet_id = None
+
+    def _next_id(self, table):
+        from sqlalchemy import func, select
+        return (self.connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+    def writer(self, table, columns):
+        return BulkWriter(self.connection, table, columns, self.batch_size)
+
+    def users(self, count, email_prefix, password_hash):
+        from app import models
+        users = models.user.User.__table__
+        profiles = models.wallet.UserProfile.__table__
+        wallets = models.wallet.Wallet.__table__
+        rng, now = self.rng, self.now
+        first_user, first_profile, first_wallet = self._next_id(users), self._next_id(profiles), self._next_id(wallets)
+        self.first_user_id, self.first_wallet_id = first_user, first_wallet
+
+        country_of = picker(rng, COUNTRIES, [c[1] for c in COUNTRIES])
+        verification_of = picker(rng, (0, 1, 2), (60, 30, 10))
+        # squaring skews ages towards zero: sign-ups accelerate over time
+        self.user_age.extend(self.span * rng.random() ** 2 for _ in range(count))
+        statuses = rng.choices(("active", "not_activated", "frozen", "disabled"), (85, 10, 4, 1), k=count)
+        self.wallet_active = bytearray(s == "active" for s in statuses)
+        if not any(self.wallet_active):
+            self.wallet_active = bytearray([1]) * count
+
+        self.writer(users, ("id", "email", "password_hash", "role", "verification_level", "created_at", "updated_at")).write(
+            (first_user + n, f"{email_prefix}{first_user - 1 + n}@example.com", password_hash, "user",
+             verification_of(), now - timedelta(seconds=self.user_age[n]), now)
+            for n in range(count)
+        )
+
+        def profile(n):
+            country, _, cities = country_of()
+            created = now - timedelta(seconds=self.user_age[n])
+            complete = rng.random() < 0.6
+            return (
+                first_profile + n, first_user + n,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                f"+{rng.randrange(10**10, 10**11)}" if rng.random() < 0.8 else None,
+                f"{rng.randrange(1950, 2005)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}" if complete else None,
+                country if complete else None,
+                rng.choice(cities) if complete else None,
+                country if complete else None,
+                created, created,
+            )
+
+        self.writer(profiles, ("id", "user_id", "full_name", "phone_number", "dob", "nationality", "city", "country",
+                               "created_at", "updated_at")).write(profile(n) for n in range(count))
+
+        self.writer(wallets, ("id", "user_id", "balance", "currency", "status", "allow_deposits", "allow_withdrawals",
+                              "allow_purchases", "created_at", "updated_at")).write(
+            (first_wallet + n, first_user + n,
+             money(min(rng.lognormvariate(5, 1.6), 1_000_000)) if statuses[n] == "active" else 0.0,
+             "USD", statuses[n], True, rng.random() > 0.02, rng.random() > 0.02,
+             now - timedelta(seconds=self.user_age[n]), now)
+            for n in range(count)
+        )
+
+    @contextmanager
+    def deferred_indexes(self, table, empty: bool):
+        """
+        On an empty table, drop the secondary indexes for the load and build them once at the end:
+        a sorted index build is far cheaper than millions of random B-tree inserts.
+        Existing data keeps its indexes untouched.
+        """
+        indexes = [index for index in table.indexes if empty]
+        for index in indexes:
+            index.drop(self.connection)
+        yield
+        for index in indexes:
+            index.create(self.connection)
+
+    def _owner(self):
+        """Index of a generated user, skewed so a few wallets carry most of the activity."""
+        count = len(self.user_age)
+        while True:
+            n = int(count * self.rng.random() ** 3)
+            if self.wallet_active[n]:
+                return n
+
+    def transactions(self, count):
+        from app import models
+        transactions = models.wallet.Transaction.__table__
+        rng, now = self.rng, self.now
+        first = self._next_id(transactions)
+        kind_of = picker(rng, ("deposit", "withdrawal", "purchase", "earning"), (55, 20, 15, 10))
+        recent_status = picker(rng, ("approved", "pending", "rejected"), (85, 8, 7))
+        # anything older than two weeks has been reviewed
+        reviewed_status = picker(rng, ("approved", "rejected"), (92, 8))
+        # (mu, sigma) of the log-normal amount per type
+        amounts = {"deposit": (5.5, 1.2), "withdrawal": (5.0, 1.2), "purchase": (5.0, 1.0), "earning": (1.5, 1.0)}
+
+        def row(i):
+            n = self._owner()
+            kind = kind_of()
+            age = self.user_age[n] * rng.random()
+            if kind == "deposit" or kind == "withdrawal":
+                status = recent_status() if age < 14 * 86400 else reviewed_status()
+            else:
+                status = "approved"
+            mu, sigma = amounts[kind]
+            return (
+                first + i, self.first_wallet_id + n, kind, money(max(rng.lognormvariate(mu, sigma), 1)), status,
+                f"{kind[:3].upper()}-{first + i:08d}" if kind != "earning" else None, None,
+                now - timedelta(seconds=age),
+            )
+
+        with self.deferred_indexes(transactions, empty=first == 1):
+            return self.writer(transactions, ("id", "wallet_id", "type", "amount", "status", "reference", "note",
+                                              "created_at")).write(row(i) for i in range(count))
+
+    def packages(self):
+        """Active packages as (id, min_amount, daily_return, duration_days); creates the defaults if there are none."""
+        from sqlalchemy import insert, select
+        from app import models
+        packages = models.investment.InvestmentPackage.__table__
+        query = select(packages.c.id, packages.c.min_amount, packages.c.daily_return, packages.c.duration_days) \
+            .where(packages.c.is_active.is_(True))
+        rows = self.connection.execute(query).all()
+        if not rows:
+            self.connection.execute(insert(packages), [
+                {"name": name, "min_amount": Decimal(minimum), "daily_return": Decimal(rate),
+                 "duration_days": days, "is_active": True, "created_at": self.now}
+                for name, minimum, rate, days in DEFAULT_PACKAGES
+            ])
+            rows = self.connection.execute(query).all()
+        return [(pid, float(minimum), float(rate), days) for pid, minimum, rate, days in rows]
+
+    def investments(self, count):
+        from app import models
+        investments = models.investment.UserInvestment.__table__
+        rng, now = self.rng, self.now
+        packages = self.packages()
+        first = self._next_id(investments)
+
+        def row(i):
+            n = self._owner()
+            pid, minimum, rate, days = rng.choice(packages)
+            amount = money(minimum * (1 + rng.lognormvariate(0.5, 1.0)))
+            start = now - timedelta(seconds=self.user_age[n] * rng.random())
+            end = start + timedelta(days=days)
+            if rng.random() < 0.02:
+                status = "cancelled"
+            else:
+                status = "matured" if end <= now else "active"
+            accrued_days = min(days, max((now - start).days, 0))
+            return (first + i, self.first_user_id + n, pid, amount, start, end, status,
+                    round(amount * rate * accrued_days, 6))
+
+        return self.writer(investments, ("id", "user_id", "package_id", "amount_invested", "start_date", "end_date",
+                                         "status", "total_earnings")).write(row(i) for i in range(count))
+
+    def fix_sequences(self):
+        """COPY / explicit ids don't advance Postgres sequences; move them past the new rows."""
+        if self.connection.dialect.name != "postgresql":
+            return
+        from sqlalchemy import text
+        for table in ("users", "user_profiles", "wallets", "transactions", "user_investments", "investment_packages"):
+            self.connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            ))
+
+
+def generate(users, transactions, investments, seed=1, batch_size=DEFAULT_BATCH_SIZE,
+             email_prefix="user", password=DEFAULT_PASSWORD, report=print):
+    """Generate the dataset in one database transaction. Returns {table: rows} plus timings."""
+    from sqlalchemy import text
+    from app.core.security import hash_password
+    from app.db.session import SessionLocal
+    from app.services import summary_service
+
+    started = time.perf_counter()
+    password_hash = hash_password(password)
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "sqlite":
+            # the default 2MB page cache thrashes once the transaction indexes outgrow it
+            db.execute(text("PRAGMA cache_size = -262144"))
+        gen = Generator(db.connection(), random.Random(seed), batch_size)
+        counts, timings = {}, {}
+
+        def step(name, fn, *args):
+            t = time.perf_counter()
+            counts[name] = fn(*args)
+            timings[name] = round(time.perf_counter() - t, 2)
+            report(f"{name:<13} {timings[name]:>7.2f}s")
+
+        step("users", gen.users, users, email_prefix, password_hash)
+        counts.update(users=users, user_profiles=users, wallets=users)
+        if users:
+            step("transactions", gen.transactions, transactions)
+            step("investments", gen.investments, investments)
+        gen.fix_sequences()
+        step("summary", summary_service.rebuild_summary, db)
+        counts.pop("summary", None)
+        t = time.perf_counter()
+        db.commit()
+        timings["commit"] = round(time.perf_counter() - t, 2)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    timings["total"] = round(time.perf_counter() - started, 2)
+    return {"rows": counts, "seconds": timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: DATABASE_URL)")
+    parser.add_argument("--users", type=parse_count, default=parse_count("10k"))
+    parser.add_argument("--transactions", type=parse_count, default=None, help="default: 10 per user")
+    parser.add_argument("--investments", type=parse_count, default=None, help="default: 1 per 4 users")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--email-prefix", default="user", help="users are <prefix><id - 1>@example.com")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="shared by every generated user")
+    parser.add_argument("--create-tables", action="store_true", help="create missing tables first (scratch databases)")
+    args = parser.parse_args()
+
+    if args.url:
+        os.environ["DATABASE_URL"] = args.url
+    # settings are read at import time, so import the app only after DATABASE_URL is set
+    if args.create_tables:
+        from app.db.base import Base
+        from app.db.session import engine
+        from app import models  # noqa: F401
+        Base.metadata.create_all(bind=engine)
+
+    transactions = args.transactions if args.transactions is not None else args.users * 10
+    investments = args.investments if args.investments is not None else args.users // 4
+    result = generate(args.users, transactions, investments, args.seed, args.batch_size,
+                      args.email_prefix, args.password)
+    rows = result["rows"]
+    total = result["seconds"]["total"]
+    print(f"generated {rows} in {total}s "
+          f"({sum(v for v in rows.values() if v) / max(total, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# backend/scripts/mature_investments.py
+# Mature every active investment whose end_date has passed and return the principal to wallets.
+#   python scripts/mature_investments.py
+#   python scripts/mature_investments.py --as-of 2026-10-01T00:00:00 --batch-size 5000
+import argparse
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.db.session import SessionLocal
+from app.services import investment_service
+
+def run():
+    parser = argparse.ArgumentParser(description="Mature investments past their end date")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="cut-off timestamp (default: now, UTC)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        r = investment_service.sweep_matured_investments(db, as_of=args.as_of, batch_size=args.batch_size)
+        print(
+            f"matured {r['matured']} investments, returned {r['principal_returned']} "
+            f"over {r['wallet_updates']} wallet updates in {r['batches']} batches, "
+            f"{r['seconds']}s ({r['per_second']}/s)"
+        )
+        if r["skipped_without_wallet"]:
+            print(f"skipped {r['skipped_without_wallet']} due investments whose owner has no wallet")
+    except Exception as e:
+        db.rollback()
+        print("Error:", e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
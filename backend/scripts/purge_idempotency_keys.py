@@ -0,0 +1,29 @@
+# backend/scripts/purge_idempotency_keys.py
+# Delete idempotency keys past their expiry. Run from cron, e.g. hourly.
+#   python scripts/purge_idempotency_keys.py
+#   python scripts/purge_idempotency_keys.py --batch-size 20000
+import argparse
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.db.session import SessionLocal
+from app.services import idempotency_service
+
+def run():
+    parser = argparse.ArgumentParser(description="Purge expired idempotency keys")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = idempotency_service.purge_expired(db, batch_size=args.batch_size)
+        print(f"purged {deleted} expired idempotency keys")
+    except Exception as e:
+        db.rollback()
+        print("Error:", e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
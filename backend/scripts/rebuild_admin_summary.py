@@ -0,0 +1,40 @@
+# backend/scripts/rebuild_admin_summary.py
+# Recompute the /api/admin/summary counters from the source tables.
+# Run once after migrating to e8a3b5c70d94, and whenever the counters are suspected to have drifted.
+#   python scripts/rebuild_admin_summary.py            # rebuild and report drift
+#   python scripts/rebuild_admin_summary.py --check    # report drift only, change nothing
+import argparse
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.db.session import SessionLocal
+from app.services import summary_service
+
+def run():
+    parser = argparse.ArgumentParser(description="Rebuild the admin summary counters")
+    parser.add_argument("--check", action="store_true", help="report drift without writing")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = summary_service.rebuild_summary(db)
+        if args.check:
+            db.rollback()
+        else:
+            db.commit()
+        for name in sorted(drift):
+            old_amount, old_count, new_amount, new_count = drift[name]
+            print(f"{name}: amount {old_amount} -> {new_amount}, count {old_count} -> {new_count}")
+        verb = "found" if args.check else "fixed"
+        print(f"{verb} drift in {len(drift)} counters" if drift else "counters match the source tables")
+        if args.check and drift:
+            sys.exit(1)
+    except Exception as e:
+        db.rollback()
+        print("Error:", e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
@@ -4,7 +4,8 @@ import { Link } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
 import {
   fetchMyWallet,
-  fetchMyTransactions,
+  fetchMyTransactionsPage,
+  fetchMyEarnings,
   createMyTransaction,
   fetchUserProfile,
   fetchMyInvestments,
@@ -116,7 +117,9 @@ export default function Dashboard() {
   const [profile, setProfile] = useState(null);
   const [investments, setInvestments] = useState([]);
   const [wallet, setWallet] = useState(null);
-  const [transactions, setTransactions] = useState([]);
+  const [transactions, setTransactions] = useState([]); // newest page only
+  const [hasOlderTransactions, setHasOlderTransactions] = useState(false);
+  const [earnedTotal, setEarnedTotal] = useState(0); // approved earnings over the whole history
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [isSubmitting, setIsSubmitting] = useState(false);
@@ -152,9 +155,7 @@ export default function Dashboard() {
   const MOCK_BTC_ADDRESS = "bc1qxy2kgfldj2k2e8x5w7t00kqn2g84p6c00d4n2a";
 
   // --- Calculations for Earnings & Investments ---
-  const totalAPIReportedEarnings = transactions
-    .filter(tx => tx.type === 'earning' && tx.status === 'approved')
-    .reduce((sum, tx) => sum + parseFloat(tx.amount), 0);
+  const totalAPIReportedEarnings = earnedTotal;
 
   const totalInvested = investments.reduce(
     (sum, inv) => sum + parseFloat(inv.amount_invested),
@@ -178,13 +179,17 @@ export default function Dashboard() {
     }
     setError(null);
     try {
-      // Fetch core data: Wallet and Transactions
-      const [w, txs] = await Promise.all([
+      // Fetch core data: Wallet, the newest transactions and the lifetime earnings total
+      // (summed server side, so the polling never pulls the archived history)
+      const [w, page, earnings] = await Promise.all([
         fetchMyWallet(),
-        fetchMyTransactions(),
+        fetchMyTransactionsPage({ limit: 10 }),
+        fetchMyEarnings(),
       ]);
       setWallet(w);
-      setTransactions(txs);
+      setTransactions(page.items);
+      setHasOlderTransactions(Boolean(page.next_cursor));
+      setEarnedTotal(parseFloat(earnings.total_earnings));
 
       // Only fetch Profile and Investments on the initial load, as they are less dynamic
       if (initialLoad) {
@@ -722,7 +727,7 @@ export default function Dashboard() {
             )}
           </div>
           
-          {transactions.length > 10 && (
+          {(hasOlderTransactions || transactions.length > 10) && (
             <div className="text-center pt-4 border-t mt-4">
               <Link to="/transactions" className="text-blue-600 hover:text-blue-500 font-medium text-sm">
                 View All Transactions →
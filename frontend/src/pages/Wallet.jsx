@@ -1,7 +1,7 @@
 // src/pages/Wallet.jsx
 
 import { useEffect, useState } from "react";
-import { fetchMyWallet, fetchMyTransactions } from "@/utils/api";
+import { fetchMyWallet, fetchMyTransactionsPage } from "@/utils/api";
 
 // Helper function to format currency
 const formatCurrency = (amount) => {
@@ -31,6 +31,8 @@ const formatDate = (dateString) => {
 export default function Wallet() {
   const [wallet, setWallet] = useState(null);
   const [transactions, setTransactions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null); // null once the oldest page is loaded
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -39,12 +41,13 @@ export default function Wallet() {
       setLoading(true);
       setError(null);
       try {
-        const [w, t] = await Promise.all([
+        const [w, page] = await Promise.all([
             fetchMyWallet(),
-            fetchMyTransactions()
+            fetchMyTransactionsPage()
         ]);
         setWallet(w);
-        setTransactions(t);
+        setTransactions(page.items);
+        setNextCursor(page.next_cursor);
       } catch (err) {
         console.error("Failed to load wallet data:", err);
         // The error object might have a 'detail' field from the FastAPI HTTPException
@@ -55,6 +58,22 @@ export default function Wallet() {
     }
     loadWallet();
   }, []);
+
+  // Older pages only reach into archived history when the user goes back that far
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchMyTransactionsPage({ cursor: nextCursor });
+      setTransactions((prev) => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error("Failed to load more transactions:", err);
+      alert(err.detail || "Failed to load more transactions.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
   
   const getStatusClasses = (status) => {
     switch (String(status).toLowerCase()) {
@@ -170,6 +189,17 @@ export default function Wallet() {
             </tbody>
         </table>
       </div>
+      {nextCursor && (
+        <div className="flex justify-center mt-4">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="bg-blue-600 text-white px-4 py-2 rounded-lg font-medium hover:bg-blue-700 transition disabled:opacity-50"
+          >
+            {loadingMore ? "Loading..." : "Load older transactions"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
\ No newline at end of file
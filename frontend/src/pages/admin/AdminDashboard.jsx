@@ -2,7 +2,7 @@ import { useState, useEffect, useCallback } from "react";
 import { useAuth } from "@/context/AuthContext";
 import {
   fetchUsers,
-  fetchWallets, // <-- Now used
+  fetchAdminSummary,
   // Assumed:
   createAdminTransaction,
   fetchAdminTransactions,
@@ -44,7 +44,7 @@ const AdminTransactionForm = ({ users, userMap, loadTransactions }) => {
   const handleTransaction = async (e) => {
     e.preventDefault();
     if (!selectedUser || !amount || parseFloat(amount) <= 0) {
-      setError("Please select a user and enter a valid positive amount.");
+      setError("Please enter a user ID and a valid positive amount.");
       return;
     }
 
@@ -84,22 +84,27 @@ const AdminTransactionForm = ({ users, userMap, loadTransactions }) => {
         <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
           
           <div className="md:col-span-2">
-            <label htmlFor="userSelect" className="block text-sm font-medium text-gray-700 mb-1">Target User</label>
-            <select
+            <label htmlFor="userSelect" className="block text-sm font-medium text-gray-700 mb-1">Target User ID</label>
+            {/* Any user id is accepted; the suggestions only cover the first page of users */}
+            <input
               id="userSelect"
+              type="number"
+              min="1"
+              list="userOptions"
               value={selectedUser}
               onChange={(e) => setSelectedUser(e.target.value)}
+              placeholder="User ID"
               className="w-full border border-gray-300 focus:border-blue-500 focus:ring-blue-500 p-2 rounded-lg transition"
               disabled={isSubmitting}
               required
-            >
-              <option value="">Select User Account</option>
+            />
+            <datalist id="userOptions">
               {users.map(u => (
                 <option key={u.id} value={u.id}>
-                  {userMap[u.id]} (ID: {u.id})
+                  {userMap[u.id]}
                 </option>
               ))}
-            </select>
+            </datalist>
           </div>
 
           <div>
@@ -151,7 +156,7 @@ export default function AdminDashboard() {
   const { user, logout } = useAuth();
   const [transactions, setTransactions] = useState([]);
   const [users, setUsers] = useState([]);
-  const [wallets, setWallets] = useState([]); // <-- New state for wallets
+  const [summary, setSummary] = useState(null); // server-maintained totals (/admin/summary)
   const [loading, setLoading] = useState(true);
 
   // Map user IDs to names for professional table display
@@ -162,13 +167,16 @@ export default function AdminDashboard() {
   });
 
   // --- Calculations for Metrics ---
-  const pendingApprovals = transactions.filter(tx => tx.status === 'pending').length;
+  const pendingApprovals = summary
+    ? summary.pending_deposits.count + summary.pending_withdrawals.count
+    : 0;
   
-  const totalPlatformBalance = wallets.reduce((sum, wallet) => 
-    sum + parseFloat(wallet.balance || 0), 0
-  );
+  const totalPlatformBalance = summary ? summary.total_wallet_balance : 0;
+
+  const totalUsersCount = summary ? summary.total_users : 0;
   
-  const totalTransactionsCount = transactions.length;
+  // the table below only holds the newest page, so the total comes from the server's counters
+  const totalTransactionsCount = summary ? summary.total_transactions : 0;
 
 
   const loadUsers = useCallback(async () => {
@@ -189,22 +197,22 @@ export default function AdminDashboard() {
     }
   }, []);
 
-  // New function to load wallets
-  const loadWallets = useCallback(async () => {
+  // Platform totals come precomputed from the backend instead of summing every wallet here
+  const loadSummary = useCallback(async () => {
     try {
-      const walletsData = await fetchWallets();
-      setWallets(walletsData);
+      const summaryData = await fetchAdminSummary();
+      setSummary(summaryData);
     } catch (error) {
-        console.error("Failed to load wallets:", error);
+        console.error("Failed to load summary:", error);
     }
   }, []);
 
   const loadDashboardData = useCallback(async () => {
     setLoading(true);
-    // Fetch users, transactions, AND wallets concurrently
-    await Promise.all([loadUsers(), loadTransactions(), loadWallets()]); 
+    // Fetch users, transactions, AND the summary concurrently
+    await Promise.all([loadUsers(), loadTransactions(), loadSummary()]); 
     setLoading(false);
-  }, [loadUsers, loadTransactions, loadWallets]);
+  }, [loadUsers, loadTransactions, loadSummary]);
 
 
   useEffect(() => {
@@ -238,7 +246,7 @@ export default function AdminDashboard() {
         {/* Metric 1: Total Users */}
         <div className="bg-white p-6 rounded-xl shadow-md border-l-4 border-blue-500">
           <p className="text-sm font-medium text-gray-500">Total Registered Users</p>
-          <p className="text-3xl font-bold text-gray-900 mt-1">{users.length}</p>
+          <p className="text-3xl font-bold text-gray-900 mt-1">{totalUsersCount}</p>
         </div>
         
         {/* Metric 2: Total Platform Balance */}
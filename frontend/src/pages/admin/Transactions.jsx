@@ -1,5 +1,5 @@
 import { useEffect, useState, useCallback } from "react";
-import { fetchAdminTransactions, approveTransaction, rejectTransaction, pendTransaction } from "@/utils/api";
+import { fetchAdminTransactionsPage, approveTransaction, rejectTransaction, pendTransaction } from "@/utils/api";
 
 // --- Helper Functions ---
 
@@ -30,17 +30,19 @@ const getStatusClasses = (status) => {
 
 export default function AdminTransactions() {
   const [transactions, setTransactions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null); // null once the last page is loaded
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
+  // The feed is keyset-paginated and already newest first; reloading starts again from the first page
   const loadTransactions = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const data = await fetchAdminTransactions();
-      // Sort by creation date or pending status for easier review
-      const sortedData = data.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-      setTransactions(sortedData);
+      const page = await fetchAdminTransactionsPage();
+      setTransactions(page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       console.error(err);
       setError(err.detail || err.response?.data?.detail || "Failed to fetch transactions");
@@ -49,11 +51,27 @@ export default function AdminTransactions() {
     }
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchAdminTransactionsPage({ cursor: nextCursor });
+      setTransactions((prev) => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error(err);
+      alert(`Failed to load more transactions: ${err.detail || err.response?.data?.detail || 'Server error'}`);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadTransactions();
   }, [loadTransactions]);
 
   const handleAction = async (txnId, action) => {
+    const original = transactions.find((tx) => tx.id === txnId);
     // Optimistic update
     setTransactions((prev) => 
         prev.map(tx => tx.id === txnId ? { ...tx, status: 'Processing' } : tx)
@@ -71,9 +89,11 @@ export default function AdminTransactions() {
       );
     } catch (err) {
       console.error(err);
-      alert(`Failed to update transaction status: ${err.detail || 'Server error'}`);
-      // Reload on failure to revert optimistic update
-      loadTransactions();
+      alert(`Failed to update transaction status: ${err.detail || err.response?.data?.detail || 'Server error'}`);
+      // Revert the optimistic update in place, keeping any older pages already loaded
+      setTransactions((prev) =>
+        prev.map((tx) => (tx.id === txnId ? original : tx))
+      );
     }
   };
 
@@ -157,6 +177,21 @@ export default function AdminTransactions() {
           </tbody>
         </table>
       </div>
+
+      <div className="flex items-center justify-between mt-4 text-sm text-gray-600">
+        <span>Showing {transactions.length} transactions</span>
+        {nextCursor ? (
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="bg-blue-600 text-white px-4 py-2 rounded-lg font-medium hover:bg-blue-700 transition disabled:opacity-50"
+          >
+            {loadingMore ? "Loading..." : "Load older transactions"}
+          </button>
+        ) : (
+          <span className="text-gray-400">End of transaction log</span>
+        )}
+      </div>
     </div>
   );
 }
\ No newline at end of file
@@ -1,7 +1,7 @@
 import { useEffect, useState, useCallback } from "react";
 import { useAuth } from "@/context/AuthContext";
 // Import new API functions (assuming you put them in your api utility)
-import { fetchUsers, updateWalletStatus, toggleWalletPermission } from "@/utils/api"; 
+import { fetchUsersPage, updateWalletStatus, toggleWalletPermission } from "@/utils/api"; 
 
 // --- Helper Functions (From previous fix) ---
 
@@ -45,18 +45,21 @@ const getWalletStatusClasses = (status) => {
 export default function Users() {
     const { user, loading: authLoading, logout } = useAuth();
     const [users, setUsers] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null); // null once the last page is loaded
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState(null);
     // NEW: State for showing action result/feedback
     const [feedback, setFeedback] = useState({ message: '', type: '' });
 
+    // /admin/users is keyset-paginated; reloading starts again from the first page
     const loadUsers = useCallback(async () => {
         setLoading(true);
         setError(null);
         try {
-            // Note: Update fetchUsers in api.js to call the new admin/all endpoint
-            const data = await fetchUsers(); 
-            setUsers(data);
+            const page = await fetchUsersPage();
+            setUsers(page.items);
+            setNextCursor(page.next_cursor);
             setFeedback({ message: '', type: '' }); // Clear feedback on load
         } catch (err) {
             console.error(err);
@@ -68,6 +71,20 @@ export default function Users() {
         }
     }, [logout]);
 
+    const loadMoreUsers = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchUsersPage({ cursor: nextCursor });
+            setUsers(prevUsers => [...prevUsers, ...page.items]);
+            setNextCursor(page.next_cursor);
+        } catch (err) {
+            setFeedback({ message: err.detail || err.response?.data?.detail || 'Failed to load more users.', type: 'error' });
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
 
     // UPDATED: Handler for Status Update (added allow_purchases to state update)
     const handleStatusChange = async (userId, newStatus) => {
@@ -258,6 +275,21 @@ export default function Users() {
                     </tbody >
                 </table>
             </div>
+
+            <div className="flex items-center justify-between mt-4 text-sm text-gray-600">
+                <span>Showing {users.length} users</span>
+                {nextCursor ? (
+                    <button
+                        onClick={loadMoreUsers}
+                        disabled={loadingMore}
+                        className="bg-blue-600 text-white px-4 py-2 rounded-lg font-medium hover:bg-blue-700 transition disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more users"}
+                    </button>
+                ) : (
+                    <span className="text-gray-400">End of user list</span>
+                )}
+            </div>
         </div>
     );
 }
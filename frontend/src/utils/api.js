@@ -40,11 +40,26 @@ export async function fetchMyWallet() {
   return res.data;
 }
 
+// Deprecated: only the newest 500 transactions. Use fetchMyTransactionsPage for lists
+// and fetchMyEarnings for the lifetime earnings total.
 export async function fetchMyTransactions() {
   const res = await apiClient.get("/wallets/me/transactions");
   return res.data;
 }
 
+// Lifetime approved earnings ({ total_earnings }), archived history included.
+export async function fetchMyEarnings() {
+  const res = await apiClient.get("/wallets/me/earnings");
+  return res.data;
+}
+
+// Keyset-paginated history: returns one page ({ items, next_cursor }), newest first.
+// Pass next_cursor back as `cursor` to fetch the following page.
+export async function fetchMyTransactionsPage(params = {}) {
+  const res = await apiClient.get("/wallets/me/transactions/page", { params });
+  return res.data;
+}
+
 
 // ✅ New helper for creating a user transaction
 export async function createMyTransaction(payload) {
@@ -73,8 +88,22 @@ export async function createInvestment(packageId, amount) {
 
 
 // -------------------- ADMIN --------------------
-export async function fetchUsers() {
-  const res = await apiClient.get("/admin/users");
+// Keyset-paginated, sortable user listing: returns one page ({ items, next_cursor }).
+// params: limit, cursor, sort (created_at | email | id), order (asc | desc), role, wallet_status
+export async function fetchUsersPage(params = {}) {
+  const res = await apiClient.get("/admin/users", { params });
+  return res.data;
+}
+
+// Items of a single page only; page through fetchUsersPage to reach every user.
+export async function fetchUsers(params = {}) {
+  const page = await fetchUsersPage(params);
+  return page.items;
+}
+
+// Dashboard totals (balances, pending volume, today's approvals, active principal)
+export async function fetchAdminSummary() {
+  const res = await apiClient.get("/admin/summary");
   return res.data;
 }
 
@@ -98,16 +127,31 @@ export async function updateWalletControls(walletId, payload) {
   return res.data;
 }
 
-export async function fetchAdminTransactions() {
-  const res = await apiClient.get("/admin/transactions");
+// Keyset-paginated feed: returns one page ({ items, next_cursor }).
+// Pass next_cursor back as `cursor` to fetch the following page.
+export async function fetchAdminTransactionsPage(params = {}) {
+  const res = await apiClient.get("/admin/transactions", { params });
   return res.data;
 }
 
+// Items of a single page only (the newest 50 by default); page through
+// fetchAdminTransactionsPage to reach older transactions.
+export async function fetchAdminTransactions(params = {}) {
+  const page = await fetchAdminTransactionsPage(params);
+  return page.items;
+}
+
 export async function createAdminTransaction(payload) {
   const res = await apiClient.post("/admin/transactions", payload);
   return res.data;
 }
 
+// action: "approve" | "reject"; returns { action, applied, wallets_updated, results: [{ id, result }] }
+export async function bulkUpdateTransactions(action, ids) {
+  const res = await apiClient.post("/admin/transactions/bulk", { action, ids });
+  return res.data;
+}
+
 export async function approveTransaction(txnId) {
   const res = await apiClient.post(`/admin/transactions/${txnId}/approve`);
   return res.data;